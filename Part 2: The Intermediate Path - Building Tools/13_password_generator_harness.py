@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+"""
+Part 2, Lesson 13: Project: Password Generator (Test Harness)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This file is a companion to `13_project_password_generator.py`. It generates
+large samples of passwords, checks them for statistical bias with chi-square
+tests, and measures how fast the generator is and how much randomness it uses.
+"""
+
+'''
+=====================================================================================
+|                                   - HARNESS START -                                 |
+=====================================================================================
+
+WHY DO WE NEED THIS?
+A password generator that "looks random" is not good enough. If some characters
+show up more often than others, or if certain positions favour certain kinds of
+characters, an attacker can guess passwords faster. Worse, this kind of BIAS is
+invisible to the naked eye: you would need to look at hundreds of thousands of
+passwords to notice it.
+
+So we let the computer do the looking. This harness:
+1.  Generates a large SAMPLE of passwords with `generate_password` (one at a
+    time) and with `generate_passwords` (the bulk path, which draws the
+    random characters for a whole batch at once). The two are written
+    differently, so both must pass the same tests.
+2.  Counts how often every character appears, overall and at every position.
+3.  Runs a CHI-SQUARE GOODNESS-OF-FIT TEST on those counts.
+4.  Reports throughput (passwords per second) and the number of bytes of
+    randomness consumed per password.
+
+THE CHI-SQUARE TEST IN ONE PARAGRAPH:
+For every character we know how many times we EXPECT to see it, and we count
+how many times we OBSERVED it. The chi-square statistic adds up
+`(observed - expected) ** 2 / expected` over all characters. If the generator
+behaves as designed, the statistic stays small and the P-VALUE (the chance of
+seeing a result at least this extreme by pure luck) is not tiny. A p-value
+below our threshold (`alpha`) means the counts are too lopsided to be luck.
+
+WHAT DO WE "EXPECT"?
+Our generator does not pick every character uniformly from the pool. It first
+FORCES one character from each selected class (one letter, one digit, ...),
+fills the rest from the whole pool, and then shuffles. That means digits and
+symbols show up a little more often than letters. We therefore test against two
+reference models:
+-   DESIGN: the distribution the algorithm is *supposed* to produce. A failure
+    here means a change to the generator broke it. This decides the exit code.
+-   UNIFORM: every pool character equally likely. This is reported for
+    information, so we can see how large the built-in skew actually is.
+
+Run it after every change to the generator:
+`python 13_password_generator_harness.py`
+`python 13_password_generator_harness.py --count 500000 --length 20 --seed 7`
+'''
+
+import argparse
+import importlib
+import math
+import os
+import random
+import sys
+import time
+
+# The generator's file name starts with a digit, so we cannot write
+# `import 13_project_password_generator`. `importlib.import_module()` accepts
+# the module name as a plain string, which side-steps that restriction.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+generator = importlib.import_module("13_project_password_generator")
+
+# The character classes exactly as the generator defines them.
+CHARACTER_CLASSES = {
+    "letters": generator.string.ascii_letters,
+    "numbers": generator.string.digits,
+    "symbols": generator.string.punctuation,
+}
+
+# The settings we test by default: (use_letters, use_numbers, use_symbols).
+DEFAULT_SETTINGS = [
+    (True, False, False),
+    (True, True, False),
+    (True, True, True),
+    (False, True, True),
+]
+
+
+class CountingRandom(random.Random):
+    """
+    A `random.Random` that counts how many random bits it hands out.
+
+    `random.choice()` and `random.shuffle()` both draw their randomness through
+    `getrandbits()`, so wrapping that single method is enough to measure the
+    generator's total appetite for randomness.
+    """
+
+    def __init__(self, seed=None):
+        self.bits_consumed = 0
+        super().__init__(seed)
+
+    def getrandbits(self, k):
+        self.bits_consumed += k
+        return super().getrandbits(k)
+
+    def random(self):
+        # A float from `random()` is built from 53 random bits.
+        self.bits_consumed += 53
+        return super().random()
+
+
+def chi_square_p_value(statistic, degrees_of_freedom):
+    """
+    Returns the p-value of a chi-square statistic.
+
+    This is the regularized upper incomplete gamma function Q(k/2, x/2),
+    computed with a power series for small x and a continued fraction for
+    large x (the classic "Numerical Recipes" approach).
+
+    Args:
+        statistic (float): The chi-square statistic.
+        degrees_of_freedom (int): The number of categories minus one.
+
+    Returns:
+        float: The probability of a statistic at least this large by chance.
+    """
+    if statistic <= 0:
+        return 1.0
+    a = degrees_of_freedom / 2.0
+    x = statistic / 2.0
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+
+    if x < a + 1.0:
+        # Power series for the LOWER incomplete gamma, then Q = 1 - P.
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1.0
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-15:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+
+    # Continued fraction (modified Lentz's method) for the UPPER gamma.
+    tiny = 1e-300
+    b = x + 1.0 - a
+    c = 1.0 / tiny
+    d = 1.0 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2.0
+        d = an * d + b
+        if abs(d) < tiny:
+            d = tiny
+        c = b + an / c
+        if abs(c) < tiny:
+            c = tiny
+        d = 1.0 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < 1e-15:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def chi_square(observed, expected):
+    """
+    Runs a chi-square goodness-of-fit test.
+
+    Args:
+        observed (dict): Maps each category to the number of times it was seen.
+        expected (dict): Maps each category to its expected count.
+
+    Returns:
+        tuple: (statistic, p_value).
+    """
+    statistic = 0.0
+    for category, expected_count in expected.items():
+        difference = observed.get(category, 0) - expected_count
+        statistic += difference * difference / expected_count
+    return statistic, chi_square_p_value(statistic, len(expected) - 1)
+
+
+def selected_classes(use_letters, use_numbers, use_symbols):
+    """Returns the character classes switched on by the given settings."""
+    flags = {"letters": use_letters, "numbers": use_numbers, "symbols": use_symbols}
+    return [CHARACTER_CLASSES[name] for name, enabled in flags.items() if enabled]
+
+
+def design_probabilities(length, classes):
+    """
+    Returns the probability of each character at any single position.
+
+    The generator forces one pick from each of the `k` classes and draws the
+    other `length - k` characters from the full pool. After the shuffle every
+    position is equally likely to hold any of those picks, so the chance that
+    position `i` holds character `c` (from class `C`) is:
+
+        (1 / len(C) + (length - k) / len(pool)) / length
+    """
+    pool_size = sum(len(chars) for chars in classes)
+    fill = (length - len(classes)) / pool_size
+    probabilities = {}
+    for chars in classes:
+        for char in chars:
+            probabilities[char] = (1.0 / len(chars) + fill) / length
+    return probabilities
+
+
+def uniform_probabilities(classes):
+    """Returns the ideal probabilities: every pool character equally likely."""
+    pool = "".join(classes)
+    return {char: 1.0 / len(pool) for char in pool}
+
+
+def measure(produce, count, seed):
+    """
+    Runs one sampling pass with a counting random number generator.
+
+    Args:
+        produce (function): Called with no arguments, returns a list of
+                            `count` passwords.
+        count (int): How many passwords the pass produces.
+        seed (int): Seed for the random number generator (for repeatability).
+
+    Returns:
+        tuple: (passwords, seconds, bytes_per_password).
+    """
+    rng = CountingRandom(seed)
+    # The generator calls `random.choice()` and `random.shuffle()` through its
+    # module-level `random` name. Pointing that name at our counting instance
+    # for the duration of the pass lets us measure it without changing the
+    # generator's code. We always put the real module back afterwards.
+    original_random = generator.random
+    generator.random = rng
+    try:
+        start = time.perf_counter()
+        passwords = produce()
+        seconds = time.perf_counter() - start
+    finally:
+        generator.random = original_random
+    return passwords, seconds, rng.bits_consumed / 8 / count
+
+
+def analyse(passwords, length, classes, alpha):
+    """
+    Runs the character and position chi-square tests on a sample.
+
+    Args:
+        passwords (list): The generated passwords.
+        length (int): The password length used.
+        classes (list): The character classes that were switched on.
+        alpha (float): The significance level.
+
+    Returns:
+        list: One (name, statistic, p_value, passed) tuple per test.
+    """
+    total = len(passwords)
+    design = design_probabilities(length, classes)
+    uniform = uniform_probabilities(classes)
+
+    character_counts = dict.fromkeys(design, 0)
+    position_counts = [dict.fromkeys(design, 0) for _ in range(length)]
+    for password in passwords:
+        for position, char in enumerate(password):
+            character_counts[char] += 1
+            position_counts[position][char] += 1
+
+    results = []
+
+    # Test 1: overall character frequencies against the design model.
+    expected = {char: p * length * total for char, p in design.items()}
+    statistic, p_value = chi_square(character_counts, expected)
+    results.append(("characters (design)", statistic, p_value, p_value >= alpha))
+
+    # Test 2: every position on its own. We run `length` tests, so we use a
+    # BONFERRONI CORRECTION (alpha / length) to keep false alarms rare, and
+    # report the worst position.
+    expected = {char: p * total for char, p in design.items()}
+    worst = None
+    for position, counts in enumerate(position_counts):
+        statistic, p_value = chi_square(counts, expected)
+        if worst is None or p_value < worst[2]:
+            worst = (position, statistic, p_value)
+    position, statistic, p_value = worst
+    results.append((f"positions (worst: #{position})", statistic, p_value,
+                    p_value >= alpha / length))
+
+    # Informational: how far is the design itself from a perfectly uniform pool?
+    expected = {char: p * length * total for char, p in uniform.items()}
+    statistic, p_value = chi_square(character_counts, expected)
+    results.append(("characters (uniform, info)", statistic, p_value, None))
+    return results
+
+
+def run_settings(settings, count, length, seed, alpha):
+    """
+    Tests one combination of character settings with both generation paths.
+
+    Returns:
+        bool: True if every design test passed.
+    """
+    use_letters, use_numbers, use_symbols = settings
+    classes = selected_classes(use_letters, use_numbers, use_symbols)
+    labels = [name for name, on in zip(CHARACTER_CLASSES, settings) if on]
+    print(f"\n=== length={length}, classes={'+'.join(labels)}, samples={count} ===")
+
+    paths = {
+        "generate_password": lambda: [
+            generator.generate_password(length, use_letters, use_numbers, use_symbols)
+            for _ in range(count)
+        ],
+        "generate_passwords": lambda: generator.generate_passwords(
+            count, length, use_letters, use_numbers, use_symbols
+        ),
+    }
+
+    all_passed = True
+    for path_name, produce in paths.items():
+        passwords, seconds, bytes_per_password = measure(produce, count, seed)
+        print(f"\n  [{path_name}]")
+        print(f"    Throughput: {count / seconds:,.0f} passwords/sec")
+        print(f"    Randomness: {bytes_per_password:.1f} bytes/password")
+        for name, statistic, p_value, passed in analyse(passwords, length, classes, alpha):
+            status = "info" if passed is None else ("PASS" if passed else "FAIL")
+            print(f"    {status:<4}  {name:<28} chi2={statistic:10.1f}  p={p_value:.4f}")
+            if passed is False:
+                all_passed = False
+    return all_passed
+
+
+def main():
+    """Parses the command-line options and runs every test."""
+    parser = argparse.ArgumentParser(
+        description="Chi-square uniformity and throughput checks for the password generator."
+    )
+    parser.add_argument("--count", type=int, default=100_000,
+                        help="passwords per sample (default: 100000)")
+    parser.add_argument("--length", type=int, default=16,
+                        help="password length (default: 16)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed for repeatable runs (default: random)")
+    parser.add_argument("--alpha", type=float, default=0.001,
+                        help="significance level (default: 0.001)")
+    args = parser.parse_args()
+
+    if args.length < 3:
+        parser.error("--length must be at least 3 (one character per class).")
+
+    print("--- Password Generator Harness ---")
+    all_passed = True
+    for settings in DEFAULT_SETTINGS:
+        if not run_settings(settings, args.count, args.length, args.seed, args.alpha):
+            all_passed = False
+
+    print("\n----------------------------------")
+    if all_passed:
+        print("All design tests passed. No bias detected.")
+    else:
+        print("BIAS DETECTED: at least one design test failed.")
+    # A non-zero exit code lets scripts and CI jobs detect the failure.
+    sys.exit(0 if all_passed else 1)
+
+
+if __name__ == "__main__":
+    main()
+
+'''
+=====================================================================================
+|                                    - HARNESS END -                                  |
+=====================================================================================
+
+HOW TO READ THE OUTPUT:
+
+-   THROUGHPUT: passwords per second for each generation path. Compare it
+    before and after a performance change.
+-   RANDOMNESS: bytes drawn from the random number generator per password.
+    In `generate_password` the `random.shuffle()` step costs about as much
+    randomness as the picks. The bulk path needs no shuffle, but throws away
+    some bytes to keep every character equally likely.
+-   PASS/FAIL lines test against the DESIGN model. A FAIL means the generator
+    no longer produces the distribution it was designed to produce.
+-   The "uniform, info" line shows how far the design itself is from a
+    perfectly uniform pool. With large samples its p-value is usually ~0,
+    because the forced picks over-represent the smaller character classes.
+
+A single run at alpha = 0.001 will fail by pure chance about once in a
+thousand tests. If you see a FAIL, re-run with a different `--seed` before
+assuming the worst; a real bias fails every time.
+'''
@@ -106,6 +106,107 @@ def generate_password(length, use_letters, use_numbers, use_symbols):
     return "".join(password_chars)
 
 
+class _RandomCharacters:
+    """
+    Draws random characters from an alphabet, many at a time.
+
+    `random.choice()` asks the random number generator for a fresh number
+    for every single character. Here we ask for one big block of random BYTES
+    instead, and turn the whole block into characters at once with
+    `bytes.translate()`, which runs in C.
+    """
+
+    def __init__(self, alphabet):
+        size = len(alphabet)
+        # A byte is a number from 0 to 255. Mapping it with `% size` would
+        # make the first few characters a little more likely whenever 256 is
+        # not a multiple of `size`, so bytes from `limit` up are thrown away
+        # ("rejection sampling"). Every character is then exactly as likely.
+        self._limit = 256 - 256 % size
+        self._table = bytes(ord(alphabet[byte % size]) if byte < self._limit else 0
+                            for byte in range(256))
+        self._rejected = bytes(range(self._limit, 256))
+
+    def take(self, count):
+        """Returns a string of `count` random characters from the alphabet."""
+        pieces = []
+        missing = count
+        while missing > 0:
+            # Some bytes are thrown away, so ask for a few more than needed.
+            block = random.randbytes(missing * 256 // self._limit + 16)
+            piece = block.translate(self._table, self._rejected)
+            pieces.append(piece)
+            missing -= len(piece)
+        # "latin-1" turns each byte into the character with the same number.
+        return b"".join(pieces)[:count].decode("latin-1")
+
+
+def generate_passwords(count, length, use_letters, use_numbers, use_symbols, batch_size=10_000):
+    """
+    Generates many passwords at once using the same criteria.
+
+    This is the "bulk path" used when you need a batch of passwords (for
+    example, to hand out initial passwords to a list of new accounts). The
+    passwords follow exactly the same rules as `generate_password`, but the
+    random characters for a whole batch are drawn together, which is several
+    times faster than one `random.choice()` per character.
+
+    Args:
+        count (int): How many passwords to generate.
+        length (int): The desired length of each password.
+        use_letters (bool): Whether to include letters (a-z, A-Z).
+        use_numbers (bool): Whether to include numbers (0-9).
+        use_symbols (bool): Whether to include symbols (!@#$, etc.).
+        batch_size (int): How many passwords to draw the randomness for at
+                          once (this bounds the memory used).
+
+    Returns:
+        list: A list of `count` passwords, or an empty list if no character
+              types are selected.
+    """
+    classes = []
+    if use_letters:
+        classes.append(string.ascii_letters)
+    if use_numbers:
+        classes.append(string.digits)
+    if use_symbols:
+        classes.append(string.punctuation)
+    if not classes:
+        return []
+
+    # The same recipe as `generate_password`: one FORCED character from each
+    # class, the rest FILLED from the whole pool.
+    fill_length = max(length - len(classes), 0)
+    fill_source = _RandomCharacters("".join(classes))
+    forced_sources = [_RandomCharacters(chars) for chars in classes]
+    # Instead of shuffling, each forced character is INSERTED at a random
+    # place among the fill characters. The fill characters are all drawn the
+    # same way, so this gives exactly the same passwords, with the same
+    # chances, as a shuffle. A place is drawn as a "character" whose number
+    # is the position (0 to the current length).
+    slot_sources = [_RandomCharacters("".join(map(chr, range(fill_length + 1 + number))))
+                    if fill_length + 1 + number <= 256 else None
+                    for number in range(len(classes))]
+
+    passwords = []
+    while len(passwords) < count:
+        batch = min(batch_size, count - len(passwords))
+        fills = fill_source.take(batch * fill_length)
+        forced = [source.take(batch) for source in forced_sources]
+        slots = [source.take(batch) if source is not None else None for source in slot_sources]
+        for index in range(batch):
+            password_chars = list(fills[index * fill_length:(index + 1) * fill_length])
+            for number, chars in enumerate(forced):
+                if slots[number] is not None:
+                    position = ord(slots[number][index])
+                else:
+                    # Very long passwords: one number at a time.
+                    position = random.randrange(len(password_chars) + 1)
+                password_chars.insert(position, chars[index])
+            passwords.append("".join(password_chars))
+    return passwords
+
+
 def main():
     """The main function to drive the user interaction."""
     
@@ -188,4 +289,13 @@ HOW TO RUN THIS CODE:
 3.  Navigate to the directory where you saved this file.
 4.  Run the file with the command: `python 13_project_password_generator.py`
 5.  Follow the prompts to create your own custom password!
+
+CHECKING THE GENERATOR FOR BIAS:
+
+The companion script `13_password_generator_harness.py` generates large
+samples with `generate_password` and `generate_passwords`, runs chi-square
+uniformity tests on the characters and their positions, and reports how many
+passwords per second we produce and how many bytes of randomness each one
+consumes. Run it after every change to this file:
+`python 13_password_generator_harness.py`
 '''
\ No newline at end of file
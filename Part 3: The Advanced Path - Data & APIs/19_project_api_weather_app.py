@@ -57,90 +57,548 @@ To make these API requests in Python, we use a third-party library called
 
 # We import the `requests` library to handle our web requests.
 import requests
+# `argparse` reads optional settings (like `--no-cache`) from the command line.
+import argparse
+# `os` helps us build a reliable path for the cache file (see Lesson 28).
+import os
+# `sys` gives us `sys.stdout` (and `sys.stderr`) for the batch mode output.
+import sys
+# `threading` and `time` are used by the long-running polling mode.
+import threading
+import time
+
+# `PooledSession` keeps connections to the API open between requests, and
+# retries temporary failures. It lives in `http_client.py` next to this file,
+# and the web scraper (Lesson 22) shares it.
+from http_client import PooledSession, get_session, take_connect_time, take_retry_time
+
+# Our helper package lives next to this file in the `weather_app/` folder.
+# `ResponseCache` remembers recent answers so repeat lookups skip the network.
+from weather_app.cache import ResponseCache
+# The batch helpers fetch many cities at once under a rate limit.
+from weather_app.batch import TokenBucket, fetch_many, read_cities, write_jsonl, write_table
+# `SingleFlight` makes simultaneous requests for the same city share one API call.
+from weather_app.singleflight import SingleFlight
+# `CityIndex` checks city names locally, before we spend a request on them.
+from weather_app.city_index import CityIndex, CityNotFoundError
+# `WeatherReport` is a compact record of the five fields we use, and
+# `ValidatorStore` remembers ETags so unchanged data is never re-downloaded.
+from weather_app.report import ValidatorStore, WeatherReport
+# `LatencyMetrics` keeps histograms of how long each phase of a request takes.
+from weather_app.metrics import LatencyMetrics
+# The polling mode: a heap-based scheduler and a store for readings over time.
+from weather_app.scheduler import PollScheduler
+from weather_app.timeseries import TimeSeriesStore
+
+
+# --- Part 1: Configuration ---
+# It's good practice to put configuration variables at the top.
+
+# PASTE YOUR API KEY HERE! Replace the placeholder string with your actual key.
+# The program WILL NOT WORK without a valid key.
+# (You may instead set the OPENWEATHER_API_KEY environment variable, which
+# keeps the key out of this file. `os.environ.get()` reads it if it exists.)
+API_KEY = os.environ.get("OPENWEATHER_API_KEY", "YOUR_API_KEY_GOES_HERE")
+
+# This is the base URL for the weather API endpoint we are using.
+# Setting WEATHER_API_BASE_URL (or passing `--base-url`) points the app at a
+# different server, such as the local stub in `weather_app/stub_server.py`.
+BASE_URL = os.environ.get("WEATHER_API_BASE_URL",
+                          "https://api.openweathermap.org/data/2.5/weather")
+
+# `units=metric` tells the API to return temperature in Celsius.
+UNITS = "metric"
+
+# The cache lives in a small database file next to this script.
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_FILE = os.path.join(BASE_DIR, "weather_cache.sqlite3")
+
+# The polling mode records every reading in this database.
+HISTORY_FILE = os.path.join(BASE_DIR, "weather_history.sqlite3")
+
+# Every API request records its timings here (see `fetch_weather`).
+METRICS = LatencyMetrics()
+
+# The validators (ETag/Last-Modified) of recent responses, by request URL.
+VALIDATORS = ValidatorStore()
+
+
+def fetch_weather(city, units=UNITS, session=None, city_id=None, base_url=None):
+    """
+    Fetches the current weather for a city from the API.
+
+    Args:
+        city (str): The name of the city.
+        units (str): The unit system to request ("metric" or "imperial").
+        session (PooledSession): The session to send the request with. If
+                                 omitted, the shared session is used.
+        city_id (int): The city's OpenWeatherMap ID, if we know it. An ID
+                       is unambiguous, so it is sent instead of the name.
+        base_url (str): The endpoint to call (default: `BASE_URL`).
+
+    Returns:
+        WeatherReport: The fields we use, extracted from the response.
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails.
+    """
+    # --- Part 3: Making the API Request ---
+    # We construct the full URL with "parameters". Parameters are added to a URL
+    # after a `?` and are used to send information with our request.
+    # `q` is the parameter for the city name.
+    # `appid` is the parameter for our API key.
+    base_url = base_url or BASE_URL
+    # `id` is used instead of `q` when we already know the exact city.
+    if city_id is not None:
+        request_url = f"{base_url}?id={city_id}&appid={API_KEY}&units={units}"
+    else:
+        request_url = f"{base_url}?q={city}&appid={API_KEY}&units={units}"
+
+    # `session.get()` sends an HTTP GET request to the specified URL. It works
+    # just like `requests.get()`, but reuses an open connection if it has one.
+    # `stream=True` makes it return as soon as the response HEADERS arrive,
+    # so we can time the body download separately.
+    #
+    # If we have seen this exact request before and the server gave us an
+    # ETag or Last-Modified validator, we send it back. An unchanged answer
+    # then arrives as "304 Not Modified" with an empty body.
+    session = session or get_session()
+    previous = VALIDATORS.get(request_url)
+    take_connect_time()  # Reset this thread's connection and retry timers.
+    take_retry_time()
+    start = time.perf_counter()
+    try:
+        response = session.get(request_url, stream=True,
+                               headers=ValidatorStore.conditional_headers(previous))
+        headers_received = time.perf_counter()
+        connect = take_connect_time()
+        retry = take_retry_time()
+
+        # Reading `.content` downloads the whole body.
+        response.content
+    except requests.exceptions.RequestException:
+        # A failed request took time too; it counts in the total.
+        METRICS.observe("total", time.perf_counter() - start)
+        raise
+    body_received = time.perf_counter()
+
+    # The session may have retried; the retries have a phase of their own,
+    # so "ttfb" is the server's answer to the attempt that worked.
+    METRICS.observe("retry", retry)
+    METRICS.observe("connect", connect)
+    METRICS.observe("ttfb", headers_received - start - retry - connect)
+    METRICS.observe("download", body_received - headers_received)
+
+    if response.status_code == 304 and previous is not None:
+        # Nothing changed: reuse the report we already have.
+        METRICS.observe("total", body_received - start)
+        return previous[2]
+
+    # The `raise_for_status()` method is a great helper. If the request
+    # resulted in an error (e.g., 404 Not Found, 401 Unauthorized),
+    # it will automatically raise an exception and stop the function here.
+    if not response.ok:
+        METRICS.observe("total", body_received - start)
+    response.raise_for_status()
+
+    # --- Part 4: Parsing the JSON Response ---
+    # If the request was successful (status code 200 OK), the response
+    # object contains the data from the server. The `.json()` method
+    # automatically parses the JSON text into a Python dictionary.
+    # We immediately keep only the fields we need and let the rest go.
+    report = extract_weather(response.json())
+    decoded = time.perf_counter()
+    METRICS.observe("decode", decoded - body_received)
+    METRICS.observe("total", decoded - start)
+
+    VALIDATORS.remember(request_url, response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"), report)
+    return report
+
+
+def extract_weather(data):
+    """
+    Pulls the fields we display out of the API's nested dictionary.
+
+    Args:
+        data (dict): The parsed JSON response.
+
+    Returns:
+        WeatherReport: The description, temperature, feels_like, humidity
+                       and wind_speed (plus the observation time).
+    """
+    # --- Part 5: Extracting the Data ---
+    # Now we navigate the dictionary to pull out the specific pieces
+    # of information we care about. This structure is defined by the API.
+    # We store them in a compact `WeatherReport` instead of keeping the
+    # whole dictionary around.
+    return WeatherReport(
+        description=data['weather'][0]['description'],
+        temperature=data['main']['temp'],
+        feels_like=data['main']['feels_like'],
+        humidity=data['main']['humidity'],
+        wind_speed=data['wind']['speed'],
+        observed_at=data.get('dt'),
+    )
+
+
+def display_weather(report):
+    """Prints a `WeatherReport` in a friendly format."""
+    print("\n--- Current Weather ---")
+    print(f"Description: {report.description.capitalize()}")
+    print(f"Temperature: {report.temperature}°C")
+    print(f"Feels Like:  {report.feels_like}°C")
+    print(f"Humidity:    {report.humidity}%")
+    print(f"Wind Speed:  {report.wind_speed} m/s")
+    print("-----------------------")
+
+
+def make_lookup(session, limiter=None, cache=None, flight=None, units=UNITS, index=None,
+                base_url=None):
+    """
+    Builds the function we use to look up a city, with all the extras wired in.
+
+    The layers, from the outside in:
+    1.  CITY INDEX: the name is checked locally and, if it matches exactly
+        one city, swapped for that city's ID. Unknown names never reach
+        the network.
+    2.  SINGLE-FLIGHT: simultaneous lookups of the same city share one call.
+    3.  CACHE: a recent answer is returned without touching the network.
+    4.  RATE LIMITER: every real API request waits for a token first.
+    5.  `fetch_weather`: the actual request, sent on the pooled session.
+
+    A web front-end can import this module and call `make_lookup()` once,
+    then share the returned function between all of its request handlers.
+
+    Args:
+        session (PooledSession): The session used for API requests.
+        limiter (TokenBucket): Optional rate limiter for API requests.
+        cache (ResponseCache): Optional response cache.
+        flight (SingleFlight): Optional single-flight group.
+        units (str): The unit system to request.
+        index (CityIndex): Optional local city index.
+        base_url (str): The endpoint to call (default: `BASE_URL`).
+
+    Returns:
+        function: `lookup(city)`, which returns a `WeatherReport`.
+                  It raises `CityNotFoundError` for names not in the index.
+    """
+    def upstream(city, city_id):
+        if limiter:
+            limiter.acquire()
+        return fetch_weather(city, units, session=session, city_id=city_id,
+                             base_url=base_url)
+
+    def cached(city, city_id, key):
+        if cache:
+            # The cache only calls the API if it has no usable copy.
+            # A `lambda` (Lesson 20) wraps the call so it can be made later.
+            # The cache stores plain dictionaries, so we convert both ways.
+            values = cache.get_or_fetch(key, lambda: upstream(city, city_id).to_dict())
+            return WeatherReport.from_dict(values)
+        return upstream(city, city_id)
+
+    def lookup(city):
+        city_id = None
+        if index:
+            matches = index.resolve(city)
+            if not matches:
+                raise CityNotFoundError(city, index.suggest(city))
+            if len(matches) == 1:
+                city_id = matches[0].id
+            # Several matches (e.g. "London" in GB, CA and US): we let the API
+            # choose, exactly as it would without an index.
+
+        # Lookups by ID share a cache entry however the name was spelled.
+        if city_id is not None:
+            key = ResponseCache.make_key(f"id:{city_id}", units)
+        else:
+            key = ResponseCache.make_key(city, units)
+
+        if flight:
+            return flight.do(key, lambda: cached(city, city_id, key))
+        return cached(city, city_id, key)
+
+    return lookup
+
+
+def enable_autocomplete(index):
+    """
+    Lets the user press TAB to complete city names at the `input()` prompt.
+
+    This uses the standard `readline` module, which is not available on every
+    platform (e.g. plain Windows). In that case we simply skip autocomplete.
+    """
+    try:
+        import readline
+    except ImportError:
+        return
+
+    def completer(text, state):
+        # `readline` calls us with state 0, 1, 2... until we return None.
+        completions = index.complete(readline.get_line_buffer())
+        return completions[state] if state < len(completions) else None
+
+    # City names contain spaces, so only TAB-separated pieces are "words".
+    readline.set_completer_delims("\t")
+    readline.set_completer(completer)
+    readline.parse_and_bind("tab: complete")
+
+
+def parse_arguments():
+    """Reads the optional command-line settings."""
+    parser = argparse.ArgumentParser(description="Look up the current weather for a city.")
+    parser.add_argument("--base-url", default=BASE_URL,
+                        help="the weather endpoint to call (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="always ask the API, ignoring the response cache")
+    parser.add_argument("--cache-file", default=CACHE_FILE,
+                        help="path of the response cache database")
+    parser.add_argument("--cache-ttl", type=float, default=600,
+                        help="seconds a cached response stays fresh (default: 600)")
+    parser.add_argument("--cache-stale", type=float, default=300,
+                        help="extra seconds a stale response may be served while "
+                             "it is refreshed in the background (default: 300)")
+    parser.add_argument("--cache-size", type=int, default=1000,
+                        help="maximum number of cached cities (default: 1000)")
+    parser.add_argument("--city-index", metavar="FILE",
+                        help="check names against a local city list "
+                             "(city.list.json.gz or a saved .tsv.gz index)")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="look up every city listed in FILE (one per line)")
+    parser.add_argument("--format", choices=["table", "jsonl"], default="table",
+                        help="batch output format (default: table)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="concurrent requests in batch mode (default: 8)")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="maximum API requests per second; the free plan "
+                             "allows 60 per minute (default: 1.0)")
+    parser.add_argument("--burst", type=int, default=1,
+                        help="requests allowed in a short burst (default: 1)")
+    parser.add_argument("--metrics-file", metavar="FILE",
+                        help="save request timing histograms to FILE when done "
+                             "(Prometheus text if it ends in .prom, JSON otherwise)")
+    parser.add_argument("--poll", metavar="FILE",
+                        help="keep running, recording the weather of every city "
+                             "in FILE (one per line) at a regular interval")
+    parser.add_argument("--interval", type=float, default=600,
+                        help="seconds between two readings of a city (default: 600)")
+    parser.add_argument("--jitter", type=float, default=0.1,
+                        help="random variation of the interval, as a fraction (default: 0.1)")
+    parser.add_argument("--history-file", default=HISTORY_FILE,
+                        help="path of the readings database")
+    parser.add_argument("--history", metavar="CITY",
+                        help="print the recorded hourly/daily summaries for CITY")
+    parser.add_argument("--period", choices=["hour", "day"], default="day",
+                        help="summary period for --history (default: day)")
+    return parser.parse_args()
+
+
+def run_poller(args, lookup):
+    """
+    Polls every city in the poll file forever, recording each reading.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line settings.
+        lookup (function): Called as `lookup(city)`; returns the response data.
+    """
+    try:
+        cities = read_cities(args.poll)
+    except OSError as err:
+        print(f"Error: Could not read the city list: {err}")
+        return
+
+    store = TimeSeriesStore(args.history_file)
+    scheduler = PollScheduler(args.interval, jitter=args.jitter, workers=args.workers)
+
+    def make_job(city):
+        # Each job needs its own `city`, so we build it in a separate
+        # function instead of a lambda inside the loop below.
+        def job():
+            report = lookup(city)
+            # The same measurement again (e.g. a "304 Not Modified") is not
+            # recorded twice.
+            added = store.append(city, report.to_dict())
+            print(f"[{time.strftime('%H:%M:%S')}] {city}: {report.temperature}°C"
+                  f"{'' if added else ' (unchanged)'}", file=sys.stderr)
+        return job
+
+    # A DICT COMPREHENSION maps each city to its polling job. A city given
+    # twice is polled only once, as the dict keeps one job per city.
+    jobs = {city: make_job(city) for city in cities}
+    scheduler.add_spread(jobs)
+    if args.metrics_file:
+        # The scheduler can run any repeating job, including saving metrics.
+        scheduler.add("metrics", lambda: METRICS.write(args.metrics_file), delay=args.interval)
+
+    print(f"Polling {len(jobs)} cities every {args.interval:g} seconds. "
+          "Press Ctrl+C to stop.", file=sys.stderr)
+    stop_event = threading.Event()
+    try:
+        scheduler.run(stop_event)
+    except KeyboardInterrupt:
+        # Ctrl+C: stop scheduling new jobs; running ones finish first.
+        stop_event.set()
+        print("\nStopping...", file=sys.stderr)
+    finally:
+        if scheduler.skipped:
+            print(f"Skipped {scheduler.skipped} polls of cities whose previous poll "
+                  "was still running.", file=sys.stderr)
+        store.close()
+
+
+def show_history(args):
+    """Prints the recorded summaries for one city."""
+    store = TimeSeriesStore(args.history_file)
+    try:
+        buckets = store.rollups(args.history, period=args.period)
+    finally:
+        store.close()
+    if not buckets:
+        print(f"No readings recorded for '{args.history}'.")
+        return
+
+    title = "Hourly" if args.period == "hour" else "Daily"
+    print(f"--- {title} summary for {args.history} ---")
+    print(f"{'Start (UTC)':<17} {'Temp min/avg/max':>22} {'Humidity':>9} {'Wind':>6}")
+    for bucket in buckets:
+        start = time.strftime("%Y-%m-%d %H:%M", time.gmtime(bucket["bucket"]))
+        # A field the API never sent in this period has no summary.
+        temp = bucket.get("temperature")
+        temps = (f"{temp['min']:>6.1f} /{temp['mean']:>6.1f} /{temp['max']:>6.1f}"
+                 if temp else f"{'-':>22}")
+        humidity = f"{bucket['humidity']['mean']:.0f}%" if "humidity" in bucket else "-"
+        wind = f"{bucket['wind_speed']['mean']:.1f}" if "wind_speed" in bucket else "-"
+        print(f"{start:<17} {temps} {humidity:>9} {wind:>6}")
+
+
+def run_batch(args, lookup):
+    """
+    Looks up every city in the batch file and writes the results to stdout.
+
+    Args:
+        args (argparse.Namespace): The parsed command-line settings.
+        lookup (function): Called as `lookup(city)`; returns the response data.
+    """
+    try:
+        cities = read_cities(args.batch)
+    except OSError as err:
+        print(f"Error: Could not read the city list: {err}")
+        return
+
+    # Progress goes to stderr so that stdout contains only the results
+    # (handy for `> results.jsonl`).
+    print(f"Fetching weather for {len(cities)} cities...", file=sys.stderr)
+    results = fetch_many(cities, lookup, workers=args.workers)
+    writer = write_jsonl if args.format == "jsonl" else write_table
+    succeeded, failed = writer(results, sys.stdout, WeatherReport.to_dict)
+    print(f"Done: {succeeded} succeeded, {failed} failed.", file=sys.stderr)
+
+
+def run_interactive(lookup):
+    """
+    Asks the user for one city and displays its weather.
+
+    Args:
+        lookup (function): Called as `lookup(city)`; returns the response data.
+    """
+    # --- Part 2: Get User Input ---
+    # Ask the user for the city they want the weather for.
+    city = input("Enter the name of a city: ")
+
+    print(f"\nFetching weather data for {city}...")
+
+    # Now, we use a `try...except` block to gracefully handle potential errors,
+    # such as no internet connection or an invalid city name.
+    try:
+        report = lookup(city)
+
+        # To understand the data, it's helpful to print it out during development.
+        # Uncomment the line below to see the extracted fields!
+        # print(report)
+
+        display_weather(report)
+
+    except CityNotFoundError as err:
+        # The local index caught a typo: no request was sent at all.
+        print(f"Error: {err}")
+    except requests.exceptions.HTTPError as err:
+        # This block catches specific HTTP errors.
+        if err.response.status_code == 404:
+            print(f"Error: City '{city}' not found. Please check the spelling.")
+        elif err.response.status_code == 401:
+            print("Error: Invalid API key. Please check your key in the script.")
+        else:
+            print(f"An HTTP error occurred: {err}")
+    except requests.exceptions.RequestException as err:
+        # This is a general catch-all for other `requests` issues (e.g., network error).
+        print(f"An error occurred: {err}")
+
+
+def main():
+    """The main function: reads the settings and runs the chosen mode."""
+    args = parse_arguments()
+
+    # Reading the history needs no API key, so we handle it first.
+    if args.history:
+        show_history(args)
+        return
 
-# The main execution block starts here.
-if __name__ == "__main__":
-    
-    # --- Part 1: Configuration ---
-    # It's good practice to put configuration variables at the top.
-    
-    # PASTE YOUR API KEY HERE! Replace the placeholder string with your actual key.
-    # The program WILL NOT WORK without a valid key.
-    API_KEY = "YOUR_API_KEY_GOES_HERE"
-    
-    # This is the base URL for the weather API endpoint we are using.
-    BASE_URL = "https://api.openweathermap.org/data/2.5/weather"
-    
     # We must check if the user has replaced the placeholder key.
     if API_KEY == "YOUR_API_KEY_GOES_HERE":
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
         print("!!! ERROR: You have not set your API_KEY.            !!!")
         print("!!! Open this file and replace the placeholder text. !!!")
         print("!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!")
-    else:
-        # --- Part 2: Get User Input ---
-        # Ask the user for the city they want the weather for.
-        city = input("Enter the name of a city: ")
-        
-        # --- Part 3: Making the API Request ---
-        # We construct the full URL with "parameters". Parameters are added to a URL
-        # after a `?` and are used to send information with our request.
-        # `q` is the parameter for the city name.
-        # `appid` is the parameter for our API key.
-        # `units=metric` tells the API to return temperature in Celsius.
-        request_url = f"{BASE_URL}?q={city}&appid={API_KEY}&units=metric"
-        
-        print(f"\nFetching weather data for {city}...")
-        
-        # Now, we use a `try...except` block to gracefully handle potential errors,
-        # such as no internet connection or an invalid city name.
+        return
+
+    index = None
+    if args.city_index:
         try:
-            # `requests.get()` sends an HTTP GET request to the specified URL.
-            response = requests.get(request_url)
-            
-            # The `raise_for_status()` method is a great helper. If the request
-            # resulted in an error (e.g., 404 Not Found, 401 Unauthorized),
-            # it will automatically raise an exception and stop the program here.
-            response.raise_for_status()
-            
-            # --- Part 4: Parsing the JSON Response ---
-            # If the request was successful (status code 200 OK), the response
-            # object contains the data from the server. The `.json()` method
-            # automatically parses the JSON text into a Python dictionary.
-            data = response.json()
-            
-            # To understand the data, it's helpful to print it out during development.
-            # Uncomment the line below to see the full dictionary structure!
-            # print(data)
-            
-            # --- Part 5: Extracting and Displaying Data ---
-            # Now we navigate the dictionary to pull out the specific pieces
-            # of information we care about. This structure is defined by the API.
-            weather_description = data['weather'][0]['description']
-            temperature = data['main']['temp']
-            feels_like = data['main']['feels_like']
-            humidity = data['main']['humidity']
-            wind_speed = data['wind']['speed']
-            
-            print("\n--- Current Weather ---")
-            print(f"Description: {weather_description.capitalize()}")
-            print(f"Temperature: {temperature}°C")
-            print(f"Feels Like:  {feels_like}°C")
-            print(f"Humidity:    {humidity}%")
-            print(f"Wind Speed:  {wind_speed} m/s")
-            print("-----------------------")
-
-        except requests.exceptions.HTTPError as err:
-            # This block catches specific HTTP errors.
-            if err.response.status_code == 404:
-                print(f"Error: City '{city}' not found. Please check the spelling.")
-            elif err.response.status_code == 401:
-                print("Error: Invalid API key. Please check your key in the script.")
-            else:
-                print(f"An HTTP error occurred: {err}")
-        except requests.exceptions.RequestException as err:
-            # This is a general catch-all for other `requests` issues (e.g., network error).
-            print(f"An error occurred: {err}")
+            index = CityIndex.load(args.city_index)
+        except (OSError, ValueError) as err:
+            print(f"Error: Could not load the city index: {err}")
+            return
+        enable_autocomplete(index)
+
+    # Polling always wants a NEW reading, so it skips the response cache.
+    cache = None
+    if not args.no_cache and not args.poll:
+        cache = ResponseCache(args.cache_file, ttl=args.cache_ttl,
+                              stale_ttl=args.cache_stale, max_entries=args.cache_size)
+
+    # One connection per worker thread lets every worker reuse its own
+    # kept-alive connection instead of waiting for a free one.
+    session = PooledSession(pool_maxsize=max(args.workers, 1))
+
+    # Every request to the API first takes a token from the bucket, which keeps
+    # us under the quota. Cache hits never reach the API, so they are free.
+    limiter = TokenBucket(args.rate, args.burst)
+
+    # A batch file may list the same city more than once; single-flight makes
+    # the duplicates that run at the same time share one request.
+    lookup = make_lookup(session, limiter, cache, SingleFlight(), index=index,
+                         base_url=args.base_url)
+
+    try:
+        if args.poll:
+            run_poller(args, lookup)
+        elif args.batch:
+            run_batch(args, lookup)
+        else:
+            run_interactive(lookup)
+    finally:
+        # Closing the cache waits for any background refresh to finish.
+        if cache:
+            cache.close()
+        session.close()
+        if args.metrics_file:
+            METRICS.write(args.metrics_file)
+
+
+# The main execution block starts here.
+if __name__ == "__main__":
+    main()
 
 '''
 =====================================================================================
@@ -176,4 +634,75 @@ HOW TO RUN THIS CODE:
 4.  Open a terminal or command prompt.
 5.  Navigate to the directory where you saved this file.
 6.  Run the file with the command: `python 19_project_api_weather_app.py`
+
+RESPONSE CACHE:
+
+Answers are cached in `weather_cache.sqlite3` next to this script, so asking
+for the same city again within 10 minutes costs no network request. Useful
+options (see `python 19_project_api_weather_app.py --help`):
+-   `--no-cache`      Always ask the API.
+-   `--cache-ttl 60`  Keep answers fresh for 60 seconds instead of 600.
+-   `--cache-size 300` Keep at most 300 cities, dropping the least recently used.
+
+BATCH MODE:
+
+Put one city per line in a text file and pass it with `--batch`. The cities
+are fetched concurrently by a pool of threads, while a token-bucket rate
+limiter keeps the request rate under your API plan's quota:
+`python 19_project_api_weather_app.py --batch cities.txt --rate 1 --format jsonl > weather.jsonl`
+-   `--rate`     Requests per second your plan allows (60/minute = 1.0).
+-   `--burst`    How many requests may be sent at once after an idle period.
+-   `--workers`  How many requests may be waiting on the network at once.
+-   `--format`   `table` (default) or `jsonl` (one JSON object per line).
+
+OFFLINE TESTING WITH THE STUB SERVER:
+
+`weather_app/stub_server.py` is a local stand-in for the API, with adjustable
+latency and error rates. Start it, then point the app at it:
+`python -m weather_app.stub_server --port 8099 --latency 0.05 --rate-5xx 0.02`
+`python 19_project_api_weather_app.py --base-url http://127.0.0.1:8099/data/2.5/weather`
+(set OPENWEATHER_API_KEY to any value; the stub accepts every key by default).
+
+CONDITIONAL REQUESTS:
+
+When the server labels a response with an ETag or Last-Modified header, the
+app remembers it and sends it back next time (`If-None-Match` /
+`If-Modified-Since`). Unchanged weather then comes back as an empty
+"304 Not Modified", and the previous `WeatherReport` is reused. This matters
+most in polling mode, which asks about the same cities over and over.
+
+REQUEST TIMINGS:
+
+`--metrics-file timings.prom` (Prometheus text) or `--metrics-file timings.json`
+saves histograms of every request's phases when the program ends (and every
+interval in polling mode): retries, connection setup (DNS, TCP, TLS), time to
+first byte, body download, and JSON decode. They show whether slow lookups come from
+the network, the API, or our own parsing.
+
+POLLING MODE:
+
+Instead of running this script from `cron` once per city (which pays for a
+new Python start-up and new connections every time), one process can poll a
+whole list of cities on a schedule and record every reading:
+`python 19_project_api_weather_app.py --poll cities.txt --interval 600`
+Readings go to `weather_history.sqlite3`, along with hourly and daily
+summaries. A measurement the API already gave us (same `dt`) is recorded
+only once. To see them:
+`python 19_project_api_weather_app.py --history London --period hour`
+
+LOCAL CITY INDEX:
+
+Download `city.list.json.gz` from https://bulk.openweathermap.org/sample/ and
+pass it with `--city-index`. Names are then checked locally (with TAB
+autocomplete at the prompt and "Did you mean" suggestions for typos) and
+sent to the API as city IDs. Save a compact index once for faster start-up:
+`python -m weather_app.city_index city.list.json.gz city_index.tsv.gz`
+`python 19_project_api_weather_app.py --city-index city_index.tsv.gz`
+
+USING THE LOOKUP FROM OTHER PROGRAMS:
+
+`make_lookup()` returns a single `lookup(city)` function with the cache, the
+rate limiter and single-flight coalescing wired in. A web front-end should
+build it once and share it: when a burst of users asks for the same city at
+the same moment, only one request reaches the API and everyone gets its answer.
 '''
\ No newline at end of file
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Shared HTTP Client Module
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `PooledSession`, a `requests.Session` with sensible
+defaults for talking to web servers many times: kept-alive pooled connections,
+per-host pool sizes, default timeouts, gzip compression, and automatic retries
+with jittered exponential backoff. Both the weather app (Lesson 19) and the
+web scraper (Lesson 22) use it.
+"""
+
+'''
+WHY NOT JUST `requests.get()`?
+Every call to the module-level `requests.get()` opens a brand-new connection:
+a TCP handshake, then (for HTTPS) a TLS handshake, and only then the actual
+request. When you talk to the same server again and again, those handshakes
+can take longer than the request itself.
+
+A `requests.Session` keeps connections OPEN between requests ("keep-alive")
+and reuses them from a CONNECTION POOL. The second request to a host skips the
+handshakes entirely.
+
+On top of that, `PooledSession` adds:
+-   POOL SIZING: how many connections to keep open per host. Concurrent code
+    (like the weather app's batch mode) needs at least one per thread.
+-   TIMEOUTS: `requests` waits forever by default. We never want that.
+-   GZIP: we ask servers to compress responses, so less data crosses the wire.
+-   RETRIES WITH JITTERED BACKOFF: a dropped connection or a "503 Service
+    Unavailable" is often temporary, so we try again. Each retry waits
+    longer (exponential backoff), and the wait is randomized ("jitter") so
+    that many clients do not all retry at the same instant. A server that
+    says how long to wait (a `Retry-After` header) gets exactly that wait,
+    up to `max_retry_after` seconds; if it asks for longer, we stop retrying
+    and hand its response back.
+-   CONNECTION TIMING: every time the pool has to open a NEW connection, we
+    time it. `take_connect_time()` tells the caller how long the current
+    thread spent connecting, which is how the weather app separates
+    connection setup from the server's response time. Likewise,
+    `take_retry_time()` tells it how long the failed attempts and the waits
+    before each retry took, so they are not mistaken for a slow server.
+'''
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+# (connect timeout, read timeout) in seconds.
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Status codes that usually mean "try again later".
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Only requests that are safe to repeat are retried automatically.
+RETRY_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+# Connection-setup time, recorded per thread. A request and the connection it
+# opens always run on the same thread, so thread-local storage keeps
+# concurrent requests from mixing up each other's numbers.
+_connect_timing = threading.local()
+
+
+def take_connect_time():
+    """
+    Returns the seconds this thread has spent opening connections since the
+    last call, and resets the counter to zero.
+
+    Call it once before a request (to reset) and once after (to read).
+    """
+    elapsed = getattr(_connect_timing, "seconds", 0.0)
+    _connect_timing.seconds = 0.0
+    return elapsed
+
+
+def _add_connect_time(seconds):
+    _connect_timing.seconds = getattr(_connect_timing, "seconds", 0.0) + seconds
+
+
+def take_retry_time():
+    """
+    Returns the seconds this thread has spent on failed attempts and backoff
+    waits since the last call, and resets the counter to zero.
+
+    Used like `take_connect_time()`.
+    """
+    elapsed = getattr(_connect_timing, "retry_seconds", 0.0)
+    _connect_timing.retry_seconds = 0.0
+    return elapsed
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    """An HTTP connection that records how long `connect()` takes."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    """An HTTPS connection that records how long `connect()` (with TLS) takes."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _add_connect_time(time.perf_counter() - start)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """An `HTTPAdapter` whose connection pools time every new connection."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+class PooledSession(requests.Session):
+    """
+    A `requests.Session` with connection pooling, timeouts and retries.
+    """
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, retries=3, backoff_base=0.5,
+                 backoff_cap=10.0, pool_connections=10, pool_maxsize=10,
+                 host_pool_sizes=None, retry_statuses=RETRY_STATUSES,
+                 max_retry_after=60.0):
+        """
+        Initializes the session.
+
+        Args:
+            timeout (float or tuple): The default timeout for every request.
+            retries (int): How many times to retry a failed request.
+            backoff_base (float): The first retry waits up to this many seconds;
+                                  each later retry doubles the limit.
+            backoff_cap (float): The longest backoff wait between retries (a
+                                 server's `Retry-After` is not cut short).
+            pool_connections (int): How many different hosts to keep pools for.
+            pool_maxsize (int): How many connections to keep open per host.
+            host_pool_sizes (dict): Optional per-host overrides of
+                                    `pool_maxsize`, e.g. {"example.com": 32}.
+            retry_statuses (set): The response status codes that are retried.
+                                  Leave one out (e.g. 429) to hand those
+                                  responses straight back to the caller.
+            max_retry_after (float): The longest `Retry-After` we wait for.
+                                     If a server asks for more, its response
+                                     is returned instead of retried.
+        """
+        super().__init__()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retry_statuses = set(retry_statuses)
+        self.max_retry_after = max_retry_after
+
+        # Ask for compressed responses. `requests` decompresses them for us.
+        self.headers["Accept-Encoding"] = "gzip, deflate"
+
+        # The default adapters handle every http:// and https:// URL.
+        adapter = TimedHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.mount("http://", adapter)
+        self.mount("https://", adapter)
+
+        # Busy hosts can get a bigger pool of their own. `requests` always
+        # picks the adapter with the LONGEST matching prefix, so these win.
+        for host, size in (host_pool_sizes or {}).items():
+            host_adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=size)
+            self.mount(f"http://{host}/", host_adapter)
+            self.mount(f"https://{host}/", host_adapter)
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request, applying the default timeout and retrying on failure.
+
+        Takes the same arguments as `requests.Session.request()`.
+
+        Returns:
+            requests.Response: The final response (which may still be an
+                               error status; call `raise_for_status()`).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        retries = self.retries if method.upper() in RETRY_METHODS else 0
+
+        attempt = 0
+        first_start = time.perf_counter()
+        connect_before = getattr(_connect_timing, "seconds", 0.0)
+        while True:
+            attempt_start = time.perf_counter()
+            # Connections opened by failed attempts are part of the retry
+            # time, so only the last attempt's count as connection setup.
+            _connect_timing.seconds = connect_before
+            try:
+                response = super().request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= retries:
+                    self._add_retry_time(attempt_start - first_start)
+                    raise
+            else:
+                if response.status_code not in self.retry_statuses or attempt >= retries:
+                    self._add_retry_time(attempt_start - first_start)
+                    return response
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    # Waiting that long would stall the caller; let it decide.
+                    self._add_retry_time(attempt_start - first_start)
+                    return response
+                # Release the connection back to the pool before we wait.
+                response.close()
+                if retry_after is not None:
+                    # The server knows best when it will be ready, so its wait
+                    # is not shortened to `backoff_cap`.
+                    time.sleep(retry_after)
+                    attempt += 1
+                    continue
+            time.sleep(self.backoff_delay(attempt))
+            attempt += 1
+
+    @staticmethod
+    def _add_retry_time(seconds):
+        _connect_timing.retry_seconds = getattr(_connect_timing, "retry_seconds", 0.0) + seconds
+
+    def backoff_delay(self, attempt):
+        """
+        Returns how long to wait before retry number `attempt` (0-based).
+
+        This is "full jitter" backoff: a random wait between zero and an
+        exponentially growing limit.
+        """
+        limit = min(self.backoff_cap, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, limit)
+
+
+def parse_retry_after(value):
+    """
+    Returns the seconds a `Retry-After` header asks us to wait.
+
+    The header is either a number of seconds ("120") or an HTTP date
+    ("Wed, 21 Oct 2026 07:28:00 GMT"); a date in the past means "now".
+
+    Args:
+        value (str): The header's value, or None if there is no header.
+
+    Returns:
+        float: The wait in seconds, or None if there is no (valid) header.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        # Not a date either; the caller falls back to its normal backoff.
+        return None
+
+
+_shared_session = None
+_shared_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide shared `PooledSession`, creating it on first use.
+
+    Sharing one session means every part of a program reuses the same pool
+    of open connections.
+    """
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is None:
+            _shared_session = PooledSession()
+        return _shared_session
+
+
+if __name__ == "__main__":
+    print("This is a shared helper module for the weather app and the web scraper.")
+    print("It is not meant to be run directly.")
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+# This __init__.py file makes the 'weather_app' directory a Python package.
+# It holds the helper modules used by `19_project_api_weather_app.py`, so the
+# lesson file can stay focused on the API request itself. For example:
+# from weather_app.cache import ResponseCache
@@ -0,0 +1,191 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Batch Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module adds a batch mode to the weather app: it reads a list of cities
+from a file, fetches them concurrently with a pool of threads, keeps the
+request rate under the API quota with a token-bucket rate limiter, and writes
+the results as a table or as JSON Lines.
+"""
+
+'''
+WHY THREADS?
+Fetching one city takes a fraction of a second, and almost all of that time is
+spent WAITING for the server to answer. While one request waits, our program
+could be sending the next one. A THREAD POOL (`concurrent.futures`) runs many
+requests at the same time, so the waiting overlaps instead of adding up.
+
+WHY A RATE LIMITER?
+APIs limit how many requests you may send (the free OpenWeatherMap plan allows
+60 per minute). Sending faster just earns "429 Too Many Requests" errors.
+
+A TOKEN BUCKET is the classic way to stay under a limit:
+-   Picture a bucket that fills with tokens at a steady `rate` per second, up
+    to a maximum of `capacity` tokens.
+-   Every request must take one token out first. If the bucket is empty, the
+    request waits until the next token drips in.
+-   A full bucket allows a short BURST of requests, but over any longer period
+    the average speed can never exceed `rate`.
+'''
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+
+class TokenBucket:
+    """
+    A thread-safe token-bucket rate limiter.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """
+        Initializes the bucket, full.
+
+        Args:
+            rate (float): Tokens added per second (the sustained request rate).
+            capacity (int): The most tokens the bucket can hold (the burst size).
+        """
+        if rate <= 0:
+            raise ValueError("The rate must be positive.")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes one token, waiting until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                # Add the tokens that "dripped in" since we last looked.
+                elapsed = now - self._last_refill
+                self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Work out how long until the next whole token arrives.
+                wait = (1 - self._tokens) / self.rate
+            # We sleep OUTSIDE the lock so other threads are not blocked.
+            time.sleep(wait)
+
+
+def read_cities(file_path):
+    """
+    Reads city names from a text file, one per line.
+
+    Blank lines and lines starting with `#` are ignored.
+
+    Args:
+        file_path (str): The path of the file.
+
+    Returns:
+        list: The city names, in file order.
+    """
+    with open(file_path, mode='r', encoding='utf-8') as city_file:
+        cities = [line.strip() for line in city_file]
+    return [city for city in cities if city and not city.startswith("#")]
+
+
+def describe_error(err):
+    """Turns an exception from a lookup into a short, readable message."""
+    if isinstance(err, requests.exceptions.HTTPError) and err.response is not None:
+        if err.response.status_code == 404:
+            return "city not found"
+        return f"HTTP {err.response.status_code}"
+    return str(err) or type(err).__name__
+
+
+def fetch_many(cities, fetch, workers=8):
+    """
+    Fetches many cities concurrently.
+
+    Results are yielded as soon as each lookup finishes, so the caller can
+    write them out while the rest are still in flight.
+
+    Args:
+        cities (list): The city names to look up.
+        fetch (function): Called as `fetch(city)`; returns the response data.
+                          Rate limiting and caching belong inside this function.
+        workers (int): The number of threads sending requests at once.
+
+    Yields:
+        tuple: (city, data, error). Exactly one of `data` and `error` is None.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # A DICT COMPREHENSION maps each pending "future" back to its city.
+        futures = {executor.submit(fetch, city): city for city in cities}
+        for future in as_completed(futures):
+            city = futures[future]
+            try:
+                yield city, future.result(), None
+            except Exception as err:
+                yield city, None, describe_error(err)
+
+
+def write_jsonl(results, output_file, extract):
+    """
+    Writes results as JSON Lines: one JSON object per line.
+
+    Args:
+        results (iterable): (city, data, error) tuples from `fetch_many`.
+        output_file (file): An open text file, e.g. `sys.stdout`.
+        extract (function): Turns a lookup result into a dictionary of fields.
+
+    Returns:
+        tuple: (succeeded, failed) counts.
+    """
+    succeeded = failed = 0
+    for city, data, error in results:
+        if error is None:
+            record = {"city": city, **extract(data)}
+            succeeded += 1
+        else:
+            record = {"city": city, "error": error}
+            failed += 1
+        output_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return succeeded, failed
+
+
+def write_table(results, output_file, extract):
+    """
+    Writes results as a fixed-width text table.
+
+    Args:
+        results (iterable): (city, data, error) tuples from `fetch_many`.
+        output_file (file): An open text file, e.g. `sys.stdout`.
+        extract (function): Turns a lookup result into a dictionary of fields.
+
+    Returns:
+        tuple: (succeeded, failed) counts.
+    """
+    output_file.write(f"{'City':<24} {'Temp':>7} {'Feels':>7} {'Hum':>5} {'Wind':>6}  Description\n")
+    output_file.write("-" * 80 + "\n")
+    succeeded = failed = 0
+    for city, data, error in results:
+        if error is None:
+            w = extract(data)
+            output_file.write(
+                f"{city[:24]:<24} {w['temperature']:>7} {w['feels_like']:>7} "
+                f"{w['humidity']:>5} {w['wind_speed']:>6}  {w['description']}\n"
+            )
+            succeeded += 1
+        else:
+            output_file.write(f"{city[:24]:<24} ERROR: {error}\n")
+            failed += 1
+    return succeeded, failed
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py --batch cities.txt' instead.")
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Response Cache Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `ResponseCache`, a small on-disk cache for weather API
+responses. It is backed by SQLite, expires entries after a configurable
+time-to-live (TTL), evicts the least recently used entries when it grows too
+large, and can serve slightly stale data while refreshing it in the background.
+"""
+
+'''
+WHY CACHE?
+Weather does not change every second. If we asked about "London" ten seconds
+ago, asking the API again is a wasted network round trip (and uses up our
+API quota). A CACHE remembers recent answers so repeat questions cost nothing.
+
+HOW THIS CACHE WORKS:
+-   STORAGE: A single SQLite database file (`sqlite3` is in the standard
+    library). It survives between runs of the program, unlike a dictionary.
+-   KEYS: The city name is NORMALIZED (lowercase, extra spaces removed) and
+    combined with the units, so "London", " london " and "LONDON" share one
+    entry, but metric and imperial results do not.
+-   TTL (time-to-live): An entry younger than `ttl` seconds is FRESH and is
+    returned straight away.
+-   STALE-WHILE-REVALIDATE: An entry older than `ttl`, but younger than
+    `ttl + stale_ttl`, is STALE. We still return it immediately, and start a
+    background thread that fetches a fresh copy for the next caller.
+-   LRU EVICTION: Every hit records when the entry was last used. When the
+    cache holds more than `max_entries`, the Least Recently Used entries are
+    deleted first. The cache counts its rows, so it only runs the eviction
+    query when there really are too many.
+'''
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResponseCache:
+    """
+    A persistent, size-bounded TTL cache for API responses.
+    """
+
+    def __init__(self, path, ttl=600, stale_ttl=300, max_entries=1000, refresh_workers=4):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path (str): The path of the SQLite database file.
+            ttl (float): Seconds an entry stays fresh.
+            stale_ttl (float): Extra seconds a stale entry may still be served
+                               while it is refreshed in the background.
+            max_entries (int): The maximum number of entries kept on disk.
+            refresh_workers (int): The most background refreshes running at
+                                   the same time.
+        """
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+
+        # The cache may be used from several threads (the background refresh,
+        # or a batch of concurrent lookups), so one lock guards the connection.
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        # A small, fixed pool of threads does the background refreshes, so a
+        # long-running program never piles up finished threads.
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers,
+                                                thread_name_prefix="cache-refresh")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " body TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " last_used REAL NOT NULL)"
+            )
+            # An index on `last_used` keeps LRU eviction fast as the cache grows.
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)"
+            )
+        # Counted once here, then kept up to date by `store()`.
+        self._count = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(city, units):
+        """
+        Builds a normalized cache key.
+
+        Args:
+            city (str): The city name as the user typed it.
+            units (str): The unit system, e.g. "metric".
+
+        Returns:
+            str: A key such as "new york|metric".
+        """
+        # `split()` with no arguments also collapses runs of inner whitespace.
+        normalized_city = " ".join(city.lower().split())
+        return f"{normalized_city}|{units}"
+
+    def lookup(self, key):
+        """
+        Looks up an entry without fetching anything.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            tuple: (data, state) where `state` is "fresh", "stale" or "miss".
+                   `data` is None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None, "miss"
+
+            body, stored_at = row
+            age = now - stored_at
+            if age > self.ttl + self.stale_ttl:
+                return None, "miss"
+
+            # Record the hit so LRU eviction keeps popular entries around.
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(body), ("fresh" if age <= self.ttl else "stale")
+
+    def store(self, key, data):
+        """
+        Saves an entry, evicting the least recently used ones if needed.
+
+        Args:
+            key (str): The cache key.
+            data (dict): The JSON-compatible response data.
+        """
+        now = time.time()
+        body = json.dumps(data)
+        with self._lock, self._connection:
+            updated = self._connection.execute(
+                "UPDATE responses SET body = ?, stored_at = ?, last_used = ? WHERE key = ?",
+                (body, now, now, key),
+            ).rowcount
+            if updated:
+                return  # Replacing an entry does not grow the cache.
+            self._connection.execute(
+                "INSERT INTO responses (key, body, stored_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, body, now, now),
+            )
+            self._count += 1
+            if self._count <= self.max_entries:
+                return
+            # Delete everything except the `max_entries` most recently used rows.
+            self._count -= self._connection.execute(
+                "DELETE FROM responses WHERE key NOT IN ("
+                " SELECT key FROM responses ORDER BY last_used DESC LIMIT ?)",
+                (self.max_entries,),
+            ).rowcount
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Returns cached data, calling `fetch()` only when we have to.
+
+        Args:
+            key (str): The cache key.
+            fetch (function): Called with no arguments to get fresh data. Any
+                              exception it raises is passed on to the caller.
+
+        Returns:
+            dict: The response data.
+        """
+        data, state = self.lookup(key)
+        if state == "fresh":
+            return data
+        if state == "stale":
+            # Serve the stale copy now; refresh it for the next caller.
+            self._refresh_in_background(key, fetch)
+            return data
+
+        data = fetch()
+        self.store(key, data)
+        return data
+
+    def _refresh_in_background(self, key, fetch):
+        """Starts one background refresh per key (extra requests are ignored)."""
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self.store(key, fetch())
+            except Exception:
+                # A failed refresh is not fatal: the stale copy stays in place
+                # and the next caller will simply try again.
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._refresh_pool.submit(refresh)
+
+    def close(self):
+        """Waits for background refreshes to finish and closes the database."""
+        self._refresh_pool.shutdown(wait=True)
+        with self._lock:
+            self._connection.close()
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py' instead.")
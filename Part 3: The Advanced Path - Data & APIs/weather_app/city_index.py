@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (City Index Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `CityIndex`, a local, in-memory database of city names
+built from OpenWeatherMap's offline city list. It resolves names to city IDs,
+autocompletes partial names, and suggests corrections for misspellings, all
+without a single network request.
+"""
+
+'''
+WHY A LOCAL INDEX?
+Without one, the weather app sends whatever the user typed to the API and only
+learns about a typo ("Lodnon") from a "404 Not Found" response: a wasted
+round trip that still counts against our quota. OpenWeatherMap publishes every
+city it knows about as a downloadable file, so we can check names LOCALLY.
+
+Get the list from https://bulk.openweathermap.org/sample/ (`city.list.json.gz`).
+It is a JSON array of objects like:
+    {"id": 2643743, "name": "London", "state": "", "country": "GB",
+     "coord": {"lon": -0.12574, "lat": 51.50853}}
+
+HOW THE INDEX WORKS:
+-   NORMALIZATION: "São Paulo", "sao paulo" and "SAO-PAULO" all become the key
+    "sao paulo" (accents removed, lowercase, punctuation turned into spaces).
+-   SORTED KEYS + BINARY SEARCH: all keys are kept in one sorted list. The
+    `bisect` module finds a key (or the first key starting with a prefix) in
+    about 18 comparisons for 200,000 cities, instead of checking every one.
+    Every name that starts with "lon" sits in one contiguous run of the list,
+    which makes AUTOCOMPLETE a simple slice.
+-   COMPACT STORAGE: instead of one object per city, we keep PARALLEL LISTS
+    (keys, names, countries) and a typed `array` of IDs. Repeated country
+    codes are interned so they share one string in memory.
+-   FUZZY SUGGESTIONS: for names that don't exist, we break the query into
+    TRIGRAMS (overlapping 3-letter pieces: "lodnon" -> "lod", "odn", ...),
+    find the cities that share the most trigrams, and rank those few
+    candidates with `difflib`. The trigram table is only built the first time
+    a suggestion is needed.
+'''
+
+import bisect
+import difflib
+import gzip
+import heapq
+import json
+import sys
+import unicodedata
+from array import array
+from collections import namedtuple
+
+# One resolved city. Built on demand; the index itself stores parallel lists.
+City = namedtuple("City", ["id", "name", "country"])
+
+
+class CityNotFoundError(LookupError):
+    """Raised when a city name is not in the local index."""
+
+    def __init__(self, query, suggestions):
+        self.query = query
+        self.suggestions = suggestions
+        message = f"City '{query}' not found."
+        if suggestions:
+            message += f" Did you mean: {', '.join(suggestions)}?"
+        super().__init__(message)
+
+
+def normalize(text):
+    """
+    Turns a city name into its index key.
+
+    Args:
+        text (str): A city name, e.g. "Saint-Étienne".
+
+    Returns:
+        str: The normalized key, e.g. "saint etienne".
+    """
+    # NFKD splits "é" into "e" plus a separate accent mark, which we then drop.
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    cleaned = "".join(ch if ch.isalnum() else " " for ch in stripped.casefold())
+    return " ".join(cleaned.split())
+
+
+def _trigrams(key):
+    """Returns the set of 3-letter pieces of a key, padded with spaces."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CityIndex:
+    """
+    A sorted, in-memory index of city names for lookups and autocomplete.
+    """
+
+    def __init__(self, records):
+        """
+        Builds the index.
+
+        Args:
+            records (iterable): (name, country, city_id) tuples.
+        """
+        entries = sorted((normalize(name), name, country, city_id)
+                         for name, country, city_id in records)
+        self._keys = [entry[0] for entry in entries]
+        self._names = [entry[1] for entry in entries]
+        self._countries = [sys.intern(entry[2]) for entry in entries]
+        self._ids = array("q", (entry[3] for entry in entries))
+        # Built lazily by `suggest()`: trigram -> positions of unique keys.
+        self._trigram_table = None
+
+    def __len__(self):
+        return len(self._keys)
+
+    @classmethod
+    def from_city_list(cls, file_path):
+        """
+        Builds an index from OpenWeatherMap's `city.list.json(.gz)` file.
+
+        Args:
+            file_path (str): The path of the JSON (or gzipped JSON) city list.
+
+        Returns:
+            CityIndex: The new index.
+        """
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, mode="rt", encoding="utf-8") as city_file:
+            cities = json.load(city_file)
+        return cls((city["name"], city.get("country", ""), city["id"]) for city in cities)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads an index saved by `save()`, or builds one from a raw city list.
+
+        Args:
+            file_path (str): A `.tsv(.gz)` file from `save()`, or a
+                             `city.list.json(.gz)` file.
+
+        Returns:
+            CityIndex: The loaded index.
+        """
+        if file_path.endswith((".json", ".json.gz")):
+            return cls.from_city_list(file_path)
+
+        opener = gzip.open if file_path.endswith(".gz") else open
+        index = cls([])
+        with opener(file_path, mode="rt", encoding="utf-8") as index_file:
+            for line in index_file:
+                key, name, country, city_id = line.rstrip("\n").split("\t")
+                index._keys.append(key)
+                index._names.append(name)
+                index._countries.append(sys.intern(country))
+                index._ids.append(int(city_id))
+        return index
+
+    def save(self, file_path):
+        """
+        Saves the index as a sorted, tab-separated file (gzipped if the name
+        ends in `.gz`). Loading it later skips the sorting and normalizing.
+
+        Args:
+            file_path (str): Where to save the index.
+        """
+        opener = gzip.open if file_path.endswith(".gz") else open
+        with opener(file_path, mode="wt", encoding="utf-8") as index_file:
+            for position, key in enumerate(self._keys):
+                index_file.write(f"{key}\t{self._names[position]}\t"
+                                 f"{self._countries[position]}\t{self._ids[position]}\n")
+
+    def _city(self, position):
+        return City(self._ids[position], self._names[position], self._countries[position])
+
+    def resolve(self, query):
+        """
+        Finds every city whose name matches `query` exactly (after normalizing).
+
+        The query may end with a country code, OpenWeatherMap style:
+        "London" matches every London, "London,GB" only the British one.
+
+        Args:
+            query (str): The city name, optionally followed by ",CC".
+
+        Returns:
+            list: The matching `City` tuples (empty if there are none).
+        """
+        name, _, country = query.partition(",")
+        key = normalize(name)
+        country = country.strip().upper()
+
+        # Binary search for the first position holding `key`...
+        start = bisect.bisect_left(self._keys, key)
+        matches = []
+        # ...then walk forward while the key still matches.
+        position = start
+        while position < len(self._keys) and self._keys[position] == key:
+            if not country or self._countries[position] == country:
+                matches.append(self._city(position))
+            position += 1
+        return matches
+
+    def complete(self, prefix, limit=10):
+        """
+        Returns up to `limit` city names starting with `prefix`.
+
+        Args:
+            prefix (str): What the user has typed so far.
+            limit (int): The maximum number of completions.
+
+        Returns:
+            list: Display names like "London,GB", in alphabetical order.
+        """
+        key = normalize(prefix)
+        position = bisect.bisect_left(self._keys, key)
+        completions = []
+        while (position < len(self._keys) and len(completions) < limit
+               and self._keys[position].startswith(key)):
+            completion = f"{self._names[position]},{self._countries[position]}"
+            if completion not in completions:
+                completions.append(completion)
+            position += 1
+        return completions
+
+    def suggest(self, query, limit=5):
+        """
+        Suggests the closest known city names for a misspelled query.
+
+        Args:
+            query (str): The name that could not be resolved.
+            limit (int): The maximum number of suggestions.
+
+        Returns:
+            list: City names, best match first.
+        """
+        key = normalize(query.partition(",")[0])
+        if not key:
+            return []
+        if self._trigram_table is None:
+            self._build_trigram_table()
+
+        # Count how many trigrams each candidate shares with the query.
+        shared = {}
+        for gram in _trigrams(key):
+            for position in self._trigram_table.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        # Only the best few dozen candidates get the (slower) exact ranking.
+        candidates = heapq.nlargest(50, shared, key=shared.get)
+        matcher = difflib.SequenceMatcher(b=key)
+        scored = []
+        for position in candidates:
+            matcher.set_seq1(self._keys[position])
+            scored.append((matcher.ratio(), self._names[position]))
+        scored.sort(reverse=True)
+
+        suggestions = []
+        for score, name in scored:
+            if score >= 0.6 and name not in suggestions:
+                suggestions.append(name)
+            if len(suggestions) == limit:
+                break
+        return suggestions
+
+    def _build_trigram_table(self):
+        """Maps every trigram to the positions of the unique keys containing it."""
+        table = {}
+        previous = None
+        for position, key in enumerate(self._keys):
+            # Keys are sorted, so duplicates are neighbours; index each once.
+            if key == previous:
+                continue
+            previous = key
+            for gram in _trigrams(key):
+                postings = table.get(gram)
+                if postings is None:
+                    postings = table[gram] = array("I")
+                postings.append(position)
+        self._trigram_table = table
+
+
+if __name__ == "__main__":
+    # Building the compact index once makes every later start-up faster:
+    # python -m weather_app.city_index city.list.json.gz city_index.tsv.gz
+    if len(sys.argv) != 3:
+        print("Usage: python -m weather_app.city_index <city.list.json.gz> <output.tsv.gz>")
+        sys.exit(1)
+    built = CityIndex.from_city_list(sys.argv[1])
+    built.save(sys.argv[2])
+    print(f"Saved an index of {len(built)} cities to {sys.argv[2]}.")
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Metrics Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `Histogram` and `LatencyMetrics`, small in-process
+histograms for timing each phase of an API request. They can be exported as
+JSON or in the Prometheus text format.
+"""
+
+'''
+WHY HISTOGRAMS?
+"The average request takes 200 ms" hides a lot. Maybe most take 50 ms and a
+few take 3 seconds. A HISTOGRAM counts how many measurements fall into each
+of a set of BUCKETS ("under 5 ms", "under 10 ms", ...), so we can see the whole
+shape and estimate PERCENTILES such as the median (p50) or the slowest 1% (p99).
+
+Each request is split into PHASES, so we can see WHERE the time goes:
+-   retry:    failed attempts and the waits before retrying them. Zero when
+              the first attempt works.
+-   connect:  opening a new connection (DNS lookup, TCP and TLS handshakes).
+              Zero when a pooled connection is reused.
+-   ttfb:     "time to first byte": from sending the (last) request until
+              the response headers arrive (mostly the server's thinking time).
+-   download: reading the response body.
+-   decode:   turning the JSON text into Python objects.
+-   total:    the whole request, start to finish, including requests that
+              failed.
+
+Like Prometheus, the buckets are CUMULATIVE: the "le 0.01" bucket ("less than
+or equal to 10 ms") also counts everything in the smaller buckets.
+'''
+
+import bisect
+import json
+import threading
+
+# Bucket upper bounds in seconds, from 0.5 ms to 10 s.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PHASES = ("retry", "connect", "ttfb", "download", "decode", "total")
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram of durations in seconds.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        Args:
+            buckets (tuple): The sorted upper bounds of the buckets.
+        """
+        self.buckets = tuple(buckets)
+        # One extra slot counts values above the largest bound ("+Inf").
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        """Records one measurement."""
+        # `bisect_left` finds the first bucket whose bound is >= value.
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """Returns (upper_bound, cumulative_count) pairs, ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def percentile(self, fraction):
+        """
+        Estimates a percentile (e.g. 0.99 for p99) from the buckets.
+
+        Returns the upper bound of the bucket the percentile falls into, which
+        is how Prometheus-style histograms are usually read.
+        """
+        if self.count == 0:
+            return 0.0
+        target = fraction * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound
+        return float("inf")
+
+
+class LatencyMetrics:
+    """
+    A thread-safe collection of histograms, one per request phase.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self._lock = threading.Lock()
+        self._histograms = {phase: Histogram(buckets) for phase in PHASES}
+
+    def observe(self, phase, seconds):
+        """
+        Records the duration of one phase of one request.
+
+        Args:
+            phase (str): One of `PHASES`.
+            seconds (float): How long the phase took.
+        """
+        with self._lock:
+            self._histograms[phase].observe(seconds)
+
+    def to_dict(self):
+        """Returns a JSON-friendly summary of every phase."""
+        with self._lock:
+            summary = {}
+            for phase, histogram in self._histograms.items():
+                summary[phase] = {
+                    "count": histogram.count,
+                    "sum": round(histogram.sum, 6),
+                    "p50": _json_bound(histogram.percentile(0.50)),
+                    "p90": _json_bound(histogram.percentile(0.90)),
+                    "p99": _json_bound(histogram.percentile(0.99)),
+                    "buckets": {_format_bound(bound): running
+                                for bound, running in histogram.cumulative()},
+                }
+            return summary
+
+    def to_json(self):
+        """Returns the summary as a JSON string."""
+        # `allow_nan=False`: JSON has no infinity, and a bare `Infinity`
+        # would break most JSON readers.
+        return json.dumps(self.to_dict(), indent=2, allow_nan=False)
+
+    def to_prometheus(self, name="weather_api_request_phase_seconds"):
+        """
+        Returns every histogram in the Prometheus text exposition format.
+
+        Args:
+            name (str): The metric name.
+
+        Returns:
+            str: Text that a Prometheus server can scrape.
+        """
+        lines = [f"# HELP {name} Duration of each phase of a weather API request.",
+                 f"# TYPE {name} histogram"]
+        with self._lock:
+            for phase, histogram in self._histograms.items():
+                for bound, running in histogram.cumulative():
+                    lines.append(f'{name}_bucket{{phase="{phase}",le="{_format_bound(bound)}"}} {running}')
+                lines.append(f'{name}_sum{{phase="{phase}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{phase="{phase}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, file_path):
+        """
+        Saves the metrics to a file: Prometheus text if the name ends in
+        `.prom`, JSON otherwise.
+        """
+        text = self.to_prometheus() if file_path.endswith(".prom") else self.to_json()
+        with open(file_path, mode="w", encoding="utf-8") as metrics_file:
+            metrics_file.write(text)
+
+
+def _format_bound(bound):
+    """Formats a bucket bound the way Prometheus does ("0.005", "+Inf")."""
+    return "+Inf" if bound == float("inf") else f"{bound:g}"
+
+
+def _json_bound(bound):
+    """A percentile for JSON: a number, or "+Inf" above the largest bucket."""
+    return "+Inf" if bound == float("inf") else bound
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py --metrics-file metrics.prom' instead.")
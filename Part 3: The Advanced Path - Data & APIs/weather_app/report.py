@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Report Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `WeatherReport`, a compact record holding only the fields
+the app uses, and `ValidatorStore`, which remembers each response's ETag and
+Last-Modified "validators" so that repeat requests can ask the server
+"has this changed?" instead of downloading the same body again.
+"""
+
+'''
+A COMPACT RECORD WITH `__slots__`:
+The API's JSON response is a nested dictionary with about 30 values, and we
+use five of them. Keeping the whole dictionary around for every reading
+wastes memory, which adds up quickly when a polling process keeps millions of
+readings.
+
+Normally every object stores its attributes in its own hidden dictionary
+(`__dict__`). Declaring `__slots__` tells Python the exact list of attributes
+up front, so it can store them in a small fixed-size structure instead. A
+`WeatherReport` with `__slots__` is several times smaller than the same
+values in a dictionary, let alone the full API response.
+
+CONDITIONAL REQUESTS:
+Many servers label each response with a VALIDATOR:
+-   `ETag`: a fingerprint of the body, e.g. `"5d8c72a5"`.
+-   `Last-Modified`: when the data last changed.
+If we send them back on the next request (`If-None-Match` and
+`If-Modified-Since`), a server whose data has not changed answers
+"304 Not Modified" with an EMPTY body, and we reuse the report we already
+have: nothing to download and nothing to decode.
+'''
+
+import threading
+from collections import OrderedDict
+
+
+class WeatherReport:
+    """
+    The current weather for one city: just the fields the app displays.
+    """
+
+    __slots__ = ("description", "temperature", "feels_like", "humidity",
+                 "wind_speed", "observed_at")
+
+    def __init__(self, description, temperature, feels_like, humidity, wind_speed,
+                 observed_at=None):
+        """
+        Args:
+            description (str): A short description, e.g. "light rain".
+            temperature (float): The temperature.
+            feels_like (float): The "feels like" temperature.
+            humidity (float): The relative humidity in percent.
+            wind_speed (float): The wind speed.
+            observed_at (int): When the data was measured (seconds since the
+                               epoch), if the API said.
+        """
+        self.description = description
+        self.temperature = temperature
+        self.feels_like = feels_like
+        self.humidity = humidity
+        self.wind_speed = wind_speed
+        self.observed_at = observed_at
+
+    def to_dict(self):
+        """Returns the report as a plain dictionary (for JSON, caches, etc.)."""
+        # A DICT COMPREHENSION over the slot names builds it in one line.
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, values):
+        """Rebuilds a report from a dictionary made by `to_dict()`."""
+        return cls(**{name: values.get(name) for name in cls.__slots__})
+
+    def __repr__(self):
+        return f"WeatherReport({self.to_dict()})"
+
+
+class ValidatorStore:
+    """
+    Remembers the validators and report of recent responses, by request URL.
+
+    The store is bounded: once it holds `max_entries` URLs, the least
+    recently used one is forgotten.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """
+        Returns (etag, last_modified, report) for a URL, or None.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                # Mark as recently used by moving it to the end.
+                self._entries.move_to_end(url)
+            return entry
+
+    def remember(self, url, etag, last_modified, report):
+        """
+        Stores a response's validators and report. Responses without any
+        validator are not stored, since we could never revalidate them.
+        """
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries[url] = (etag, last_modified, report)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                # `last=False` pops from the front: the least recently used.
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def conditional_headers(entry):
+        """Builds the `If-None-Match`/`If-Modified-Since` headers for an entry."""
+        headers = {}
+        if entry is not None:
+            etag, last_modified, _ = entry
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py' instead.")
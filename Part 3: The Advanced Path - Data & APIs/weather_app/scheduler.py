@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Scheduler Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `PollScheduler`, which runs many repeating jobs (one per
+city) from a single long-running process. Jobs are kept in a HEAP ordered by
+their next due time, spread out across the polling interval, and nudged by a
+little random jitter so they never bunch up.
+"""
+
+'''
+WHY NOT A SIMPLE SLEEP LOOP?
+The obvious way to poll 300 cities every 10 minutes is:
+
+    while True:
+        for city in cities:
+            poll(city)
+        time.sleep(600)
+
+This has two problems. Every 10 minutes it fires 300 requests in a burst and
+then does nothing, and any slow request delays every city after it, so the
+schedule slowly DRIFTS.
+
+A HEAP-BASED SCHEDULER instead asks one question over and over: "which job is
+due next?" The `heapq` module keeps a list arranged so that the smallest item
+(here: the earliest due time) is always at position 0, and adding or removing
+an item takes only O(log n) steps.
+
+-   SPREAD: when we start, the jobs are spaced evenly across one interval, so
+    300 cities every 600 seconds means one request every 2 seconds.
+-   JITTER: each time a job runs, its next run is scheduled one interval
+    later, plus or minus a small random amount. This stops jobs from drifting
+    back into lock-step.
+-   NO DRIFT: the next run is computed from when the job was DUE, not from when
+    it finished, so slow requests do not push the whole schedule back.
+-   NO PILE-UP: if a job is still running when it comes due again (the API is
+    very slow today), that run is SKIPPED rather than started a second time.
+    Otherwise a slow city would tie up more and more of the workers.
+'''
+
+import heapq
+import itertools
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PollScheduler:
+    """
+    Runs repeating jobs at a fixed interval, ordered by a heap of due times.
+    """
+
+    def __init__(self, interval, jitter=0.1, workers=4):
+        """
+        Initializes an empty schedule.
+
+        Args:
+            interval (float): Seconds between two runs of the same job.
+            jitter (float): The random variation of each interval, as a
+                            fraction (0.1 means plus or minus 10%).
+            workers (int): How many jobs may run at the same time.
+        """
+        self.interval = interval
+        self.jitter = jitter
+        self.workers = workers
+        self._heap = []
+        # How many runs were skipped because the job was still running.
+        self.skipped = 0
+        # Heap entries are (due, tie_breaker, name, job). The counter breaks
+        # ties between equal due times, so Python never compares two jobs.
+        self._counter = itertools.count()
+
+    def add(self, name, job, delay=0.0):
+        """
+        Schedules a repeating job.
+
+        Args:
+            name (str): A label for the job, used in error messages.
+            job (function): Called with no arguments every interval.
+            delay (float): Seconds until the first run.
+        """
+        heapq.heappush(self._heap, (time.monotonic() + delay, next(self._counter), name, job))
+
+    def add_spread(self, jobs):
+        """
+        Schedules many jobs, spacing their first runs evenly over one interval.
+
+        Args:
+            jobs (dict): Maps each job name to its function.
+        """
+        spacing = self.interval / max(len(jobs), 1)
+        for position, (name, job) in enumerate(jobs.items()):
+            self.add(name, job, delay=position * spacing)
+
+    def _next_due(self, due):
+        """Returns the next due time: one interval after `due`, with jitter."""
+        variation = random.uniform(-self.jitter, self.jitter)
+        next_due = due + self.interval * (1 + variation)
+        # If we fell badly behind (e.g. the computer was asleep), don't try to
+        # "catch up" with a burst of runs; just continue from now.
+        return max(next_due, time.monotonic())
+
+    def run(self, stop_event):
+        """
+        Runs jobs as they come due until `stop_event` is set.
+
+        Args:
+            stop_event (threading.Event): Set it (e.g. from Ctrl+C handling)
+                                          to stop the scheduler.
+        """
+        # The last run of each job, by name: a `Future`, which knows whether
+        # it has finished.
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            while self._heap and not stop_event.is_set():
+                due, _, name, job = self._heap[0]
+                wait = due - time.monotonic()
+                if wait > 0:
+                    # `Event.wait()` sleeps, but wakes up immediately if the
+                    # event is set, so stopping never waits a whole interval.
+                    stop_event.wait(wait)
+                    continue
+
+                heapq.heapreplace(self._heap, (self._next_due(due), next(self._counter), name, job))
+                previous = running.get(name)
+                if previous is not None and not previous.done():
+                    self.skipped += 1
+                    continue
+                running[name] = executor.submit(_run_safely, name, job)
+
+
+def _run_safely(name, job):
+    """Runs one job, reporting (but surviving) any error it raises."""
+    try:
+        job()
+    except Exception as err:
+        print(f"[{time.strftime('%H:%M:%S')}] {name}: {err}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py --poll cities.txt' instead.")
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Single-Flight Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `SingleFlight`, which makes concurrent calls for the same
+key share ONE execution of a function. Only the first caller does the work;
+everyone who asks for the same key while it is running waits for, and
+receives, the same result (or the same error).
+"""
+
+'''
+WHY "SINGLE-FLIGHT"?
+Imagine 50 people open a weather dashboard for "London" at the same moment.
+Without coordination that is 50 identical API calls, all racing each other,
+all costing quota, and all returning the same answer.
+
+With single-flight, the first request becomes the LEADER and actually calls
+the API. The other 49 notice that a call for "london|metric" is already "in
+flight" and simply wait for it. When the leader finishes, all 50 get the same
+answer. If the leader's call fails, all 50 get the same exception.
+
+Once the call has finished, the key is forgotten. The next request starts a
+new flight, so we never serve an old result from here (that is the cache's job).
+'''
+
+import threading
+
+
+class _Call:
+    """One in-flight call: the event waiters block on, and its outcome."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single call.
+    """
+
+    def __init__(self):
+        """Initializes an empty table of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """
+        Runs `fn()` for `key`, unless a call for `key` is already running.
+
+        Args:
+            key (str): Identifies calls that can share a result.
+            fn (function): Called with no arguments to do the actual work.
+
+        Returns:
+            The value returned by `fn()` (from this call or the shared one).
+
+        Raises:
+            Exception: Whatever `fn()` raised, re-raised in every waiter.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                # Someone else is already doing this work. Wait for them.
+                is_leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                is_leader = True
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as err:
+            call.error = err
+            raise
+        except BaseException:
+            # The leader was interrupted (Ctrl+C, `sys.exit()`). That is the
+            # leader's business, not the waiters', but they must not take
+            # the missing result for a real one: they get an error instead.
+            call.error = RuntimeError(f"The shared call for '{key}' was interrupted.")
+            raise
+        finally:
+            # Forget the key BEFORE waking the waiters, so a request that
+            # arrives from now on starts a fresh call.
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self):
+        """Returns how many distinct keys are currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py' instead.")
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Stub Server Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module is a small, local stand-in for the OpenWeatherMap
+`/data/2.5/weather` endpoint. It answers with realistic-looking JSON, and can
+be told to be slow or to fail on purpose, so we can test and benchmark the
+weather app without network access and without using up our API quota.
+"""
+
+'''
+WHY A STUB SERVER?
+To find out whether the cache, the connection pool, or the batch mode make
+the weather app faster, we need to run it thousands of times. Doing that
+against the real API is slow, uses up our quota, and gives different results
+every run because the internet is unpredictable.
+
+A STUB (or "fake") server speaks the same "language" as the real API, but
+runs on our own computer, and WE control how it behaves:
+-   LATENCY: how long it waits before answering (`--latency`, `--latency-jitter`).
+-   ERRORS: what fraction of requests fail with 404, 401, 429 or 5xx.
+-   PAYLOADS: the JSON it returns (generated per city, or from a template file).
+-   VALIDATORS: every response carries an `ETag` and a `Last-Modified`
+    header, and a request that sends them back gets "304 Not Modified" until
+    the weather "changes" (every `--update-interval` seconds).
+
+It is built on `http.server` from the standard library, so it needs no extra
+packages. `ThreadingHTTPServer` handles each request on its own thread, so
+concurrent clients don't wait for each other.
+
+HOW TO USE IT:
+1.  Start it in one terminal:
+    `python -m weather_app.stub_server --port 8099 --latency 0.05 --rate-5xx 0.02`
+2.  In another terminal, point the app at it:
+    `WEATHER_API_BASE_URL=http://127.0.0.1:8099/data/2.5/weather OPENWEATHER_API_KEY=test python 19_project_api_weather_app.py`
+    (or pass `--base-url http://127.0.0.1:8099/data/2.5/weather`)
+3.  Visit `http://127.0.0.1:8099/stats` to see how many requests it served.
+'''
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+ENDPOINT = "/data/2.5/weather"
+
+# The error responses we can inject, with the body the real API sends.
+ERROR_BODIES = {
+    401: {"cod": 401, "message": "Invalid API key."},
+    404: {"cod": "404", "message": "city not found"},
+    429: {"cod": 429, "message": "Your account is temporary blocked due to exceeding of requests limitation."},
+    500: {"cod": 500, "message": "Internal error"},
+    502: {"cod": 502, "message": "Bad gateway"},
+    503: {"cod": 503, "message": "Service unavailable"},
+}
+
+DESCRIPTIONS = ["clear sky", "few clouds", "scattered clouds", "broken clouds",
+                "shower rain", "rain", "thunderstorm", "snow", "mist"]
+
+
+def generate_payload(city, city_id, units, observed_at):
+    """
+    Builds a realistic weather response for a city.
+
+    The values are derived from a hash of the city name, so the same city
+    always gets the same weather: runs are repeatable.
+
+    Args:
+        city (str): The city name from the `q` parameter (may be empty).
+        city_id (int): The city ID from the `id` parameter (may be None).
+        units (str): "metric", "imperial" or "standard".
+        observed_at (int): The measurement time to report (the `dt` field).
+
+    Returns:
+        dict: A response shaped like OpenWeatherMap's.
+    """
+    # The weather changes each update period, but is fixed within one.
+    seed_text = f"{city.lower() if city else city_id}@{observed_at}"
+    digest = hashlib.sha256(seed_text.encode("utf-8")).digest()
+    celsius = round(digest[0] / 255 * 45 - 10, 2)
+    if units == "imperial":
+        temperature = round(celsius * 9 / 5 + 32, 2)
+    elif units == "metric":
+        temperature = celsius
+    else:
+        temperature = round(celsius + 273.15, 2)
+
+    return {
+        "coord": {"lon": round(digest[1] / 255 * 360 - 180, 4),
+                  "lat": round(digest[2] / 255 * 180 - 90, 4)},
+        "weather": [{"id": 800, "main": "Clouds",
+                     "description": DESCRIPTIONS[digest[3] % len(DESCRIPTIONS)],
+                     "icon": "04d"}],
+        "base": "stations",
+        "main": {"temp": temperature,
+                 "feels_like": round(temperature - digest[4] / 255 * 3, 2),
+                 "temp_min": round(temperature - 1.5, 2),
+                 "temp_max": round(temperature + 1.5, 2),
+                 "pressure": 990 + digest[5] % 40,
+                 "humidity": 20 + digest[6] % 80},
+        "visibility": 10000,
+        "wind": {"speed": round(digest[7] / 255 * 15, 2), "deg": digest[8] % 360},
+        "clouds": {"all": digest[9] % 100},
+        "dt": observed_at,
+        "sys": {"country": "XX", "sunrise": 1760000000, "sunset": 1760040000},
+        "timezone": 0,
+        "id": city_id if city_id is not None else int.from_bytes(digest[10:13], "big"),
+        "name": city.split(",")[0].title() if city else f"City {city_id}",
+        "cod": 200,
+    }
+
+
+class StubConfig:
+    """The behaviour settings shared by every request handler."""
+
+    def __init__(self, latency=0.0, latency_jitter=0.0, error_rates=None,
+                 api_key=None, known_cities=None, template=None, seed=None,
+                 update_interval=600):
+        """
+        Args:
+            latency (float): Seconds to wait before every response.
+            latency_jitter (float): Extra random delay, up to this many seconds.
+            error_rates (dict): Maps a status code to the fraction of requests
+                                that should fail with it, e.g. {503: 0.02}.
+            api_key (str): If set, requests with any other `appid` get a 401.
+            known_cities (set): If set, other city names get a 404.
+            template (dict): If set, returned (with the city name filled in)
+                             instead of a generated payload.
+            seed (int): Seed for the random latency and errors.
+            update_interval (int): How often (in seconds) the weather changes.
+                                   The real API updates about every 10 minutes.
+        """
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rates = error_rates or {}
+        self.api_key = api_key
+        self.known_cities = known_cities
+        self.template = template
+        self.random = random.Random(seed)
+        self.update_interval = max(1, update_interval)
+        self.stats = {"requests": 0, "ok": 0, "not_modified": 0, "errors": {}}
+        self.lock = threading.Lock()
+
+    def pick_error(self):
+        """Randomly decides whether this request fails, and with which code."""
+        with self.lock:
+            roll = self.random.random()
+            jitter = self.random.uniform(0, self.latency_jitter)
+        for status, rate in self.error_rates.items():
+            if roll < rate:
+                return status, jitter
+            roll -= rate
+        return None, jitter
+
+    def record(self, status):
+        """Counts one response in the statistics."""
+        with self.lock:
+            self.stats["requests"] += 1
+            if status == 200:
+                self.stats["ok"] += 1
+            elif status == 304:
+                self.stats["not_modified"] += 1
+            else:
+                errors = self.stats["errors"]
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers requests the way the OpenWeatherMap endpoint would."""
+
+    # HTTP/1.1 lets clients keep the connection open between requests, like
+    # the real API. That's what makes connection pooling measurable.
+    protocol_version = "HTTP/1.1"
+    # Buffer each response and send it in one piece (the server flushes after
+    # every request), so the headers and body don't trickle out separately.
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    config = StubConfig()
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/stats":
+            with self.config.lock:
+                self._send_json(200, self.config.stats)
+            return
+        if url.path != ENDPOINT:
+            self._send_json(404, {"cod": "404", "message": "Internal error"})
+            return
+
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        status, body = self._respond_to(params)
+        headers = {"Retry-After": "1"} if status == 429 else {}
+
+        if status == 200:
+            data = json.dumps(body).encode("utf-8")
+            # The ETag is a fingerprint of the exact body we would send.
+            etag = '"' + hashlib.sha1(data).hexdigest()[:16] + '"'
+            headers["ETag"] = etag
+            headers["Last-Modified"] = formatdate(body.get("dt", 0), usegmt=True)
+            if self.headers.get("If-None-Match") == etag:
+                status = 304
+            elif (self.headers.get("If-None-Match") is None
+                  and self.headers.get("If-Modified-Since") == headers["Last-Modified"]):
+                status = 304
+
+        self.config.record(status)
+        if status == 304:
+            # "Not Modified": headers only, no body at all.
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self._send_json(status, body, headers)
+
+    def _respond_to(self, params):
+        """Works out the status code and JSON body for one weather request."""
+        config = self.config
+        error, jitter = config.pick_error()
+        delay = config.latency + jitter
+        if delay > 0:
+            time.sleep(delay)
+
+        city = params.get("q", "")
+        city_id = int(params["id"]) if params.get("id", "").isdigit() else None
+        if config.api_key and params.get("appid") != config.api_key:
+            return 401, ERROR_BODIES[401]
+        if not city and city_id is None:
+            return 400, {"cod": "400", "message": "Nothing to geocode"}
+        if config.known_cities is not None and city:
+            if city.split(",")[0].strip().lower() not in config.known_cities:
+                return 404, ERROR_BODIES[404]
+        if error is not None:
+            return error, ERROR_BODIES.get(error, {"cod": error, "message": "Injected error"})
+
+        # Round the clock down to the current update period.
+        observed_at = int(time.time()) // config.update_interval * config.update_interval
+        if config.template is not None:
+            payload = dict(config.template)
+            payload["name"] = city.split(",")[0].title() if city else f"City {city_id}"
+            payload["dt"] = observed_at
+            return 200, payload
+        return 200, generate_payload(city, city_id, params.get("units", "standard"), observed_at)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Printing a line per request would slow down benchmarks; stay quiet.
+        pass
+
+
+def make_server(config, host="127.0.0.1", port=8099):
+    """
+    Creates (but does not start) a stub server.
+
+    Args:
+        config (StubConfig): The behaviour settings.
+        host (str): The address to listen on.
+        port (int): The port to listen on (0 picks a free one).
+
+    Returns:
+        ThreadingHTTPServer: Call `serve_forever()` to start it. The URL to
+        use as `BASE_URL` is `f"http://{host}:{server.server_port}{ENDPOINT}"`.
+    """
+    # A subclass per server keeps each server's settings separate.
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    """Parses the command-line options and runs the server until Ctrl+C."""
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenWeatherMap weather API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds to wait before each response")
+    parser.add_argument("--latency-jitter", type=float, default=0.0,
+                        help="extra random delay, up to this many seconds")
+    parser.add_argument("--rate-404", type=float, default=0.0, help="fraction of 404 responses")
+    parser.add_argument("--rate-401", type=float, default=0.0, help="fraction of 401 responses")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of 429 responses")
+    parser.add_argument("--rate-5xx", type=float, default=0.0,
+                        help="fraction of 5xx responses (split over 500, 502 and 503)")
+    parser.add_argument("--api-key", help="only accept this appid (others get 401)")
+    parser.add_argument("--cities", metavar="FILE",
+                        help="only these cities exist (one per line); others get 404")
+    parser.add_argument("--payload", metavar="FILE",
+                        help="return this JSON file instead of generated weather")
+    parser.add_argument("--seed", type=int, help="seed for repeatable latency and errors")
+    parser.add_argument("--update-interval", type=int, default=600,
+                        help="seconds between weather changes; until then, "
+                             "conditional requests get 304 (default: 600)")
+    args = parser.parse_args()
+
+    known_cities = None
+    if args.cities:
+        with open(args.cities, mode="r", encoding="utf-8") as city_file:
+            known_cities = {line.strip().lower() for line in city_file if line.strip()}
+    template = None
+    if args.payload:
+        with open(args.payload, mode="r", encoding="utf-8") as payload_file:
+            template = json.load(payload_file)
+
+    error_rates = {404: args.rate_404, 401: args.rate_401, 429: args.rate_429,
+                   500: args.rate_5xx / 3, 502: args.rate_5xx / 3, 503: args.rate_5xx / 3}
+    config = StubConfig(args.latency, args.latency_jitter,
+                        {status: rate for status, rate in error_rates.items() if rate > 0},
+                        args.api_key, known_cities, template, args.seed,
+                        args.update_interval)
+
+    server = make_server(config, args.host, args.port)
+    print(f"Stub weather API listening on http://{args.host}:{server.server_port}{ENDPOINT}")
+    print("Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
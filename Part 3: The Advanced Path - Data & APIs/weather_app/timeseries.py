@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Part 3, Lesson 19: Project: API Weather App (Time-Series Store Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `TimeSeriesStore`, which records weather readings over
+time. Every reading is appended to a log that is never rewritten, and hourly
+and daily ROLLUPS (count, mean, minimum, maximum) are updated as each reading
+arrives, so summaries never require re-reading the whole history.
+"""
+
+'''
+WHAT IS A TIME SERIES?
+A TIME SERIES is a sequence of measurements taken over time: "London was 14°C
+at 09:00, 15°C at 09:10, 15.5°C at 09:20..." Two things make this kind of
+data special:
+1.  We only ever ADD new readings. Old readings never change. An APPEND-ONLY
+    store is simple, fast, and can't accidentally corrupt the past.
+2.  We usually want SUMMARIES ("what was the average temperature each day
+    last week?") rather than every single reading.
+
+ROLLUPS:
+Computing a daily average from scratch means reading every reading of the
+day. Instead we keep running totals for every (city, hour) and (city, day)
+"bucket". Each new reading just bumps the count, adds to the total, and
+updates the minimum and maximum of its buckets. The mean is `total / count`.
+A field the API left out (None) is stored as NULL and skipped by the rollups.
+
+ONE READING PER MEASUREMENT:
+The API only measures the weather every few minutes, and says when in its
+`dt` field (`observed_at`). Polling more often than that, or getting a "304
+Not Modified", gives the SAME measurement again. It is recorded once: the
+store keeps at most one reading per (city, observed_at), so repeats neither
+clutter the log nor count twice in the averages.
+
+Everything lives in one SQLite database file, like the response cache.
+'''
+
+import sqlite3
+import threading
+import time
+
+# The numeric fields we store and roll up, as returned by `extract_weather()`.
+METRICS = ["temperature", "feels_like", "humidity", "wind_speed"]
+
+# Rollup periods and their length in seconds. Buckets are aligned to UTC.
+PERIODS = {"hour": 3600, "day": 86400}
+
+
+class TimeSeriesStore:
+    """
+    An append-only store of weather readings with hourly and daily rollups.
+    """
+
+    def __init__(self, path):
+        """
+        Opens (or creates) the store.
+
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+        self.path = path
+        # Readings arrive from several polling threads, so one lock guards
+        # the shared connection.
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS readings ("
+                " city TEXT NOT NULL, ts REAL NOT NULL, description TEXT,"
+                " temperature REAL, feels_like REAL, humidity REAL, wind_speed REAL,"
+                " observed_at INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS readings_city_ts ON readings (city, ts)"
+            )
+            # A UNIQUE index refuses a second reading of the same measurement.
+            # (Readings without `observed_at` are NULL there, and NULLs never
+            # count as equal, so they are all kept.)
+            self._connection.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS readings_city_observed"
+                " ON readings (city, observed_at)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS rollups ("
+                " city TEXT NOT NULL, period TEXT NOT NULL, bucket INTEGER NOT NULL,"
+                " metric TEXT NOT NULL, count INTEGER NOT NULL, total REAL NOT NULL,"
+                " minimum REAL NOT NULL, maximum REAL NOT NULL,"
+                " PRIMARY KEY (city, period, bucket, metric))"
+            )
+
+    def append(self, city, weather, timestamp=None):
+        """
+        Records one reading and updates its hourly and daily rollups.
+
+        Args:
+            city (str): The city the reading is for.
+            weather (dict): The fields returned by `extract_weather()`.
+            timestamp (float): Seconds since the epoch (default: now).
+
+        Returns:
+            bool: False if this measurement (same city and `observed_at`)
+                  was already recorded, and nothing was added.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock, self._connection:
+            added = self._connection.execute(
+                "INSERT OR IGNORE INTO readings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (city, timestamp, weather.get("description"),
+                 *(weather.get(metric) for metric in METRICS), weather.get("observed_at")),
+            ).rowcount
+            if not added:
+                return False
+            for period, seconds in PERIODS.items():
+                # Round the time DOWN to the start of its hour or day.
+                bucket = int(timestamp // seconds * seconds)
+                for metric in METRICS:
+                    value = weather.get(metric)
+                    if value is None:
+                        continue
+                    # An "UPSERT": insert a new bucket, or update the running
+                    # totals if this bucket already exists.
+                    self._connection.execute(
+                        "INSERT INTO rollups VALUES (?, ?, ?, ?, 1, ?, ?, ?)"
+                        " ON CONFLICT (city, period, bucket, metric) DO UPDATE SET"
+                        " count = count + 1, total = total + excluded.total,"
+                        " minimum = MIN(minimum, excluded.minimum),"
+                        " maximum = MAX(maximum, excluded.maximum)",
+                        (city, period, bucket, metric, value, value, value),
+                    )
+        return True
+
+    def readings(self, city, start=0, end=None):
+        """
+        Returns the raw readings for a city, oldest first.
+
+        Args:
+            city (str): The city.
+            start (float): The earliest timestamp to include.
+            end (float): The latest timestamp to include (default: now).
+
+        Returns:
+            list: One dictionary per reading.
+        """
+        end = time.time() if end is None else end
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT ts, description, temperature, feels_like, humidity, wind_speed"
+                " FROM readings WHERE city = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+                (city, start, end),
+            ).fetchall()
+        return [dict(zip(["timestamp", "description", *METRICS], row)) for row in rows]
+
+    def rollups(self, city, period="hour", start=0, end=None):
+        """
+        Returns the summary of every bucket for a city, oldest first.
+
+        Args:
+            city (str): The city.
+            period (str): "hour" or "day".
+            start (float): The earliest bucket start to include.
+            end (float): The latest bucket start to include (default: now).
+
+        Returns:
+            list: One dictionary per bucket, e.g.
+                  {"bucket": 1760000400, "temperature": {"count": 6,
+                   "mean": 14.2, "min": 13.9, "max": 14.6}, ...}
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period '{period}'. Use one of: {', '.join(PERIODS)}.")
+        end = time.time() if end is None else end
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT bucket, metric, count, total, minimum, maximum FROM rollups"
+                " WHERE city = ? AND period = ? AND bucket BETWEEN ? AND ?"
+                " ORDER BY bucket",
+                (city, period, start, end),
+            ).fetchall()
+
+        buckets = {}
+        for bucket, metric, count, total, minimum, maximum in rows:
+            summary = buckets.setdefault(bucket, {"bucket": bucket})
+            summary[metric] = {"count": count, "mean": total / count,
+                               "min": minimum, "max": maximum}
+        return list(buckets.values())
+
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._connection.close()
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the weather app.")
+    print("It is not meant to be run directly.")
+    print("Please run '19_project_api_weather_app.py --poll cities.txt' instead.")
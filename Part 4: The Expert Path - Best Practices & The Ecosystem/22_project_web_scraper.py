@@ -71,113 +71,482 @@ Follow these steps in your terminal:
 
 6.  Now, create this Python file (`22_project_web_scraper.py`) inside the
     `web_scraper_project` folder and you're ready to go!
+
+7.  This scraper reuses the shared HTTP client from the weather app project
+    (`Part 3: The Advanced Path - Data & APIs/http_client.py`). Keep this
+    repository's folder layout, or copy `http_client.py` next to this file.
 '''
 
-# We must import the libraries we installed.
-# `requests` is for fetching the webpage.
-# `BeautifulSoup` is for parsing the HTML. It's located inside the `bs4` package.
-import requests
-from bs4 import BeautifulSoup
+# The libraries we installed are used by our helper modules: `requests`
+# fetches the pages (through `PooledSession`, below), and `BeautifulSoup`
+# (from the `bs4` package) parses the HTML in the default parser backend in
+# `scraper/parsers.py`; see `parse_page()`.
+
+# `argparse` reads optional settings (like `--workers`) from the command line.
+import argparse
+# `functools.partial` "pre-fills" some arguments of a function (see `main()`).
+import functools
+# `sqlite3` is only needed here to recognize its errors (see `main()`).
+import sqlite3
+# `time` measures how long the crawl and the parsing take.
+import time
+
+# `os` and `sys` let us find the shared HTTP client, which lives next to the
+# weather app in the Part 3 folder (`http_client.py`). Adding that folder to
+# `sys.path` (the list of places Python searches for modules) makes it
+# importable from here.
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SHARED_DIR = os.path.join(os.path.dirname(BASE_DIR), "Part 3: The Advanced Path - Data & APIs")
+sys.path.insert(0, SHARED_DIR)
+
+# `PooledSession` is a `requests.Session` that keeps connections open between
+# requests, applies timeouts, and retries temporary failures.
+from http_client import RETRY_STATUSES, PooledSession
+
+# Our helper package lives next to this file in the `scraper/` folder.
+# `crawl()` visits many pages at once, following the links we find.
+from scraper.crawl import Frontier, absolute_url, crawl, same_host
+# `crawl_pipeline()` parses pages in separate processes, on every CPU core.
+from scraper.pipeline import ParsedPage, ParseTimer, crawl_pipeline
+# `PageCache` keeps pages on disk, so unchanged pages are not downloaded again.
+from scraper.http_cache import PageCache
+# `PageArchive` keeps every downloaded page, to re-extract it later offline.
+from scraper.archive import PageArchive
+# `PersistentFrontier` saves the crawl's progress, so it can be resumed.
+from scraper.state import PersistentFrontier
+# `HostThrottle` adapts how many requests each server gets at once.
+from scraper.throttle import THROTTLE_STATUSES, HostThrottle
+# Sinks save the quotes to a file as they are found.
+from scraper.sinks import SINKS, open_sink
+# `IndexSink` files the quotes under their authors, tags and words, to search
+# them later with `22_scraper_query.py`.
+from scraper.index import IndexSink
+# `fingerprint()` spots repeated quotes; `NearDuplicateFilter` spots quotes
+# that are ALMOST the same (MinHash/LSH).
+from scraper.dedupe import NearDuplicateFilter, fingerprint, item_key
+# The parser backends: BeautifulSoup ("html.parser"), lxml, and a streaming one.
+from scraper.parsers import available_backends, get_backend
+# Rule files describe what to extract declaratively (see `scraper/rules/`).
+from scraper.rules import get_plan, load_rules
+
+
+# --- Configuration ---
+# The page the crawl starts from.
+URL = "http://quotes.toscrape.com/"
+
+# Crawled pages are cached in a small database file next to this script.
+CACHE_FILE = os.path.join(BASE_DIR, "scraper_cache.sqlite3")
+
+
+def fetch_page(url, session, cache=None, result_key=None, throttle=None, archive=None):
+    """
+    Downloads the HTML of one page.
+
+    With a cache, the request is CONDITIONAL: if the server says the page has
+    not changed since we stored it, we use our stored copy instead.
+
+    Args:
+        url (str): The page to fetch.
+        session (PooledSession): The session to send the request with.
+        cache (PageCache): The page cache, or None.
+        result_key (str): How pages are being extracted (see
+                          `extraction_key()`). If the cache holds an unchanged
+                          page's result for this key, that result is returned.
+        throttle (HostThrottle): If given, the request waits for its turn
+                                 with the server (see `scraper/throttle.py`).
+        archive (PageArchive): If given, the page's HTML is added to it.
+
+    Returns:
+        str: The HTML content, or a `ParsedPage` if the page has not changed
+             and its extracted result was cached.
+
+    Raises:
+        requests.exceptions.RequestException: If the page could not be fetched.
+        ValueError: If the site's robots.txt does not allow fetching the page.
+    """
+    # The session's get() works like requests.get(), but reuses an open
+    # connection to the server. The throttle's get() sends it through the
+    # session too, once the server is ready for another request.
+    get = session.get if throttle is None else throttle.get
+    headers = cache.conditional_headers(url) if cache is not None else {}
+    response = get(url, headers=headers)
+
+    # "304 Not Modified": the server has nothing new for us.
+    if response.status_code == 304 and cache is not None:
+        stored = cache.result(url, result_key) if result_key else None
+        html_content = None if stored is not None else cache.body(url)
+        if stored is not None or html_content is not None:
+            cache.mark_unchanged(url)
+            if archive is not None and url not in archive:
+                # The archive was started after the page was cached.
+                archive.append(url, html_content or cache.body(url))
+            return ParsedPage(*stored) if stored is not None else html_content
+        # Our stored copy has disappeared, so ask again without conditions.
+        response = get(url)
+
+    # It's good practice to check if the request was successful.
+    # A status code of 200 means "OK".
+    response.raise_for_status()  # This will raise an HTTPError for bad responses (4xx or 5xx)
+    if cache is not None:
+        cache.store(url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    response.text)
+    if archive is not None:
+        archive.append(url, response.text)
+    return response.text
+
+
+def extract_links(page, page_url, follow_tags=True):
+    """
+    Picks the links worth crawling out of a parsed page.
+
+    Args:
+        page (PageData): What the parser found on the page.
+        page_url (str): The URL of the page (relative links are resolved
+                        against it).
+        follow_tags (bool): Also follow the links to tag pages.
+
+    Returns:
+        list: Absolute URLs on the same site as `page_url`.
+    """
+    hrefs = [page.next_href] if page.next_href else []
+    if follow_tags:
+        # Every tag (on each quote and in the "Top Ten tags" box) links to a
+        # page listing the quotes with that tag.
+        hrefs.extend(page.follow_hrefs)
+
+    links = [absolute_url(page_url, href) for href in hrefs]
+    # Stay on the same site: a crawler that follows every link wanders off
+    # across the whole internet.
+    return [link for link in links if same_host(link, page_url)]
+
+
+def parse_page(html_content, url, follow_tags=True, parser="html.parser", rules=None):
+    """
+    Parses one page.
+
+    We need to inspect the webpage's HTML (using the "Inspect" tool in a web
+    browser like Chrome or Firefox) to find the tags and classes that contain
+    the data we want. On quotes.toscrape.com, each quote is a <div
+    class="quote"> holding a <span class="text">, a <small class="author">
+    and a list of <a class="tag"> links. The BeautifulSoup code that finds
+    them is `SoupBackend` in `scraper/parsers.py`, next to faster backends
+    that find exactly the same things.
+
+    In pipeline mode this runs in a separate process, so it must stay a
+    top-level function that the process pool can find by name.
+
+    Args:
+        html_content (str): The page's HTML.
+        url (str): The page's URL.
+        follow_tags (bool): Also return the links to tag pages.
+        parser (str): The parser backend to use (see `available_backends()`).
+        rules (str): The path of a rule file. If given, the rules decide what
+                     is extracted, instead of the built-in quote extraction.
+
+    Returns:
+        tuple: (quotes, links): the quotes found and the URLs to visit next.
+    """
+    if rules:
+        # The rule file is compiled on first use, then reused for every page.
+        page = get_plan(rules, parser).extract(html_content)
+    else:
+        page = get_backend(parser).extract(html_content)
+    return page.items, extract_links(page, url, follow_tags)
+
+
+def scrape_page(url, session, follow_tags=True, parser="html.parser", rules=None,
+                cache=None, result_key=None, throttle=None, parse_timer=None, archive=None):
+    """
+    Fetches and parses one page.
+
+    This runs in a worker thread of the crawl, so many pages are scraped at
+    the same time. If a `ParseTimer` is given, the parsing is timed.
+
+    Returns:
+        tuple: (quotes, links): the quotes found and the URLs to visit next.
+    """
+    page = fetch_page(url, session, cache, result_key, throttle, archive)
+    if isinstance(page, ParsedPage):
+        # Unchanged since last time: no parsing needed.
+        return page.result, page.links
+    start = time.perf_counter()
+    quotes, links = parse_page(page, url, follow_tags, parser, rules)
+    if parse_timer is not None:
+        parse_timer.add(time.perf_counter() - start)
+    if cache is not None:
+        cache.store_result(url, result_key, quotes, links)
+    return quotes, links
+
+
+def extraction_key(rules, follow_tags):
+    """
+    Describes how pages are being extracted, so that a cached result is only
+    reused by a crawl that would extract exactly the same thing.
+
+    Returns:
+        str: e.g. "built-in|tags=True".
+    """
+    # Editing the rule file changes its modification time, and so the key.
+    source = "built-in" if not rules else f"{os.path.abspath(rules)}@{os.path.getmtime(rules)}"
+    return f"{source}|tags={follow_tags}"
+
+
+def display_quote(number, quote):
+    """Prints one quote (or any item a rule file extracts) nicely."""
+    print(f"\nQuote #{number}")
+    for field, value in quote.items():
+        if isinstance(value, list):
+            # The join() string method is a great way to format a list for printing.
+            value = ', '.join(str(item) for item in value)
+        print(f"  {field.replace('_', ' ').title()}: {value}")
+
+
+def parse_arguments():
+    """Reads the optional command-line settings."""
+    parser = argparse.ArgumentParser(description="Scrape quotes from quotes.toscrape.com.")
+    parser.add_argument("--url", default=URL,
+                        help="the page to start from (default: %(default)s)")
+    parser.add_argument("--single-page", action="store_true",
+                        help="only scrape the start page; do not follow any links")
+    parser.add_argument("--no-tags", action="store_true",
+                        help="follow the \"Next\" links only, not the tag pages")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="most pages downloaded at the same time (default: 8)")
+    parser.add_argument("--no-throttle", action="store_true",
+                        help="always download --workers pages at once, ignoring the "
+                             "server's signals and robots.txt")
+    parser.add_argument("--max-pages", type=int, default=100,
+                        help="stop after this many pages; 0 means no limit (default: 100)")
+    parser.add_argument("--frontier-size", type=int,
+                        help="most URLs waiting to be visited at once (default: 10000; "
+                             "no limit with --state, whose queue is on disk)")
+    parser.add_argument("--parser", choices=available_backends(), default="html.parser",
+                        help="the HTML parser backend (default: %(default)s)")
+    parser.add_argument("--rules", metavar="FILE",
+                        help="extract what the rule file FILE (.json or .yaml) describes, "
+                             "instead of the built-in quote extraction")
+    parser.add_argument("--state", metavar="FILE",
+                        help="save the crawl's progress in FILE, and continue from it "
+                             "if FILE already exists (resumable crawls)")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="with --state, save progress every N pages (default: 100)")
+    parser.add_argument("--max-attempts", type=int, default=3,
+                        help="with --state, give a failing page up after N tries (default: 3)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="save the quotes to FILE (.jsonl, .csv or .sqlite) as they "
+                             "are found, instead of printing them")
+    parser.add_argument("--format", choices=list(SINKS),
+                        help="the format of --output (default: from the file extension)")
+    parser.add_argument("--index", metavar="FILE",
+                        help="also add the quotes to the searchable index FILE "
+                             "(search it with 22_scraper_query.py)")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="with --output or --index, write the quotes in batches of "
+                             "this many (default: 500)")
+    parser.add_argument("--flush-every", type=float, default=5.0,
+                        help="with --output or --index, also write waiting quotes every "
+                             "N seconds (default: 5)")
+    parser.add_argument("--near-duplicates", action="store_true",
+                        help="also skip quotes that are almost the same as one already "
+                             "found (different punctuation, spacing or a word or two)")
+    parser.add_argument("--similarity", type=float, default=0.8,
+                        help="with --near-duplicates, how similar two quotes must be to "
+                             "count as the same, from 0 to 1 (default: 0.8)")
+    parser.add_argument("--archive", metavar="FILE",
+                        help="also keep every downloaded page in the compressed archive "
+                             "FILE (e.g. pages.warc.gz), to re-extract later with "
+                             "22_scraper_reextract.py")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="download every page, ignoring the page cache")
+    parser.add_argument("--cache-file", default=CACHE_FILE,
+                        help="path of the page cache database")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="parse pages in this many separate processes while the "
+                             "worker threads keep downloading; 0 parses in the "
+                             "download threads (default: 0)")
+    parser.add_argument("--parse-queue", type=int,
+                        help="most pages downloaded or downloading but not yet parsed "
+                             "(default: workers + 2 per parse worker)")
+    return parser.parse_args()
+
+
+def main():
+    """The main function: crawls the site and prints the quotes it found."""
+    args = parse_arguments()
+    workers = max(args.workers, 1)
+    max_pages = 1 if args.single_page else (args.max_pages or None)
+    follow_tags = not args.no_tags
+
+    if args.rules:
+        # Load the rules once here, so a mistake in the file is reported
+        # before we start crawling.
+        try:
+            load_rules(args.rules)
+        except (OSError, ValueError, ImportError) as err:
+            print(f"Error: Could not load the rule file: {err}")
+            return
+
+    if not 0 < args.similarity <= 1:
+        print("Error: --similarity must be above 0 and at most 1.")
+        return
+
+    # Where the quotes are saved: one sink per file.
+    sinks = {}
+    options = {"batch_size": max(args.batch_size, 1), "flush_every": args.flush_every}
+    try:
+        if args.output:
+            sinks[args.output] = open_sink(args.output, args.format, **options)
+        if args.index:
+            sinks[args.index] = IndexSink(args.index, **options)
+    except (OSError, ValueError, sqlite3.Error) as err:
+        print(f"Error: Could not open the output file: {err}")
+        for sink in sinks.values():
+            sink.close()
+        return
+
+    # One connection per worker thread lets every worker reuse its own
+    # kept-alive connection instead of waiting for a free one.
+    if args.no_throttle:
+        session = PooledSession(pool_maxsize=workers)
+        throttle = None
+    else:
+        # The throttle handles "429" and "503" itself, so the session must
+        # hand those answers back instead of retrying them on its own.
+        session = PooledSession(pool_maxsize=workers,
+                                retry_statuses=RETRY_STATUSES - THROTTLE_STATUSES)
+        # `--workers` becomes the most the throttle will ever allow per host.
+        throttle = HostThrottle(session, max_limit=workers)
+    if args.state:
+        # The frontier and seen set live on disk; the start URL is ignored
+        # if an earlier run already saw it.
+        frontier = PersistentFrontier(args.state, checkpoint_every=max(args.checkpoint_every, 1),
+                                      max_size=args.frontier_size,
+                                      max_attempts=max(args.max_attempts, 1))
+        if frontier.pages_done:
+            print(f"Resuming: {frontier.pages_done} pages already done, "
+                  f"{len(frontier)} URLs waiting.")
+    else:
+        frontier = Frontier(max_size=10000 if args.frontier_size is None else args.frontier_size)
+    cache = None if args.no_cache else PageCache(args.cache_file)
+    archive = PageArchive(args.archive) if args.archive else None
+    result_key = extraction_key(args.rules, follow_tags)
+    # Adds up the time spent parsing, in whichever thread or process it runs.
+    parse_timer = ParseTimer()
+
+    if args.parse_workers > 0:
+        # `partial` turns our functions into the one-argument `fetch(url)` and
+        # two-argument `parse(html, url)` that the pipeline calls. A partial of
+        # a top-level function can be sent to another process; a nested
+        # function could not.
+        fetch = functools.partial(fetch_page, session=session, cache=cache,
+                                  result_key=result_key, throttle=throttle, archive=archive)
+        parse = functools.partial(parse_page, follow_tags=follow_tags, parser=args.parser,
+                                  rules=args.rules)
+        # The cache lives in this process, so parsed results are stored here.
+        after_parse = None
+        if cache is not None:
+            def after_parse(url, quotes, links):
+                cache.store_result(url, result_key, quotes, links)
+        results = crawl_pipeline([args.url], fetch, parse, workers, args.parse_workers,
+                                 max_pages, frontier, args.parse_queue, after_parse,
+                                 parse_timer)
+        print(f"--- Crawling from: {args.url} ({workers} download threads, "
+              f"{args.parse_workers} parser processes) ---")
+    else:
+        def visit(url):
+            return scrape_page(url, session, follow_tags, args.parser, args.rules,
+                               cache, result_key, throttle, parse_timer, archive)
+
+        results = crawl([args.url], visit, workers, max_pages, frontier)
+        print(f"--- Crawling from: {args.url} ({workers} workers) ---")
+
+    # Tag pages list quotes that also appear on the main pages, so we keep
+    # each quote once. Only each quote's FINGERPRINT is remembered, in a SET,
+    # which makes the check instant. The quote itself goes straight to the
+    # output file (or the screen) and is then forgotten. The set still grows
+    # by about 80 bytes per UNIQUE quote (a 16-byte fingerprint plus Python's
+    # overhead): a million distinct quotes cost roughly 80 MB, which is far
+    # less than keeping the quotes, but not nothing.
+    seen_quotes = set()
+    # Exact fingerprints miss quotes that differ by a comma; the near-duplicate
+    # filter catches those too, at the cost of a little more work per quote.
+    near_duplicates = NearDuplicateFilter(args.similarity) if args.near_duplicates else None
+    pages = failures = kept = near_duplicate_count = 0
+    start = time.perf_counter()
+    try:
+        for url, quotes, error in results:
+            if error is not None:
+                # A failed page does not stop the crawl; we report it and move on.
+                failures += 1
+                print(f"Error fetching {url}: {error}")
+                continue
+            pages += 1
+            print(f"Fetched {url}: {len(quotes)} quotes")
+            for quote in quotes:
+                quote_fingerprint = fingerprint(quote)
+                if quote_fingerprint in seen_quotes:
+                    continue
+                seen_quotes.add(quote_fingerprint)
+                if near_duplicates is not None and not near_duplicates.add(item_key(quote)):
+                    near_duplicate_count += 1
+                    continue
+                kept += 1
+                for sink in sinks.values():
+                    sink.write(quote)
+                if not args.output:
+                    display_quote(kept, quote)
+    except KeyboardInterrupt:
+        # Ctrl+C stops the crawl, but everything found so far is kept.
+        print("\nCrawl interrupted.")
+    finally:
+        session.close()
+        for sink in sinks.values():
+            # Writes the last, partly filled batch.
+            sink.close()
+        if cache is not None:
+            cache.close()
+        if archive is not None:
+            archive.close()
+        if args.state:
+            # Saves a final checkpoint, so the next run continues from here.
+            frontier.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\nVisited {pages} pages ({failures} failed) in {elapsed:.2f} seconds "
+          f"({pages / elapsed if elapsed else 0:.1f} pages/sec); "
+          f"{len(frontier)} URLs left unvisited, {frontier.dropped} turned away by a full frontier.")
+    if parse_timer.pages:
+        print(f"Parsing took {parse_timer.ms_per_page():.2f} ms per page "
+              f"({parse_timer.pages} pages parsed).")
+    if args.state and frontier.gave_up:
+        print(f"Gave up on {frontier.gave_up} pages after {frontier.max_attempts} failed "
+              f"attempts (listed in the 'failed' table of {args.state}).")
+    if args.state and len(frontier):
+        print(f"Progress saved in {args.state}; run the same command again to continue.")
+    if cache is not None:
+        print(f"Page cache: {cache.stats['unchanged']} unchanged, "
+              f"{cache.stats['downloaded']} downloaded.")
+    if archive is not None:
+        print(f"Archived {archive.added} pages in {args.archive}.")
+    if throttle is not None:
+        for host, host_stats in throttle.stats().items():
+            print(f"Throttle: {host} ended at {host_stats['limit']:.1f} requests at once "
+                  f"({host_stats['throttled']} throttled answers, "
+                  f"{host_stats['slowdowns']} slow-downs).")
+    if near_duplicates is not None:
+        print(f"Skipped {near_duplicate_count} near-duplicate quotes.")
+    if not kept:
+        print("No quotes were scraped.")
+    for path, sink in sinks.items():
+        print(f"Saved {sink.count} quotes to {path} ({sink.format}).")
 
 
 # The main execution block starts here.
 if __name__ == "__main__":
-    
-    # --- Part 1: Fetching the Webpage ---
-    # We define the URL of the site we want to scrape.
-    URL = "http://quotes.toscrape.com/"
-    print(f"--- Fetching webpage: {URL} ---")
-
-    try:
-        # Use requests.get() to download the HTML content.
-        response = requests.get(URL)
-
-        # It's good practice to check if the request was successful.
-        # A status code of 200 means "OK".
-        response.raise_for_status()  # This will raise an HTTPError for bad responses (4xx or 5xx)
-
-        html_content = response.text
-        print("Successfully fetched the webpage HTML.")
-
-    except requests.exceptions.RequestException as e:
-        # This is a general exception for the requests library. It will catch
-        # connection errors, timeouts, etc.
-        print(f"Error fetching the webpage: {e}")
-        # If we can't get the page, there's no point in continuing.
-        exit()
-
-
-    # --- Part 2: Parsing the HTML with BeautifulSoup ---
-    # Now we create a BeautifulSoup object, which represents the parsed document.
-    # Arguments:
-    # 1. The HTML content we fetched.
-    # 2. The parser we want to use. 'html.parser' is built-in with Python.
-    print("\n--- Parsing HTML with BeautifulSoup ---")
-    soup = BeautifulSoup(html_content, "html.parser")
-    print("HTML parsed successfully. We can now search for data.")
-
-
-    # --- Part 3: Finding and Extracting Data ---
-    # This is the core of scraping. We need to inspect the webpage's HTML
-    # (using the "Inspect" tool in a web browser like Chrome or Firefox) to
-    # find the tags and classes that contain the data we want.
-    #
-    # On quotes.toscrape.com, each quote is contained within a <div> element
-    # that has the CSS class "quote".
-    
-    print("\n--- Finding all quote elements ---")
-    
-    # `soup.find_all()` returns a list of all elements that match our query.
-    # We're looking for all 'div' tags with a class of 'quote'.
-    # NOTE: We use `class_` with an underscore because `class` is a reserved
-    # keyword in Python.
-    quote_elements = soup.find_all('div', class_='quote')
-    print(f"Found {len(quote_elements)} quotes on the page.")
-    
-    # We will store our structured data in a list of dictionaries.
-    scraped_quotes = []
-
-    # Now, we loop through each element we found.
-    for quote_element in quote_elements:
-        # Within each 'div', the text is in a <span> with class="text".
-        # `.find()` gets the *first* matching element.
-        # `.get_text()` extracts the text content from the element.
-        text = quote_element.find('span', class_='text').get_text(strip=True)
-        
-        # The author is in a <small> tag with class="author".
-        author = quote_element.find('small', class_='author').get_text(strip=True)
-        
-        # The tags are inside a <div> with class="tags". Inside that div, each
-        # tag is an <a> tag. So we find the container first.
-        tags_container = quote_element.find('div', class_='tags')
-        
-        # Then we find all the 'a' tags within that container.
-        tag_elements = tags_container.find_all('a', class_='tag')
-        
-        # We can use a LIST COMPREHENSION to extract the text from each tag element.
-        # This is a clean and "Pythonic" way to build a list.
-        tags = [tag.get_text(strip=True) for tag in tag_elements]
-        
-        # Store the extracted data in a dictionary.
-        scraped_quotes.append({
-            "text": text,
-            "author": author,
-            "tags": tags
-        })
-        
-
-    # --- Part 4: Displaying the Scraped Data ---
-    print("\n--- Displaying Scraped Quotes ---")
-    if not scraped_quotes:
-        print("No quotes were scraped.")
-    else:
-        # Loop through our list of dictionaries and print the data nicely.
-        for i, quote in enumerate(scraped_quotes, 1):
-            print(f"\nQuote #{i}")
-            print(f"  Text: {quote['text']}")
-            print(f"  Author: {quote['author']}")
-            # The join() string method is a great way to format a list for printing.
-            print(f"  Tags: {', '.join(quote['tags'])}")
+    main()
 
 '''
 =====================================================================================
@@ -211,6 +580,140 @@ HOW TO RUN THIS CODE:
     (Windows):     `.\\venv\\Scripts\\activate`
 3.  Run the file from your terminal:
     `python 22_project_web_scraper.py`
-4.  You should see the script fetch the webpage and then print out the formatted
+4.  You should see the script fetch the webpages and then print out the formatted
     quotes it found.
-'''
\ No newline at end of file
+
+CRAWLING MANY PAGES:
+
+The scraper does not stop at the first page. It follows the "Next" links and
+the tag pages, downloading several pages at the same time with a pool of
+worker threads (see `scraper/crawl.py`). URLs waiting to be visited are kept
+in a bounded FRONTIER, and each URL is visited only once. Useful options
+(see `python 22_project_web_scraper.py --help`):
+-   `--single-page`        Only scrape the start page, like the original lesson.
+-   `--no-tags`            Follow the "Next" links only.
+-   `--workers 16`         Download up to 16 pages at once. Be polite: small
+                           sites may not appreciate many parallel requests
+                           (the throttle below takes care of that).
+-   `--max-pages 0`        Crawl until there is nothing left (default: 100 pages).
+-   `--frontier-size 500`  Keep at most 500 URLs waiting; extra links are
+                           turned away and counted in the summary.
+
+PARSING ON EVERY CORE:
+
+Parsing HTML is CPU work, and Python threads share one core (the GIL). With
+`--parse-workers 4`, the crawl becomes a PIPELINE (see `scraper/pipeline.py`):
+the worker threads only download, four separate processes parse, and the main
+program prints the results. Each stage is kept at most a few pages ahead of
+the next (`--parse-queue`), so a slow stage makes the others wait instead of
+filling up memory.
+
+FASTER PARSERS:
+
+`--parser` picks how pages are parsed (see `scraper/parsers.py`):
+-   `html.parser`  BeautifulSoup with Python's built-in parser (default).
+-   `lxml`         The lxml library (`pip install lxml`): a C parser with
+                   precompiled XPath searches. Usually the fastest.
+-   `stream`       A streaming extractor that never builds a document tree,
+                   so it needs very little memory.
+`python 22_scraper_parser_benchmark.py` compares their speed and memory use.
+
+RULE FILES:
+
+Instead of the built-in extraction, a RULE FILE can describe what to extract
+(see `scraper/rules.py` for the format). The rules are compiled once for the
+chosen parser and then applied to every page, so one crawler can handle many
+sites, each with its own small JSON or YAML file:
+`python 22_project_web_scraper.py --rules scraper/rules/quotes_toscrape.json --parser lxml`
+
+PAGE CACHE:
+
+Crawled pages are kept, compressed, in `scraper_cache.sqlite3` next to this
+script, together with their validators (ETag/Last-Modified) and the quotes
+extracted from them (see `scraper/http_cache.py`). The next crawl sends
+CONDITIONAL requests: a page the server reports as unchanged ("304 Not
+Modified") is neither downloaded nor parsed again. Servers that send no
+validators are simply downloaded every time.
+-   `--no-cache`          Download every page, ignoring the cache.
+-   `--cache-file FILE`   Keep the cache somewhere else.
+
+RESUMABLE CRAWLS:
+
+With `--state crawl_state.sqlite3`, the frontier and the set of seen URLs are
+kept in that file (see `scraper/state.py`), and progress is saved every
+`--checkpoint-every` pages and when the crawl stops. If the crawl is
+interrupted, crashes, or hits `--max-pages`, run the same command again and
+it continues where it left off, without fetching the pages it already
+visited. Delete the file (and `crawl_state.sqlite3.bloom`) to start over.
+A page that fails (a network blip, a server error) goes back to the end of
+the queue and is tried again, in this run or the next one, up to
+`--max-attempts` times.
+
+ADAPTIVE THROTTLING:
+
+How many pages to download at once is decided per server by a THROTTLE (see
+`scraper/throttle.py`). It starts with one request at a time and adds more
+while the server answers quickly. When the server slows down, answers "429
+Too Many Requests" or "503 Service Unavailable", the number is halved, and a
+`Retry-After` header pauses that server for as long as it asks. This is
+AIMD, the rule TCP uses to share a network: grow slowly, back off quickly.
+The throttle also reads each site's `robots.txt` once, waits its
+`Crawl-delay` between requests, and skips the pages it disallows.
+`--workers` is the most it will ever allow; the summary shows where it
+ended up. `--no-throttle` goes back to exactly `--workers` requests at once.
+
+SAVING THE QUOTES:
+
+Quotes are printed as soon as they are found, and only a small fingerprint of
+each is remembered (to skip duplicates). Memory use therefore grows with the
+number of DISTINCT quotes (about 80 bytes each), not with the number of pages
+or the size of the quotes. With `--output`, they are saved to a file instead (see
+`scraper/sinks.py`), in batches that are flushed all the way to the disk:
+-   `--output quotes.jsonl`    One JSON object per line.
+-   `--output quotes.csv`      A table for spreadsheets; tags are joined by "; ".
+-   `--output quotes.sqlite`   An `items` table in a SQLite database.
+-   `--batch-size 100`         Write every 100 quotes...
+-   `--flush-every 2`          ...or every 2 seconds, whichever comes first.
+The files are appended to, so a resumed crawl adds to them.
+
+NEAR-DUPLICATES:
+
+The same quote often turns up again with a different apostrophe, an extra
+space or a changed word, and the exact check above keeps both copies. With
+`--near-duplicates`, every new quote is also compared with the ones already
+found, using MINHASH signatures and LSH buckets (see `scraper/dedupe.py`):
+only the few quotes that already look alike are compared, so this stays fast
+with millions of quotes. `--similarity 0.9` makes the match stricter. NumPy
+(`pip install numpy`) makes it several times faster, but is not required.
+
+SEARCHING THE QUOTES:
+
+With `--index quotes_index.sqlite`, every quote is also filed in an INVERTED
+INDEX (see `scraper/index.py`): for each author, tag and word, a sorted list
+of the quotes that have it. A search intersects those lists, so it takes
+milliseconds even with millions of quotes:
+`python 22_scraper_query.py quotes_index.sqlite --tag love --tag life`
+`python 22_scraper_query.py quotes_index.sqlite --author "Albert Einstein" --word imagination`
+
+MEASURING THE CRAWLER OFFLINE:
+
+The summary shows how many pages per second the crawl managed and how long
+parsing took per page. To measure changes without the internet (and without
+bothering a real site), use the local FIXTURE SERVER (see
+`scraper/server.py`), which serves a generated site with thousands of pages
+and can add latency and errors on purpose:
+`python 22_scraper_fixture_server.py --pages 2000 --latency 0.05`
+`python 22_project_web_scraper.py --url http://127.0.0.1:8000/ --max-pages 0`
+`python 22_scraper_crawl_benchmark.py` starts its own server and compares the
+crawl modes (threads, fixed concurrency, pipeline, cached re-crawl) by
+pages/sec, parse time per page and peak memory.
+
+RE-EXTRACTING WITHOUT RE-CRAWLING:
+
+With `--archive pages.warc.gz`, the raw HTML of every downloaded page is also
+kept, compressed, in an append-only ARCHIVE (see `scraper/archive.py`), with
+an index saying where each page's record starts. After changing a rule file
+or switching parsers, run the extraction again over the archive, on every
+CPU core and with no network at all:
+`python 22_scraper_reextract.py pages.warc.gz --output quotes.jsonl`
+'''
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Crawl Benchmark)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This file is a companion to `22_project_web_scraper.py`. It starts a local
+fixture server (see `scraper/server.py`), crawls it with each of the
+scraper's crawl modes, and reports how many pages per second each mode
+managed, how long parsing took per page, and how much memory the scraper
+needed. No internet access is needed, and no public site is bothered.
+"""
+
+'''
+=====================================================================================
+|                                  - BENCHMARK START -                                |
+=====================================================================================
+
+WHAT IS MEASURED?
+The parser benchmark (`22_scraper_parser_benchmark.py`) times parsing alone.
+This one times the WHOLE crawl, end to end: downloading, throttling, parsing,
+following links and saving the quotes. Each mode runs the real
+`22_project_web_scraper.py`, in a FRESH process, against the same local
+server:
+-   `threads`    The default: download threads that also parse, with the
+                 adaptive throttle.
+-   `fixed`      The same with `--no-throttle`: always `--workers` requests.
+-   `pipeline`   Downloads in threads, parsing in `--parse-workers` processes.
+-   `cached`     A re-crawl with the page cache: the site is crawled once to
+                 fill the cache (not timed), then again, when every page
+                 answers "304 Not Modified" and nothing is parsed.
+
+For each run it reports:
+-   PAGES/SEC: pages visited per second of crawling, as the scraper measured
+    it (Python's start-up time is left out).
+-   PARSE MS: the average time to parse one page.
+-   PEAK RSS: the most real memory the scraper process used (including its
+    parser processes, if they were bigger). Not available on Windows.
+
+The server can be made slow or flaky, to see how each mode copes:
+`python 22_scraper_crawl_benchmark.py`
+`python 22_scraper_crawl_benchmark.py --pages 300 --latency 0.05 --mode threads --mode pipeline`
+`python 22_scraper_crawl_benchmark.py --max-concurrent 4 --mode threads --mode fixed`
+'''
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from scraper.fixtures import FixtureSite
+from scraper.parsers import available_backends
+from scraper.server import FixtureServer
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRAPER = os.path.join(BASE_DIR, "22_project_web_scraper.py")
+
+MODES = ("threads", "fixed", "pipeline", "cached")
+
+# The summary lines the scraper prints, which we read the numbers from.
+VISITED = re.compile(r"Visited (\d+) pages \((\d+) failed\) in [\d.]+ seconds \(([\d.]+) pages/sec\)")
+PARSING = re.compile(r"Parsing took ([\d.]+) ms per page")
+
+
+def run_scraper(arguments):
+    """
+    Runs the scraper in a new process and waits for it.
+
+    Returns:
+        tuple: (exit code, everything it printed, its peak RSS in KiB or None).
+    """
+    # The output goes to a temporary file rather than a pipe, so that we can
+    # wait for the process ourselves with `os.wait4()`, which also reports
+    # the resources it used.
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as log:
+        process = subprocess.Popen([sys.executable, SCRAPER, *arguments], cwd=BASE_DIR,
+                                   stdout=log, stderr=subprocess.STDOUT)
+        peak = None
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # Linux reports KiB, macOS reports bytes.
+            peak = usage.ru_maxrss / 1024 if sys.platform == "darwin" else usage.ru_maxrss
+        else:
+            process.wait()
+        log.seek(0)
+        return process.returncode, log.read(), peak
+
+
+def mode_arguments(mode, args, work_dir):
+    """
+    Returns the scraper options for one mode.
+
+    Returns:
+        tuple: (options for a warm-up run or None, options for the timed run).
+    """
+    common = ["--max-pages", str(args.max_pages), "--workers", str(args.workers),
+              "--parser", args.parser, "--output", os.path.join(work_dir, f"{mode}.jsonl")]
+    if mode == "threads":
+        return None, common + ["--no-cache"]
+    if mode == "fixed":
+        return None, common + ["--no-cache", "--no-throttle"]
+    if mode == "pipeline":
+        return None, common + ["--no-cache", "--parse-workers", str(args.parse_workers)]
+    cache = ["--cache-file", os.path.join(work_dir, "cache.sqlite3")]
+    return common + cache, common + cache
+
+
+def main():
+    """Parses the command-line options, starts the server and runs every mode."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scraper's crawl modes against a local fixture server."
+    )
+    parser.add_argument("--mode", action="append", choices=MODES,
+                        help="run only this mode (may be repeated)")
+    parser.add_argument("--pages", type=int, default=1000,
+                        help="main listing pages of the generated site (default: 1000)")
+    parser.add_argument("--max-pages", type=int, default=0,
+                        help="pages to crawl per run; 0 means all of them (default: 0)")
+    parser.add_argument("--workers", type=int, default=8,
+                        help="the scraper's --workers (default: 8)")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1,
+                        help="parser processes in pipeline mode (default: one per core)")
+    parser.add_argument("--parser", choices=available_backends(), default="html.parser",
+                        help="the scraper's --parser (default: %(default)s)")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="seconds the server waits before every answer (default: 0.02)")
+    parser.add_argument("--jitter", type=float, default=0.01,
+                        help="up to this many extra seconds, at random (default: 0.01)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests that fail with a 503 (default: 0)")
+    parser.add_argument("--max-concurrent", type=int,
+                        help="the server answers 429 beyond this many requests at once")
+    args = parser.parse_args()
+
+    site = FixtureSite(pages=max(args.pages, 1))
+    server = FixtureServer(site, latency=args.latency, jitter=args.jitter,
+                           error_rate=args.error_rate, max_concurrent=args.max_concurrent,
+                           retry_after=1 if args.max_concurrent else None)
+    modes = args.mode or list(MODES)
+
+    print("--- Scraper Crawl Benchmark ---")
+    print(f"Site: {sum(1 for _ in site.paths())} pages; latency {args.latency * 1000:.0f} ms "
+          f"+ up to {args.jitter * 1000:.0f} ms; {args.error_rate:.0%} errors; "
+          f"parser {args.parser}, {args.workers} workers.\n")
+
+    rows = []
+    crashed = False
+    with server, tempfile.TemporaryDirectory() as work_dir:
+        for mode in modes:
+            warm_up, timed = mode_arguments(mode, args, work_dir)
+            url = ["--url", server.url]
+            if warm_up is not None:
+                run_scraper(url + warm_up)
+            code, output, peak = run_scraper(url + timed)
+            visited = VISITED.search(output)
+            if code != 0 or visited is None:
+                crashed = True
+                print(f"{mode}: the scraper failed (exit code {code}). Its last output:")
+                print("\n".join(output.splitlines()[-10:]))
+                continue
+            parsing = PARSING.search(output)
+            rows.append((mode, int(visited.group(1)), int(visited.group(2)),
+                         float(visited.group(3)),
+                         float(parsing.group(1)) if parsing else None, peak))
+
+    print(f"{'Mode':<10} {'Pages':>6} {'Failed':>6} {'Pages/sec':>10} {'Parse ms':>9} "
+          f"{'Peak RSS MiB':>13}")
+    print("-" * 59)
+    for mode, pages, failed, per_second, parse_ms, peak in rows:
+        parse_text = "n/a" if parse_ms is None else f"{parse_ms:.2f}"
+        peak_text = "n/a" if peak is None else f"{peak / 1024:.1f}"
+        print(f"{mode:<10} {pages:>6} {failed:>6} {per_second:>10.1f} {parse_text:>9} "
+              f"{peak_text:>13}")
+
+    statuses = ", ".join(f"{count} x {status}"
+                         for status, count in sorted(server.stats["statuses"].items()))
+    print(f"\nThe server answered {server.stats['requests']} requests ({statuses}), "
+          f"at most {server.stats['peak_concurrent']} at once.")
+    # A non-zero exit code lets scripts and CI jobs detect the failure.
+    sys.exit(1 if crashed else 0)
+
+
+if __name__ == "__main__":
+    main()
+
+'''
+=====================================================================================
+|                                   - BENCHMARK END -                                 |
+=====================================================================================
+
+HOW TO READ THE OUTPUT:
+
+-   With no latency, the crawl is limited by PARSING (CPU). The pipeline
+    only helps if there are several CPU cores to parse on, and a faster
+    `--parser` helps every mode.
+-   With latency, the crawl is limited by WAITING. More download workers
+    help, until the server (or `--max-concurrent`) pushes back.
+-   The `cached` mode shows what a re-crawl of an unchanged site costs:
+    no downloads of page bodies and no parsing.
+-   PEAK RSS grows only slowly with `--pages`: the frontier is bounded and
+    the quotes go straight to a file. What does grow is the set of quote
+    fingerprints used to skip duplicates, about 80 bytes per distinct quote.
+'''
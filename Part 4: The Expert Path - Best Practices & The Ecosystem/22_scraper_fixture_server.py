@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Fixture Server)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This file is a companion to `22_project_web_scraper.py`. It serves a
+generated quotes.toscrape.com look-alike with as many pages as you like on
+this computer, so the scraper can be tried out and measured without the
+internet. It can also be made slow, flaky or easily overloaded on purpose.
+"""
+
+'''
+=====================================================================================
+|                                   - SERVER START -                                  |
+=====================================================================================
+
+Start the server in one terminal:
+`python 22_scraper_fixture_server.py --pages 2000 --latency 0.05 --jitter 0.05`
+
+and crawl it from another:
+`python 22_project_web_scraper.py --url http://127.0.0.1:8000/ --max-pages 0 --output quotes.jsonl`
+
+Some things worth trying (see `scraper/server.py`):
+-   `--latency 0.2`           A far-away server: watch how much more the
+                              download threads help.
+-   `--error-rate 0.05`       One request in twenty fails with a 503.
+-   `--max-concurrent 4 --retry-after 1`
+                              A small server: more than four requests at once
+                              get "429 Too Many Requests". Compare the
+                              scraper with and without `--no-throttle`.
+-   `--crawl-delay 1`         Serves a robots.txt asking for one second
+                              between requests.
+Press Ctrl+C to stop; the server then prints what it answered.
+'''
+
+import argparse
+
+from scraper.fixtures import FixtureSite
+from scraper.server import FixtureServer
+
+
+def main():
+    """Parses the command-line options and serves the site until Ctrl+C."""
+    parser = argparse.ArgumentParser(description="Serve a generated quotes site for the scraper.")
+    parser.add_argument("--port", type=int, default=8000,
+                        help="the port to listen on (default: 8000)")
+    parser.add_argument("--pages", type=int, default=1000,
+                        help="main listing pages; every tag adds its own (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the generated site (default: 0)")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds every answer waits (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="up to this many extra seconds per answer, at random (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests that fail on purpose, 0 to 1 (default: 0)")
+    parser.add_argument("--error-status", type=int, default=503,
+                        help="status code of those failures (default: 503)")
+    parser.add_argument("--retry-after", type=float,
+                        help="send this Retry-After (seconds) with failures and 429s")
+    parser.add_argument("--max-concurrent", type=int,
+                        help="answer 429 to requests beyond this many at once")
+    parser.add_argument("--crawl-delay", type=int,
+                        help="serve a robots.txt asking for this many seconds between requests")
+    args = parser.parse_args()
+
+    robots = None
+    if args.crawl_delay is not None:
+        robots = f"User-agent: *\nCrawl-delay: {args.crawl_delay}\n"
+    site = FixtureSite(pages=max(args.pages, 1), seed=args.seed)
+    try:
+        server = FixtureServer(site, port=args.port, latency=args.latency, jitter=args.jitter,
+                               error_rate=args.error_rate, error_status=args.error_status,
+                               retry_after=args.retry_after, max_concurrent=args.max_concurrent,
+                               robots=robots, seed=args.seed)
+    except (OSError, ValueError) as err:
+        print(f"Error: Could not start the server: {err}")
+        return
+
+    print(f"Serving {sum(1 for _ in site.paths())} pages at {server.url} (Ctrl+C to stop).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping.")
+    finally:
+        server.stop()
+
+    statuses = ", ".join(f"{count} x {status}"
+                         for status, count in sorted(server.stats["statuses"].items()))
+    print(f"Answered {server.stats['requests']} requests ({statuses or 'none'}); "
+          f"at most {server.stats['peak_concurrent']} at once.")
+
+
+if __name__ == "__main__":
+    main()
+
+'''
+=====================================================================================
+|                                    - SERVER END -                                   |
+=====================================================================================
+
+To measure the scraper's crawl modes against this server automatically, use
+`python 22_scraper_crawl_benchmark.py`, which starts its own copy.
+'''
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Parser Benchmark)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This file is a companion to `22_project_web_scraper.py`. It parses the same
+set of generated quote pages with every available parser backend and reports
+how many pages per second each one handles and how much memory it needs per
+page. It also checks that all backends extract exactly the same data.
+"""
+
+'''
+=====================================================================================
+|                                  - BENCHMARK START -                                |
+=====================================================================================
+
+WHY BENCHMARK?
+"lxml is faster" is common wisdom, but HOW much faster, on OUR pages, with
+OUR extraction code? A BENCHMARK answers that with numbers. This one:
+1.  Generates `--pages` pages with `scraper/fixtures.py` (no network needed,
+    and every run parses exactly the same HTML).
+2.  For each backend, starts a FRESH Python process, so one backend's memory
+    use cannot hide or inflate another's.
+3.  Times parsing every page (best of `--repeat` rounds), giving PAGES/SEC.
+4.  Measures MEMORY PER PAGE in two ways:
+    -   PY HEAP: the peak of Python's own memory allocator while parsing one
+        page (`tracemalloc`), averaged over the pages. lxml builds its tree in
+        C, outside Python's allocator, so this column undercounts lxml.
+    -   RSS: how much the process's peak RESIDENT SET SIZE (the real memory
+        the operating system gave it) grew while parsing. Pages are parsed
+        one at a time, so this is roughly the working memory for one page,
+        C included. Not available on Windows.
+5.  Compares every backend's output with the first one's.
+
+Run it after every change to a parser:
+`python 22_scraper_parser_benchmark.py`
+`python 22_scraper_parser_benchmark.py --pages 2000 --repeat 5 --parser lxml --parser stream`
+'''
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+# `resource` only exists on Unix-like systems.
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from scraper.fixtures import FixtureSite
+from scraper.parsers import available_backends, get_backend
+
+
+def generate_pages(count, seed):
+    """
+    Renders the first `count` pages of a generated site.
+
+    Returns:
+        list: The HTML of each page.
+    """
+    # About a third of a site's pages are main pages; the rest are tag pages.
+    site = FixtureSite(pages=max(1, count // 3), seed=seed)
+    pages = []
+    for path in site.paths():
+        if len(pages) == count:
+            break
+        pages.append(site.render(path))
+    return pages
+
+
+def peak_rss_kib():
+    """Returns this process's peak resident set size in KiB, or None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes.
+    return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def measure_backend(name, count, seed, repeat):
+    """
+    Benchmarks one backend. Runs in a fresh process (see `main()`).
+
+    Returns:
+        dict: The measurements.
+    """
+    backend = get_backend(name)
+    pages = generate_pages(count, seed)
+    # Parse one page first, so one-time setup (like compiling XPath
+    # expressions) is not counted as parsing time.
+    backend.extract(pages[0])
+
+    rss_before = peak_rss_kib()
+    best = float("inf")
+    checksum = hashlib.sha1()
+    for round_number in range(repeat):
+        start = time.perf_counter()
+        for html_content in pages:
+            data = backend.extract(html_content)
+            if round_number == 0:
+                # Fingerprint everything extracted, to compare backends.
+                checksum.update(json.dumps(data, sort_keys=True).encode("utf-8"))
+        best = min(best, time.perf_counter() - start)
+    rss_after = peak_rss_kib()
+
+    # `tracemalloc` slows Python down a lot, so it gets its own pass over at
+    # most 100 pages, after the timing.
+    sample = pages[:100]
+    tracemalloc.start()
+    heap_peaks = []
+    for html_content in sample:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        backend.extract(html_content)
+        heap_peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    return {
+        "backend": name,
+        "pages_per_sec": len(pages) / best,
+        "ms_per_page": best / len(pages) * 1000,
+        "heap_kib": sum(heap_peaks) / len(heap_peaks) / 1024,
+        "rss_kib": None if rss_before is None else rss_after - rss_before,
+        "checksum": checksum.hexdigest(),
+        "html_kib": sum(len(page) for page in pages) / len(pages) / 1024,
+    }
+
+
+def main():
+    """Parses the command-line options and benchmarks every backend."""
+    parser = argparse.ArgumentParser(
+        description="Compare the speed and memory use of the scraper's parser backends."
+    )
+    parser.add_argument("--pages", type=int, default=500,
+                        help="pages to parse per round (default: 500)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timing rounds; the best one counts (default: 3)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the generated site (default: 0)")
+    parser.add_argument("--parser", action="append", choices=available_backends(),
+                        help="benchmark only this backend (may be repeated)")
+    args = parser.parse_args()
+
+    names = args.parser or available_backends()
+    print("--- Scraper Parser Benchmark ---")
+    print(f"{args.pages} pages, best of {args.repeat} rounds.\n")
+
+    # "spawn" starts every worker as a brand-new Python process, with none of
+    # this process's memory, so each backend's RSS is measured from scratch.
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results.append(executor.submit(measure_backend, name, args.pages,
+                                           args.seed, args.repeat).result())
+
+    print(f"{'Backend':<12} {'Pages/sec':>10} {'ms/page':>8} {'Py heap KiB':>12} "
+          f"{'RSS KiB':>8}  Output")
+    print("-" * 66)
+    reference = results[0]["checksum"]
+    all_match = True
+    for result in results:
+        matches = result["checksum"] == reference
+        all_match = all_match and matches
+        rss = "n/a" if result["rss_kib"] is None else f"{result['rss_kib']:.0f}"
+        print(f"{result['backend']:<12} {result['pages_per_sec']:>10.0f} "
+              f"{result['ms_per_page']:>8.2f} {result['heap_kib']:>12.1f} {rss:>8}  "
+              f"{'same' if matches else 'DIFFERENT'}")
+    print(f"\nAverage page size: {results[0]['html_kib']:.1f} KiB of HTML.")
+
+    if not all_match:
+        print("MISMATCH: the backends did not extract the same data.")
+    # A non-zero exit code lets scripts and CI jobs detect the failure.
+    sys.exit(0 if all_match else 1)
+
+
+if __name__ == "__main__":
+    main()
+
+'''
+=====================================================================================
+|                                   - BENCHMARK END -                                 |
+=====================================================================================
+
+HOW TO READ THE OUTPUT:
+
+-   PAGES/SEC and MS/PAGE: parsing speed, including the extraction of every
+    quote and link. Compare them before and after a change to a parser.
+-   PY HEAP KIB: the most memory Python objects needed while parsing one page.
+    BeautifulSoup builds a tree of Python objects, so it is large; the
+    streaming extractor keeps almost nothing.
+-   RSS KIB: how much the process's peak real memory grew. It includes memory
+    used by C code (lxml), but the operating system hands out memory in
+    chunks, so small values are only rough.
+-   OUTPUT: "same" means the backend extracted exactly the same quotes, tags
+    and links as the first backend in the table. "DIFFERENT" is a bug in one
+    of the parsers, and the benchmark exits with an error.
+'''
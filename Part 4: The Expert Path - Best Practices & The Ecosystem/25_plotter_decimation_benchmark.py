@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 25: Project: CSV Data Plotter (Decimation Benchmark)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This file is a companion to `25_project_csv_data_plotter.py`. It draws one
+long generated series with matplotlib, once in full and once per decimation
+method, and reports how long each takes to render and how much of the
+picture each method changed.
+"""
+
+'''
+=====================================================================================
+|                                  - BENCHMARK START -                                |
+=====================================================================================
+
+WHAT IS MEASURED?
+1.  A series of `--points` points is generated: a wandering line with a
+    seasonal wave and a few sharp SPIKES, the kind of detail a careless
+    downsampling loses. (The same `--seed` always gives the same series.)
+2.  For each method ("none" draws every point), the series is decimated to
+    about `--per-pixel` points per pixel column, then drawn on a chart of
+    `--width` x `--height` pixels, without a window (matplotlib's "Agg"
+    backend draws into memory).
+3.  For each method it reports (best of `--repeat` rounds):
+    -   POINTS: how many points were drawn.
+    -   DECIMATE MS and RENDER MS: the time to pick the points, and the time
+        for matplotlib to draw them. TOTAL is what the user waits for.
+    -   PIXELS CHANGED: the share of the chart's pixels that differ from the
+        full drawing. 0% means the picture is identical.
+    -   PEAKS KEPT: whether the highest and lowest points are still drawn.
+
+`python 25_plotter_decimation_benchmark.py`
+`python 25_plotter_decimation_benchmark.py --points 10000000 --width 1920 --method lttb`
+'''
+
+import argparse
+import math
+import sys
+import time
+
+import matplotlib
+# "Agg" draws into memory: no window, and it works on a server too. It must
+# be chosen before `pyplot` is imported.
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+# matplotlib itself needs NumPy, so wherever this runs, NumPy is installed.
+import numpy as np
+
+from plotter.decimate import METHODS, decimate, target_points
+
+
+def generate_series(count, seed):
+    """
+    Generates a long, bumpy series with a few spikes.
+
+    Returns:
+        tuple: (x values, y values).
+    """
+    generator = np.random.default_rng(seed)
+    xs = np.arange(count, dtype=float)
+    # A random walk, plus a slow wave...
+    ys = np.cumsum(generator.normal(0.0, 1.0, count))
+    ys += 200.0 * np.sin(xs * (8 * math.pi / count))
+    # ...plus five one-point spikes, alternately up and down.
+    spikes = generator.choice(count, size=min(count, 5), replace=False)
+    ys[spikes] += 2000.0 * np.resize([1.0, -1.0], len(spikes))
+    return xs, ys
+
+
+def new_chart(width, height, dpi):
+    """Creates an empty figure of `width` x `height` pixels, with its axes."""
+    figure, axes = plt.subplots(figsize=(width / dpi, height / dpi), dpi=dpi)
+    return figure, axes
+
+
+def render(xs, ys, width, height, dpi, limits):
+    """
+    Draws a line and returns the picture.
+
+    Returns:
+        bytes: The chart's pixels, 4 bytes (red, green, blue, alpha) each.
+    """
+    figure, axes = new_chart(width, height, dpi)
+    axes.plot(xs, ys, linewidth=1)
+    # The same axis limits for every method, so only the line can differ.
+    axes.set_xlim(*limits[0])
+    axes.set_ylim(*limits[1])
+    figure.canvas.draw()
+    pixels = bytes(figure.canvas.buffer_rgba())
+    plt.close(figure)
+    return pixels
+
+
+def changed_share(pixels, reference):
+    """Returns the share of pixels (0.0 to 1.0) that differ between two pictures."""
+    # Viewed as 4-byte numbers, there is one number per pixel.
+    first = np.frombuffer(pixels, dtype=np.uint32)
+    second = np.frombuffer(reference, dtype=np.uint32)
+    return float((first != second).mean())
+
+
+def best_time(function, repeat):
+    """Runs `function` `repeat` times; returns (its result, the fastest time in seconds)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    """Parses the command-line options and benchmarks every decimation method."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark the plotter's decimation methods against drawing every point."
+    )
+    parser.add_argument("--points", type=int, default=2_000_000,
+                        help="length of the generated series (default: 2000000)")
+    parser.add_argument("--method", action="append", choices=[m for m in METHODS if m != "none"],
+                        help="benchmark only this method (may be repeated)")
+    parser.add_argument("--width", type=int, default=1280,
+                        help="chart width in pixels (default: 1280)")
+    parser.add_argument("--height", type=int, default=720,
+                        help="chart height in pixels (default: 720)")
+    parser.add_argument("--dpi", type=int, default=100,
+                        help="chart resolution (default: 100)")
+    parser.add_argument("--per-pixel", type=float, default=2.0,
+                        help="points per pixel column after decimation (default: 2)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="rounds per method; the fastest counts (default: 3)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the generated series (default: 0)")
+    args = parser.parse_args()
+    if args.points < 3 or args.per_pixel <= 0:
+        print("Error: --points must be at least 3 and --per-pixel above 0.")
+        sys.exit(1)
+    repeat = max(args.repeat, 1)
+
+    print("--- Plotter Decimation Benchmark ---")
+    xs, ys = generate_series(args.points, args.seed)
+    low, high = ys.min(), ys.max()
+    margin = (high - low) * 0.05 or 1.0
+    limits = ((xs[0], xs[-1]), (low - margin, high + margin))
+    figure, axes = new_chart(args.width, args.height, args.dpi)
+    target = target_points(axes, args.per_pixel)
+    plt.close(figure)
+    print(f"{args.points:,} points on a {args.width} x {args.height} chart; "
+          f"decimating to about {target:,} points; best of {repeat}.\n")
+
+    rows = []
+    reference = None
+    for method in ["none", *(args.method or [m for m in METHODS if m != "none"])]:
+        (kept_xs, kept_ys), decimate_seconds = best_time(
+            lambda: decimate(xs, ys, method, target), repeat)
+        pixels, render_seconds = best_time(
+            lambda: render(kept_xs, kept_ys, args.width, args.height, args.dpi, limits), repeat)
+        if reference is None:
+            reference = pixels
+        peaks_kept = np.max(kept_ys) == high and np.min(kept_ys) == low
+        rows.append((method, len(kept_xs), decimate_seconds, render_seconds,
+                     changed_share(pixels, reference), peaks_kept))
+
+    print(f"{'Method':<8} {'Points':>10} {'Decimate ms':>12} {'Render ms':>10} "
+          f"{'Total ms':>9} {'Pixels changed':>15} {'Peaks kept':>11}")
+    print("-" * 81)
+    for method, points, decimate_seconds, render_seconds, changed, peaks_kept in rows:
+        print(f"{method:<8} {points:>10,} {decimate_seconds * 1000:>12.1f} "
+              f"{render_seconds * 1000:>10.1f} {(decimate_seconds + render_seconds) * 1000:>9.1f} "
+              f"{changed:>15.2%} {'yes' if peaks_kept else 'NO':>11}")
+
+
+if __name__ == "__main__":
+    main()
+
+'''
+=====================================================================================
+|                                   - BENCHMARK END -                                 |
+=====================================================================================
+
+HOW TO READ THE OUTPUT:
+
+-   "none" is the reference: every point drawn. Its RENDER MS grows with the
+    number of points; the decimated methods stay about the same however long
+    the series is, because they always draw about the same number of points.
+-   PIXELS CHANGED shows the price. A fraction of a percent is the odd
+    anti-aliased pixel along the line: invisible. MINMAX changes the picture
+    least, because within a pixel column it draws the same vertical stroke.
+    LTTB changes a little more, in exchange for smoother-looking lines.
+-   PEAKS KEPT: MINMAX always keeps the highest and lowest point. LTTB keeps
+    the most prominent point of each bucket, which is almost always the spike,
+    but not guaranteed.
+-   DECIMATE MS: the cost of picking the points, much smaller than the
+    rendering it saves.
+'''
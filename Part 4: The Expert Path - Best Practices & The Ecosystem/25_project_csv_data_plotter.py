@@ -56,12 +56,22 @@ Follow the professional workflow we've learned:
     data file described below inside your project folder.
 '''
 
+# `argparse` reads optional settings (like `--chunk-rows`) from the command line.
+import argparse
 # We need the `csv` module to read the data file.
 import csv
 # We import the `pyplot` interface from `matplotlib` and give it the
 # conventional alias `plt`.
 import matplotlib.pyplot as plt
 
+# Our own helpers, in the `plotter/` folder next to this file. They let us
+# read a CSV file of ANY size a chunk at a time (see `plotter/stream.py`),
+# with its numbers parsed straight into typed arrays (`plotter/columnar.py`).
+from plotter.columnar import available_loaders, read_columns
+# ...and shrink each line to about as many points as the chart has pixels.
+from plotter.decimate import METHODS, decimate, target_points
+from plotter.stream import PlotBuffer, RunningStats, read_chunks
+
 
 # --- Part 1: The Data File ---
 #
@@ -87,46 +97,93 @@ import matplotlib.pyplot as plt
 
 # The main execution block starts here.
 if __name__ == "__main__":
-    
+
+    # The data file and a few settings can be given on the command line;
+    # the defaults plot `sample_sales_data.csv` exactly as before.
+    parser = argparse.ArgumentParser(description="Plot the number columns of a CSV file.")
+    parser.add_argument("file", nargs="?", default="sample_sales_data.csv",
+                        help="the CSV file to plot (default: %(default)s)")
+    parser.add_argument("--chunk-rows", type=int, default=100_000,
+                        help="rows to read and process at a time (default: 100000)")
+    parser.add_argument("--loader", choices=available_loaders(), default="auto",
+                        help="how to read the numbers: typed NumPy arrays, typed arrays "
+                             "without NumPy, or the original row-by-row loop "
+                             "(default: auto, which uses NumPy if it is installed)")
+    parser.add_argument("--points", type=int, default=10_000,
+                        help="buckets kept per line while reading; each bucket keeps "
+                             "its lowest and highest point (default: 10000)")
+    parser.add_argument("--decimate", choices=METHODS, default="minmax",
+                        help="how to cut each line down before drawing it: min/max per "
+                             "pixel column, LTTB, or not at all (default: minmax)")
+    parser.add_argument("--per-pixel", type=float, default=2.0,
+                        help="points to draw per pixel column of the chart (default: 2)")
+    parser.add_argument("--save", metavar="IMAGE",
+                        help="save the chart to IMAGE (e.g. chart.png) instead of opening a window")
+    args = parser.parse_args()
+    if args.chunk_rows < 1 or args.points < 2 or args.per_pixel <= 0:
+        print("Error: --chunk-rows must be at least 1, --points at least 2 "
+              "and --per-pixel above 0.")
+        exit()
+
     # --- Part 2: Reading and Processing the CSV Data ---
     print("--- Reading data from CSV file ---")
-    
-    # We will store our columns of data in these lists.
-    months = []
-    revenues = []
-    profits = []
-    
-    file_path = 'sample_sales_data.csv'
+
+    file_path = args.file
 
     try:
         # We open the file using a `with` statement.
-        with open(file_path, mode='r', encoding='utf-8') as csv_file:
+        with open(file_path, mode='r', encoding='utf-8', newline='') as csv_file:
             # `csv.reader` creates a reader object that lets us iterate over
             # lines in the CSV, and it automatically handles splitting the
             # columns for us.
             csv_reader = csv.reader(csv_file)
-            
+
             # The first row is the header. We want to skip it.
-            # The `next()` function retrieves the next item from an iterator.
-            header = next(csv_reader)
+            # The `next()` function retrieves the next item from an iterator
+            # (or the default we give it, `None`, if the file is empty).
+            header = next(csv_reader, None)
             print(f"CSV Header: {header}")
-            
-            # Now, we loop over the remaining rows in the file.
-            for row in csv_reader:
-                # Each `row` is a list of strings, e.g., ['January', '10000', '2000']
-                # We append the month to our list.
-                months.append(row[0])
-                
-                # IMPORTANT: Data from files is read as STRINGS. To do math or
-                # plot them as numbers, we MUST convert them.
-                # We use int() to convert the revenue and profit strings to integers.
-                revenues.append(int(row[1]))
-                profits.append(int(row[2]))
-
-        print("Successfully read and processed data.")
-        # print(f"Months: {months}")
-        # print(f"Revenues: {revenues}")
-        # print(f"Profits: {profits}")
+            if header is None or len(header) < 2:
+                raise ValueError("the file needs a header with a label column and a number column")
+
+            # Every column after the first (Revenue, Profit, ...) is a line
+            # on the chart. Instead of keeping every value in a list, which
+            # a huge file would not fit in, each line gets:
+            # - a `RunningStats`, which keeps its total, average, etc., and
+            # - a slot in the `PlotBuffer`, which keeps just enough points
+            #   to draw it (the lowest and highest of each stretch of rows).
+            series_names = header[1:]
+            stats = [RunningStats() for _ in series_names]
+            buffer = PlotBuffer(len(series_names), max_buckets=args.points)
+
+            # The rows come `--chunk-rows` at a time, with the numbers already
+            # converted. IMPORTANT: Data from files is read as STRINGS, so this
+            # conversion is a must before we can do math or plot them.
+            if args.loader == "rows":
+                # Row by row: `csv_reader` splits each row and every value
+                # becomes its own Python `int` (or `float`).
+                chunks = read_chunks(csv_reader, len(header), args.chunk_rows)
+            else:
+                # COLUMNAR: each number column is parsed straight into a typed
+                # array, much faster and in a fifth of the memory.
+                use_numpy = {"auto": None, "numpy": True, "array": False}[args.loader]
+                chunks = read_columns(csv_file, len(header), args.chunk_rows, use_numpy)
+            chunk_count = 0
+            for chunk in chunks:
+                chunk_count += 1
+                for column_stats, values in zip(stats, chunk.columns):
+                    column_stats.update(values)
+                buffer.add(chunk)
+                # After this, the chunk is forgotten, and its memory reused.
+
+        print(f"Successfully read and processed {buffer.rows:,} rows "
+              f"in {chunk_count} chunk(s).")
+        for name, column_stats in zip(series_names, stats):
+            if not column_stats.count:
+                continue # An empty file (just the header) has nothing to show.
+            print(f"  {name}: total {column_stats.total:,}, min {column_stats.minimum:,}, "
+                  f"max {column_stats.maximum:,}, mean {column_stats.mean:,.2f}, "
+                  f"std {column_stats.std:,.2f}")
 
     except FileNotFoundError:
         print(f"Error: The file '{file_path}' was not found.")
@@ -139,37 +196,59 @@ if __name__ == "__main__":
 
 
     # --- Part 3: Creating the Plot with Matplotlib ---
-    if months: # Only try to plot if we successfully loaded data.
+    if buffer.rows: # Only try to plot if we successfully loaded data.
         print("\n--- Generating plot with Matplotlib ---")
-        
+
         # Create a PLOT. The `plt.plot()` function is the most basic.
-        # It takes x-values (months) and y-values (revenues/profits).
-        plt.plot(months, revenues, label='Revenue', marker='o') # 'marker' adds dots
-        plt.plot(months, profits, label='Profit', marker='x')  # Plot a second line
-        
+        # It takes x-values (row numbers) and y-values (revenues/profits).
+        # Markers ('o' adds dots) only help when there are few points.
+        markers = ['o', 'x', 's', '^'] if buffer.exact and buffer.rows <= 100 else [None]
+
+        # DECIMATION: the chart is only a few hundred pixels wide, so each
+        # line is cut down to about `--per-pixel` points per pixel column
+        # before matplotlib draws it (see `plotter/decimate.py`). The peaks
+        # and dips are kept; only points nobody could see are dropped.
+        target = target_points(plt.gca(), args.per_pixel)
+        drawn = 0
+        for number, name in enumerate(series_names):
+            xs, ys = decimate(*buffer.points(number), args.decimate, target)
+            drawn = max(drawn, len(xs))
+            plt.plot(xs, ys, label=name, marker=markers[number % len(markers)])
+
         # Add labels and a title to make the chart understandable.
-        plt.title('Monthly Revenue and Profit')
-        plt.xlabel('Month')
+        title = f"{' and '.join(series_names)} by {header[0]}"
+        if drawn < buffer.rows:
+            title += f"\n({buffer.rows:,} rows; {drawn:,} points drawn per line)"
+        plt.title(title)
+        plt.xlabel(header[0])
         plt.ylabel('Amount (USD)')
-        
-        # `xticks` can be used to rotate labels if they overlap.
-        plt.xticks(rotation=45)
-        
+
+        # The x-values are row numbers; `xticks` puts the labels (months)
+        # under a few of them, and rotates them if they overlap.
+        positions, labels = buffer.ticks()
+        plt.xticks(positions, labels, rotation=45)
+
         # A LEGEND is a key that explains what each line represents.
         # It uses the `label` we provided in the `plot()` calls.
         plt.legend()
-        
+
         # A GRID can make the chart easier to read.
         plt.grid(True)
-        
+
         # Ensures all elements fit nicely within the figure window.
         plt.tight_layout()
-        
-        # `plt.show()` displays the plot in a new window. The script will
-        # pause here until you close that window.
-        plt.show()
-        
-        print("Plot window closed. Program finished.")
+
+        if args.save:
+            # `savefig` writes the chart to an image file instead; handy on a
+            # server, which has no screen to open a window on.
+            plt.savefig(args.save)
+            print(f"Chart saved to '{args.save}'. Program finished.")
+        else:
+            # `plt.show()` displays the plot in a new window. The script will
+            # pause here until you close that window.
+            plt.show()
+
+            print("Plot window closed. Program finished.")
 
 '''
 =====================================================================================
@@ -207,4 +286,26 @@ HOW TO RUN THIS CODE:
     `python 25_project_csv_data_plotter.py`
 5.  A new window should appear displaying your line chart. Close the window to
     end the program.
+
+PLOTTING HUGE FILES:
+
+This version never holds the whole file in memory, so a sales export of tens
+of gigabytes plots just as well as the twelve-row sample (see
+`plotter/stream.py`). The rows are read `--chunk-rows` at a time; the totals
+and averages are updated chunk by chunk; and only the lowest and highest value
+of each stretch of rows is kept for the chart, so every spike stays visible:
+`python 25_project_csv_data_plotter.py huge_sales.csv --chunk-rows 50000 --save chart.png`
+
+With NumPy installed (`pip install numpy`), each chunk's numbers are parsed
+in C straight into TYPED ARRAYS, one per column, with no Python object per
+value (see `plotter/columnar.py`). Whether a column holds whole numbers or
+decimals is inferred from the data. Without NumPy, the columns are still
+compact `array.array`s; `--loader rows` uses the original row-by-row loop.
+
+Finally, each line is DECIMATED to about two points per pixel column before
+it is drawn (see `plotter/decimate.py`): `--decimate minmax` keeps the lowest
+and highest point of every pixel column, `--decimate lttb` keeps the points
+that best preserve the line's shape, and `--decimate none` draws everything.
+`python 25_plotter_decimation_benchmark.py` compares their render times and
+how much each changes the picture.
 '''
\ No newline at end of file
@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+
+# This __init__.py file makes the 'plotter' directory a Python package.
+# It holds the helper modules used by `25_project_csv_data_plotter.py`, so the
+# lesson file can stay focused on reading the data and drawing the chart. For
+# example:
+# from plotter.stream import read_chunks
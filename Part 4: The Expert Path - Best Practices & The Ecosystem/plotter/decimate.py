@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 25: Project: CSV Data Plotter (Decimation Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module shrinks a long series to about as many points as the chart has
+pixels, before it is handed to matplotlib, while keeping its shape: its
+trends, its peaks and its dips. Two methods are offered: MIN/MAX per pixel
+column, and LTTB (Largest-Triangle-Three-Buckets).
+"""
+
+'''
+WHY DECIMATE?
+A chart 600 pixels wide cannot show more than a few points per pixel column.
+Give matplotlib a million points anyway, and it still has to transform and
+draw every one of them: seconds of work (minutes, with tens of millions) for
+a picture that looks the same as one drawn from a thousand well-chosen
+points. DECIMATION picks those points. The trick is choosing them so that
+the picture does NOT change; just taking every 1000th point would skip
+right over a one-day spike.
+
+METHOD 1: MIN/MAX PER PIXEL COLUMN ("minmax")
+Split the x axis into one BUCKET per pixel column and keep the lowest and
+highest point of each (in the order they occur). Within one pixel column, a
+line through all the points just draws a vertical stroke from the lowest to
+the highest, so these two points draw almost exactly the same picture. It is
+simple and fast, and it can never lose a peak.
+
+METHOD 2: LARGEST-TRIANGLE-THREE-BUCKETS ("lttb")
+Split the points into `target` buckets of equal size and keep ONE point per
+bucket: the one that makes the LARGEST TRIANGLE with the point kept from the
+bucket before and the average of the bucket after. A point far from the line
+between its neighbours (a peak, a dip, a corner) makes a big triangle, so it
+is the one kept. LTTB gives smoother, more natural-looking lines than
+min/max with the same number of points, but it can drop a sharp spike that
+shares a bucket with a bigger one.
+
+Both aim at about TWO points per pixel column of the chart, which is where
+the picture stops changing.
+
+NumPy, when installed, does the work for a whole bucket at once; a plain
+Python version gives the same points, more slowly.
+'''
+
+from bisect import bisect_left
+
+# NumPy is optional; without it, the same methods run in plain Python.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+METHODS = ("minmax", "lttb", "none")
+
+
+def target_points(axes, per_pixel=2.0):
+    """
+    Works out how many points a line needs on a set of matplotlib axes.
+
+    Args:
+        axes (matplotlib.axes.Axes): Where the line will be drawn.
+        per_pixel (float): Points per pixel column of the plot area.
+
+    Returns:
+        int: The number of points to keep (at least 3).
+    """
+    # The plot area's size on the figure, in pixels at the figure's DPI.
+    width = axes.get_window_extent().width
+    return max(3, int(width * per_pixel))
+
+
+def min_max(xs, ys, buckets):
+    """
+    Keeps the lowest and highest point of each of `buckets` equal slices of
+    the x axis.
+
+    Args:
+        xs (sequence): The x values, in increasing order.
+        ys (sequence): The y values.
+        buckets (int): How many slices (pixel columns) to use.
+
+    Returns:
+        tuple: (x values, y values) of at most 2 * `buckets` points.
+    """
+    if len(xs) <= 2 * buckets:
+        return xs, ys
+    first, last = xs[0], xs[-1]
+    # Where each slice starts: the first point at or after its left edge.
+    edges = [first + (last - first) * number / buckets for number in range(1, buckets)]
+    if np is not None:
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        bounds = [0, *np.searchsorted(xs, edges).tolist(), len(xs)]
+    else:
+        bounds = [0, *(bisect_left(xs, edge) for edge in edges), len(xs)]
+    keep = []
+    for start, stop in zip(bounds, bounds[1:]):
+        if start == stop:
+            continue  # No points fall in this pixel column.
+        piece = ys[start:stop]
+        if np is not None:
+            low, high = start + int(piece.argmin()), start + int(piece.argmax())
+        else:
+            low, high = start + piece.index(min(piece)), start + piece.index(max(piece))
+        keep += sorted({low, high})
+    return _pick(xs, ys, keep)
+
+
+def lttb(xs, ys, target):
+    """
+    Keeps `target` points with Largest-Triangle-Three-Buckets.
+
+    Args:
+        xs (sequence): The x values, in increasing order.
+        ys (sequence): The y values.
+        target (int): How many points to keep (at least 3).
+
+    Returns:
+        tuple: (x values, y values) of `target` points (or all of them, if
+               there are not more than that).
+    """
+    count = len(xs)
+    if target >= count or target < 3:
+        return xs, ys
+    if np is not None:
+        xs, ys = np.asarray(xs, dtype=float), np.asarray(ys, dtype=float)
+    # The first and last points are always kept; the others are split into
+    # `target - 2` buckets of (almost) equal size.
+    size = (count - 2) / (target - 2)
+    bounds = [int(number * size) + 1 for number in range(target - 1)]
+    bounds[-1] = count - 1
+    keep = [0]
+    previous = 0
+    for number in range(target - 2):
+        start, stop = bounds[number], bounds[number + 1]
+        # The third corner: the average of the NEXT bucket (or the last point).
+        if number + 2 < len(bounds):
+            following = slice(stop, bounds[number + 2])
+            after_x, after_y = _mean(xs[following]), _mean(ys[following])
+        else:
+            after_x, after_y = xs[-1], ys[-1]
+        x0, y0 = xs[previous], ys[previous]
+        # Twice the triangle's area, from the "cross product" formula; the
+        # constant factor does not change which point is the largest.
+        if np is not None:
+            areas = np.abs((x0 - after_x) * (ys[start:stop] - y0)
+                           - (x0 - xs[start:stop]) * (after_y - y0))
+            previous = start + int(areas.argmax())
+        else:
+            previous = max(range(start, stop),
+                           key=lambda i: abs((x0 - after_x) * (ys[i] - y0)
+                                             - (x0 - xs[i]) * (after_y - y0)))
+        keep.append(previous)
+    keep.append(count - 1)
+    return _pick(xs, ys, keep)
+
+
+def _mean(values):
+    return values.mean() if np is not None else sum(values) / len(values)
+
+
+def _pick(xs, ys, positions):
+    """Returns the points at `positions`."""
+    if np is not None:
+        positions = np.asarray(positions)
+        return np.asarray(xs)[positions], np.asarray(ys)[positions]
+    return [xs[i] for i in positions], [ys[i] for i in positions]
+
+
+def decimate(xs, ys, method="minmax", target=2000):
+    """
+    Shrinks a series to about `target` points with the chosen method.
+
+    Args:
+        xs (sequence): The x values, in increasing order.
+        ys (sequence): The y values.
+        method (str): "minmax", "lttb", or "none" (keep every point).
+        target (int): About how many points to keep.
+
+    Returns:
+        tuple: (x values, y values).
+    """
+    if method == "minmax":
+        # Two points per bucket, so half as many buckets as points.
+        return min_max(xs, ys, max(1, target // 2))
+    if method == "lttb":
+        return lttb(xs, ys, target)
+    if method == "none":
+        return xs, ys
+    raise ValueError(f"Unknown decimation method '{method}'. Choose from: {', '.join(METHODS)}.")
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the CSV data plotter.")
+    print("It is not meant to be run directly.")
+    print("Please run '25_project_csv_data_plotter.py' instead.")
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 25: Project: CSV Data Plotter (Streaming Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module lets the plotter handle CSV files far bigger than the computer's
+memory. `read_chunks()` reads the file a CHUNK of rows at a time;
+`RunningStats` keeps totals and averages up to date chunk by chunk; and
+`PlotBuffer` keeps a small, fixed-size summary of every series that still
+shows its peaks and dips when plotted.
+"""
+
+'''
+WHY NOT JUST READ EVERYTHING?
+The lesson's first version appends every row to Python lists. That is fine
+for twelve months of sales, but a list of a billion numbers needs tens of
+gigabytes, and a sales export can easily be that big. The program would
+slow to a crawl and then crash.
+
+STREAMING IN CHUNKS:
+Instead, we never hold more than `chunk_rows` rows at once. Each chunk is
+read, converted to numbers, handed to everything that needs it, and then
+forgotten. Memory use depends on the CHUNK SIZE, not on the file size, so a
+10 GB file needs no more memory than a 10 MB one; it just takes longer.
+
+INCREMENTAL AGGREGATES:
+Totals, minimums, maximums, averages and standard deviations can all be
+updated one chunk at a time: we only remember a few numbers per column, never
+the values themselves. (The average and standard deviation of two chunks can
+be COMBINED exactly from each chunk's own count, mean and spread.)
+
+A PLOT THAT FITS IN MEMORY:
+A chart is only a few thousand pixels wide, so it cannot show a billion
+points anyway. `PlotBuffer` splits the rows into at most `max_buckets`
+BUCKETS of consecutive rows and remembers only the SMALLEST and LARGEST value
+of each bucket (and where they were). Drawing those two points per bucket
+keeps every spike and every dip visible.
+
+But how big should a bucket be, when we do not know how many rows are coming?
+We start with buckets of ONE row. Whenever there are too many buckets, each
+pair of neighbours is merged into one (the smaller of the two minimums, the
+larger of the two maximums), so buckets double in size and their number
+halves. However long the file, the buffer never holds more than
+`max_buckets` buckets.
+'''
+
+import itertools
+from collections import namedtuple
+
+# One chunk of rows: `start` is the number of its first row (counting from
+# 0, header excluded), `labels` holds the first column (e.g. the month) and
+# `columns` one list of numbers per remaining column.
+Chunk = namedtuple("Chunk", ["start", "labels", "columns"])
+
+
+def to_number(text):
+    """Converts a CSV field to an int, or to a float if it is not a whole number."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _bad_row(rows, start, width):
+    """Finds the first row of a chunk that cannot be converted, and describes it."""
+    for offset, row in enumerate(rows):
+        try:
+            if len(row) < width:
+                raise IndexError(f"expected {width} columns, found {len(row)}")
+            for field in row[1:width]:
+                to_number(field)
+        except (ValueError, IndexError) as err:
+            return ValueError(f"data row {start + offset + 1} ({','.join(row)}): {err}")
+    return ValueError("a row could not be read")
+
+
+def read_chunks(reader, width, chunk_rows=100_000):
+    """
+    Reads the rest of a CSV file a chunk of rows at a time.
+
+    Args:
+        reader (csv.reader): The reader, already past the header row.
+        width (int): How many columns every row has (the header's length).
+        chunk_rows (int): The most rows in one chunk.
+
+    Yields:
+        Chunk: The next rows, with every column after the first converted to
+               numbers.
+
+    Raises:
+        ValueError: If a row is too short or a value is not a number.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be at least 1.")
+    start = 0
+    while True:
+        # `islice` takes the next `chunk_rows` rows; the file is read only as
+        # far as that.
+        lines = list(itertools.islice(reader, chunk_rows))
+        if not lines:
+            return
+        # Empty lines (often one at the very end) are skipped.
+        rows = [row for row in lines if row]
+        if not rows:
+            continue
+        try:
+            labels = [row[0] for row in rows]
+            columns = [[to_number(row[column]) for row in rows] for column in range(1, width)]
+        except (ValueError, IndexError):
+            raise _bad_row(rows, start, width) from None
+        yield Chunk(start, labels, columns)
+        start += len(rows)
+
+
+class RunningStats:
+    """
+    The count, total, minimum, maximum, mean and spread of a column, kept up
+    to date one chunk at a time.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.mean = 0.0
+        # The sum of squared differences from the mean (see `std`).
+        self._squares = 0.0
+
+    def update(self, values):
+        """Adds a chunk of values (a list, an `array.array` or a NumPy array)."""
+        count = len(values)
+        if not count:
+            return
+        if hasattr(values, "argmin"):
+            # A NumPy array (see `plotter/columnar.py`) does the sums itself,
+            # in C; `.item()` turns the results back into Python numbers.
+            low, high = values.min().item(), values.max().item()
+            if values.dtype.kind in "iu" and count * max(abs(low), abs(high)) >= 2 ** 63:
+                # A 64-bit integer sum this big would silently WRAP AROUND;
+                # summing as Python integers (slower) is always exact.
+                total = int(values.sum(dtype=object))
+            else:
+                total = values.sum().item()
+            mean = total / count
+            squares = ((values - mean) ** 2).sum().item()
+        else:
+            total = sum(values)
+            mean = total / count
+            squares = sum((value - mean) ** 2 for value in values)
+            low, high = min(values), max(values)
+        # Combine this chunk's mean and spread with everything before it
+        # (Chan's method), without looking at any earlier value again.
+        combined = self.count + count
+        delta = mean - self.mean
+        self._squares += squares + delta * delta * self.count * count / combined
+        self.mean += delta * count / combined
+        self.count = combined
+        self.total += total
+        self.minimum = low if self.minimum is None else min(self.minimum, low)
+        self.maximum = high if self.maximum is None else max(self.maximum, high)
+
+    @property
+    def std(self):
+        """The (population) standard deviation of all values so far."""
+        return (self._squares / self.count) ** 0.5 if self.count else 0.0
+
+
+def _extremes(values):
+    """
+    Finds the lowest and highest value of a piece of a column.
+
+    Returns:
+        tuple: (position of the lowest, lowest, position of the highest, highest).
+    """
+    if hasattr(values, "argmin"):
+        low_at, high_at = values.argmin().item(), values.argmax().item()
+        return low_at, values[low_at].item(), high_at, values[high_at].item()
+    # `min()`, `max()` and `index()` each run in C, over the piece.
+    low, high = min(values), max(values)
+    return values.index(low), low, values.index(high), high
+
+
+def _merge(first, second):
+    """Merges the (min position, min, max position, max) of two neighbouring buckets."""
+    # On a tie the earlier point wins, so merging never moves a point.
+    low = first if first[1] <= second[1] else second
+    high = first if first[3] >= second[3] else second
+    return (low[0], low[1], high[2], high[3])
+
+
+class PlotBuffer:
+    """
+    A fixed-size summary of one or more long series, for plotting: the lowest
+    and highest point of each bucket of consecutive rows.
+    """
+
+    def __init__(self, series=1, max_buckets=2000):
+        """
+        Args:
+            series (int): How many series (columns of numbers) to keep.
+            max_buckets (int): The most buckets to hold; every bucket gives
+                               at most two points to plot.
+        """
+        if max_buckets < 2:
+            raise ValueError("max_buckets must be at least 2.")
+        self.max_buckets = max_buckets
+        # How many rows each bucket covers; bucket `k` covers rows
+        # k * bucket_size to (k + 1) * bucket_size - 1.
+        self.bucket_size = 1
+        self.rows = 0
+        # The label (first column) of each bucket's first row.
+        self._labels = []
+        # For each series, one (min position, min, max position, max) per bucket.
+        self._extremes = [[] for _ in range(series)]
+
+    @property
+    def exact(self):
+        """True while every row is kept as it is (buckets of one row)."""
+        return self.bucket_size == 1
+
+    def add(self, chunk):
+        """Adds a chunk of rows (a `Chunk` from `read_chunks()`)."""
+        position = chunk.start
+        end = chunk.start + len(chunk.labels)
+        # Grow the buckets to the size this chunk will need anyway, rather
+        # than filling small buckets only to merge them again. (Halving
+        # earlier or later gives the same buckets.)
+        while -(-end // self.bucket_size) > self.max_buckets:  # Rounds up.
+            self._halve()
+        while position < end:
+            bucket = position // self.bucket_size
+            stop = min(end, (bucket + 1) * self.bucket_size)
+            self._add_piece(bucket, chunk, position - chunk.start, stop - chunk.start)
+            position = stop
+            if len(self._labels) > self.max_buckets:
+                self._halve()
+        self.rows = max(self.rows, end)
+
+    def _add_piece(self, bucket, chunk, first, stop):
+        """Adds rows `first` to `stop` of a chunk, which all fall in one bucket."""
+        is_new = bucket == len(self._labels)
+        offset = chunk.start
+        for extremes, column in zip(self._extremes, chunk.columns):
+            low_at, low, high_at, high = _extremes(column[first:stop])
+            entry = (offset + first + low_at, low, offset + first + high_at, high)
+            if is_new:
+                extremes.append(entry)
+            else:
+                # The bucket was started by the previous chunk.
+                extremes[-1] = _merge(extremes[-1], entry)
+        if is_new:
+            self._labels.append(chunk.labels[first])
+
+    def _halve(self):
+        """Merges every pair of neighbouring buckets, doubling the bucket size."""
+        for number, extremes in enumerate(self._extremes):
+            merged = [_merge(extremes[i], extremes[i + 1]) for i in range(0, len(extremes) - 1, 2)]
+            if len(extremes) % 2:
+                merged.append(extremes[-1])
+            self._extremes[number] = merged
+        self._labels = self._labels[::2]
+        self.bucket_size *= 2
+
+    def points(self, series=0):
+        """
+        Returns the points to draw for one series, in row order.
+
+        Returns:
+            tuple: (x values, y values): row numbers and their values, two
+                   per bucket (one if the lowest and highest are the same row).
+        """
+        xs, ys = [], []
+        for low_at, low, high_at, high in self._extremes[series]:
+            if low_at == high_at:
+                xs.append(low_at)
+                ys.append(low)
+            elif low_at < high_at:
+                xs += [low_at, high_at]
+                ys += [low, high]
+            else:
+                xs += [high_at, low_at]
+                ys += [high, low]
+        return xs, ys
+
+    def ticks(self, max_ticks=12):
+        """
+        Picks evenly spaced labels for the x axis.
+
+        Returns:
+            tuple: (row numbers, labels) of at most `max_ticks` ticks.
+        """
+        step = max(1, -(-len(self._labels) // max_ticks))  # Rounds up.
+        positions = [bucket * self.bucket_size for bucket in range(0, len(self._labels), step)]
+        return positions, self._labels[::step]
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the CSV data plotter.")
+    print("It is not meant to be run directly.")
+    print("Please run '25_project_csv_data_plotter.py' instead.")
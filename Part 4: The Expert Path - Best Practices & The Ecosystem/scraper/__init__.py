@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+# This __init__.py file makes the 'scraper' directory a Python package.
+# It holds the helper modules used by `22_project_web_scraper.py`, so the
+# lesson file can stay focused on fetching and parsing a page. For example:
+# from scraper.crawl import crawl
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Page Archive Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module keeps the raw HTML of every downloaded page in a compressed,
+append-only ARCHIVE file, modelled on the WARC format web archives use.
+A small index records where each page's record starts, so any page can be
+read back directly, and `22_scraper_reextract.py` can run a new extraction
+over the whole archive without downloading anything again.
+"""
+
+'''
+WHY KEEP THE RAW PAGES?
+Extraction code changes: a new field, a fixed bug, a new rule file. Without
+the raw pages, every change means crawling the whole site again, which is
+slow, and impolite to the site. With an ARCHIVE of what we downloaded, a
+change only costs re-PARSING, which our own CPUs do as fast as they can.
+
+THE FILE FORMAT:
+Each page is one RECORD: a few header lines (like an email or an HTTP
+message), a blank line, then the HTML:
+
+    WARC/1.1
+    WARC-Type: response
+    WARC-Target-URI: http://quotes.toscrape.com/page/2/
+    WARC-Date: 2026-10-19T12:00:00Z
+    WARC-Record-ID: <urn:uuid:...>
+    Content-Type: text/html; charset=utf-8
+    Content-Length: 11053
+
+    <!DOCTYPE html>...
+
+(A real WARC file stores the whole HTTP response; ours keeps just the body,
+which is all the scraper needs.)
+
+Every record is compressed ON ITS OWN, as a separate gzip "member", and
+appended to the file. Two nice properties follow:
+-   The whole file is still an ordinary gzip file (`zcat pages.warc.gz`
+    prints every record), because gzip allows members one after another.
+-   Any record can be read by itself: SEEK to where it starts and decompress
+    just that member. No need to decompress everything before it.
+
+THE OFFSET INDEX:
+A SQLite file next to the archive (`pages.warc.gz.idx`) maps each URL to the
+OFFSET (the position in bytes) and length of its record. It is committed
+every `commit_every` records, always AFTER the records themselves are safely
+on disk. If the program crashes in between, the next run finds records after
+the last indexed one, and indexes them (or cuts off a half-written one).
+
+APPEND-ONLY:
+Records are never changed or removed. A page crawled twice is stored twice,
+and the index says which copy is the latest.
+
+READING WHILE A CRAWL WRITES:
+Opening a `PageArchive` may cut off a half-written record, which is only
+right for the program that writes the archive. A reader, such as the
+re-extraction, uses `read_index()` instead: it opens the index READ-ONLY and
+lists the records committed so far, which are always complete on disk. It
+reads the list a CHUNK at a time, with a short query per chunk, so a huge
+index never has to fit in memory and the writer is never kept waiting for a
+long read to finish.
+'''
+
+import gzip
+import os
+import sqlite3
+import threading
+import uuid
+import zlib
+from datetime import datetime, timezone
+from urllib.request import pathname2url
+
+
+def _encode_record(url, html_content, fetched_at):
+    """Builds one compressed record."""
+    body = html_content.encode("utf-8")
+    header = (
+        "WARC/1.1\r\n"
+        "WARC-Type: response\r\n"
+        f"WARC-Target-URI: {url}\r\n"
+        f"WARC-Date: {fetched_at.strftime('%Y-%m-%dT%H:%M:%SZ')}\r\n"
+        f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+        "Content-Type: text/html; charset=utf-8\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        "\r\n"
+    ).encode("utf-8")
+    # `mtime=0` leaves the time out of the gzip header; the record has its own.
+    return gzip.compress(header + body + b"\r\n\r\n", compresslevel=6, mtime=0)
+
+
+def _decode_record(raw):
+    """
+    Splits an uncompressed record into its headers and its HTML.
+
+    Returns:
+        tuple: (headers dict, HTML string).
+    """
+    head, _, rest = raw.partition(b"\r\n\r\n")
+    headers = {}
+    for line in head.decode("utf-8").split("\r\n")[1:]:
+        name, _, value = line.partition(":")
+        headers[name.strip()] = value.strip()
+    length = int(headers["Content-Length"])
+    return headers, rest[:length].decode("utf-8")
+
+
+def _records_query(latest_only):
+    """The index query listing the records, in file order."""
+    if latest_only:
+        return ("SELECT offset, length, url FROM records WHERE offset IN"
+                " (SELECT MAX(offset) FROM records GROUP BY url) ORDER BY offset")
+    return "SELECT offset, length, url FROM records ORDER BY offset"
+
+
+def _chunk_query(latest_only):
+    """
+    The index query listing the next chunk of records, in file order.
+
+    Only records up to `:last` count, so that pages a crawl indexes while we
+    read are left out, and a page archived again meanwhile is still read.
+    """
+    query = "SELECT offset, length, url FROM records AS r WHERE offset > :after AND offset <= :last"
+    if latest_only:
+        # The newest copy is the one with no later copy of the same URL
+        # (the `url` index makes this a quick look-up).
+        query += (" AND NOT EXISTS (SELECT 1 FROM records WHERE url = r.url"
+                  " AND offset > r.offset AND offset <= :last)")
+    return query + " ORDER BY offset LIMIT :size"
+
+
+def read_index(path, latest_only=True, chunk_size=500):
+    """
+    Lists an archive's records, a chunk at a time, without opening it for
+    writing.
+
+    The index is opened (and checked) right away; the chunks are then read
+    one by one as the caller asks for them.
+
+    Args:
+        path (str): The archive file; its index is `path + ".idx"`.
+        latest_only (bool): Only the newest copy of each page.
+        chunk_size (int): The most records in one chunk.
+
+    Returns:
+        iterator: Lists of up to `chunk_size` (offset, length, url) tuples, by
+                  increasing offset. Only records indexed by the time of
+                  this call are listed.
+
+    Raises:
+        sqlite3.Error: If the index is missing or damaged (also while the
+                       chunks are read).
+    """
+    # Read-only mode needs a "file:" URI, with the path quoted like in a web
+    # address.
+    uri = f"file:{pathname2url(os.path.abspath(path + '.idx'))}?mode=ro"
+    connection = sqlite3.connect(uri, uri=True)
+    try:
+        last_offset = connection.execute("SELECT MAX(offset) FROM records").fetchone()[0]
+    except sqlite3.Error:
+        connection.close()
+        raise
+    return _read_chunks(connection, _chunk_query(latest_only), last_offset, max(chunk_size, 1))
+
+
+def _read_chunks(connection, query, last_offset, chunk_size):
+    """Yields the chunks for `read_index()`, and closes the index at the end."""
+    try:
+        after = -1
+        while last_offset is not None:
+            # Each chunk is its own short query, so no read transaction stays
+            # open (which would stop a running crawl from saving its index).
+            rows = connection.execute(
+                query, {"after": after, "last": last_offset, "size": chunk_size}).fetchall()
+            if not rows:
+                return
+            yield rows
+            after = rows[-1][0]
+    finally:
+        connection.close()
+
+
+def read_record(archive_file, offset, length):
+    """
+    Reads one record from an open archive file.
+
+    Args:
+        archive_file (file): The archive, opened in binary mode ("rb").
+        offset (int): Where the record starts (from the index).
+        length (int): Its compressed length in bytes (from the index).
+
+    Returns:
+        tuple: (URL, HTML string).
+    """
+    archive_file.seek(offset)
+    headers, html_content = _decode_record(gzip.decompress(archive_file.read(length)))
+    return headers["WARC-Target-URI"], html_content
+
+
+class PageArchive:
+    """
+    An append-only archive of pages with an index by URL.
+
+    Safe to use from many threads.
+    """
+
+    def __init__(self, path, commit_every=500):
+        """
+        Opens (or creates) an archive.
+
+        Args:
+            path (str): The archive file, e.g. "pages.warc.gz". The index is
+                        kept next to it, in `path + ".idx"`.
+            commit_every (int): Save the index after this many new records.
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self.commit_every = commit_every
+        # How many pages this run added.
+        self.added = 0
+        self._uncommitted = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._connection = sqlite3.connect(self.index_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                " offset INTEGER PRIMARY KEY, length INTEGER NOT NULL, url TEXT NOT NULL)"
+            )
+            self._connection.execute("CREATE INDEX IF NOT EXISTS records_url ON records (url)")
+        # Append mode ("a") always writes at the end of the file, wherever we
+        # last read; "+" also lets us read, which recovery needs.
+        self._file = open(path, mode="a+b")
+        self._recover()
+
+    def _recover(self):
+        """Indexes records written after the last index commit (see above)."""
+        offset = self._connection.execute(
+            "SELECT COALESCE(MAX(offset + length), 0) FROM records").fetchone()[0]
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        if size <= offset:
+            return
+        # Without an index at all, this reads the whole archive, so it goes
+        # in chunks rather than all at once.
+        self._file.seek(offset)
+        rows = []
+        decompressor, pieces, consumed, pending = zlib.decompressobj(wbits=31), [], 0, b""
+        while True:
+            chunk = pending or self._file.read(1 << 20)
+            pending = b""
+            if not chunk:
+                break
+            try:
+                pieces.append(decompressor.decompress(chunk))
+            except zlib.error:
+                break
+            if not decompressor.eof:
+                consumed += len(chunk)
+                continue
+            # `wbits=31` means "gzip format": the decompressor stops at the end
+            # of ONE member and keeps what follows in `unused_data`.
+            pending = decompressor.unused_data
+            length = consumed + len(chunk) - len(pending)
+            headers, _ = _decode_record(b"".join(pieces))
+            rows.append((offset, length, headers["WARC-Target-URI"]))
+            offset += length
+            decompressor, pieces, consumed = zlib.decompressobj(wbits=31), [], 0
+        with self._connection:
+            self._connection.executemany("INSERT INTO records VALUES (?, ?, ?)", rows)
+        if offset < size:
+            # The last record was cut off by the crash: drop it.
+            self._file.truncate(offset)
+
+    def append(self, url, html_content, fetched_at=None):
+        """
+        Adds a page to the end of the archive.
+
+        Args:
+            url (str): The page's URL.
+            html_content (str): Its HTML.
+            fetched_at (datetime): When it was downloaded (default: now).
+        """
+        # Compressing is the slow part, and needs no lock.
+        record = _encode_record(url, html_content, fetched_at or datetime.now(timezone.utc))
+        with self._lock:
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(record)
+            self._connection.execute("INSERT INTO records VALUES (?, ?, ?)",
+                                     (offset, len(record), url))
+            self.added += 1
+            self._uncommitted += 1
+            if self._uncommitted >= self.commit_every:
+                self._commit()
+
+    def _commit(self):
+        # The records go to the disk FIRST, so the index never points at a
+        # record that is not there.
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._connection.commit()
+        self._uncommitted = 0
+
+    def __contains__(self, url):
+        """Returns True if the archive holds (any version of) a page."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM records WHERE url = ? LIMIT 1", (url,)).fetchone() is not None
+
+    def records(self, latest_only=True):
+        """
+        Returns where the archived pages are, in file order.
+
+        Args:
+            latest_only (bool): Only the newest copy of each page.
+
+        Returns:
+            list: (offset, length, url) tuples, by increasing offset, so that
+                  reading them in order reads the file from start to end.
+        """
+        with self._lock:
+            return self._connection.execute(_records_query(latest_only)).fetchall()
+
+    def close(self):
+        """Saves the index and closes the archive."""
+        with self._lock:
+            self._commit()
+            self._file.close()
+            self._connection.close()
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --archive pages.warc.gz' instead.")
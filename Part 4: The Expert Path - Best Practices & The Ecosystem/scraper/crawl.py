@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Crawl Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module turns the single-page scraper into a CRAWLER: starting from one
+page, it follows the links each page points to ("Next" pages, tag pages),
+visiting many pages at the same time with a pool of threads. The URLs still
+to visit wait in a bounded FRONTIER, and every URL is visited at most once.
+"""
+
+'''
+WHAT IS A CRAWLER?
+A CRAWLER (or "spider") visits a page, finds the links on it, and then visits
+those pages too, and so on. Two data structures do the bookkeeping:
+-   The FRONTIER: the queue of URLs we know about but have not visited yet.
+-   The SEEN SET: every URL ever added to the frontier, so that a page linked
+    from ten other pages is still only fetched once.
+
+WHY A BOUNDED FRONTIER?
+On a large site, every page can link to dozens of new ones, so the frontier
+can grow much faster than we empty it. Giving it a MAXIMUM SIZE keeps the
+crawler's memory use under control. When it is full, new links are turned
+away (and counted), rather than growing the queue forever.
+
+WHY THREADS?
+Downloading a page takes a fraction of a second, and almost all of it is
+spent WAITING for the server. A sequential loop waits for each page in turn.
+With a THREAD POOL, up to `workers` pages are downloading at the same time,
+so their waiting overlaps instead of adding up (the same idea as the weather
+app's batch mode).
+
+Only the main thread touches the frontier and the seen set. Worker threads
+just fetch and parse one page each and hand back what they found, so no
+locks are needed.
+'''
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+import requests
+
+# The errors that fail ONE page without stopping the crawl: it could not be
+# downloaded, robots.txt does not allow it, or it could not be parsed. Any
+# other error is a bug or a broken disk, and should stop the program.
+PAGE_ERRORS = (requests.exceptions.RequestException, ValueError)
+
+
+def absolute_url(base_url, href):
+    """
+    Turns a link found on a page into a full URL without a "#fragment".
+
+    Args:
+        base_url (str): The URL of the page the link was found on.
+        href (str): The link, e.g. "/page/2/" or "https://example.com/a#top".
+
+    Returns:
+        str: The absolute URL, e.g. "http://quotes.toscrape.com/page/2/".
+    """
+    # `urljoin` resolves relative links; `urldefrag` drops "#top", which
+    # points into the same page and would otherwise look like a new URL.
+    return urldefrag(urljoin(base_url, href))[0]
+
+
+def same_host(url, other_url):
+    """Returns True if both URLs point at the same host (and port)."""
+    return urlsplit(url).netloc.lower() == urlsplit(other_url).netloc.lower()
+
+
+class Frontier:
+    """
+    A bounded first-in, first-out queue of URLs that remembers every URL it
+    has ever accepted.
+    """
+
+    def __init__(self, max_size=10000):
+        """
+        Args:
+            max_size (int): The most URLs that may wait in the queue at once.
+        """
+        self.max_size = max_size
+        self._queue = deque()
+        self._seen = set()
+        # How many new URLs were turned away because the queue was full.
+        self.dropped = 0
+
+    def add(self, url):
+        """
+        Queues a URL, unless it has been seen before or the queue is full.
+
+        Returns:
+            bool: True if the URL was queued.
+        """
+        if url in self._seen:
+            return False
+        if len(self._queue) >= self.max_size:
+            # We do NOT mark it as seen, so if another page links to it once
+            # there is room again, it can still be queued.
+            self.dropped += 1
+            return False
+        self._seen.add(url)
+        self._queue.append(url)
+        return True
+
+    def pop(self):
+        """Removes and returns the oldest queued URL."""
+        return self._queue.popleft()
+
+    def done(self, url):
+        """
+        Called by the crawl when a popped URL has been visited.
+
+        The in-memory frontier has nothing to do here; a persistent one
+        (see `state.py`) uses it to record progress.
+        """
+
+    def failed(self, url):
+        """
+        Called by the crawl when visiting a popped URL failed.
+
+        The in-memory frontier gives the page up at once; a persistent one
+        (see `state.py`) queues it again, up to a number of attempts.
+
+        Returns:
+            bool: True if the URL will be tried again.
+        """
+        return False
+
+    def seen_count(self):
+        """Returns how many distinct URLs have ever been queued."""
+        return len(self._seen)
+
+    def __len__(self):
+        return len(self._queue)
+
+
+def crawl(start_urls, visit, workers=8, max_pages=None, frontier=None):
+    """
+    Crawls pages concurrently, starting from `start_urls`.
+
+    Results are yielded as soon as each page finishes, so the caller can
+    process them while other pages are still downloading.
+
+    Args:
+        start_urls (list): The URLs to start from.
+        visit (function): Called as `visit(url)` in a worker thread. Fetches
+                          and parses one page and returns `(result, links)`,
+                          where `links` are the absolute URLs to crawl next.
+        workers (int): The most pages being visited at the same time.
+        max_pages (int): Stop after visiting this many pages (None: no limit).
+        frontier (Frontier): The frontier to use (default: a new one).
+
+    Yields:
+        tuple: (url, result, error). Exactly one of `result` and `error` is
+               None; `error` is one of `PAGE_ERRORS`.
+    """
+    frontier = Frontier() if frontier is None else frontier
+    for url in start_urls:
+        frontier.add(url)
+
+    started = 0
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Maps each running "future" back to the URL it is visiting.
+        pending = {}
+        while True:
+            # Keep every worker busy, as long as there is something to do.
+            while frontier and len(pending) < workers and (max_pages is None or started < max_pages):
+                url = frontier.pop()
+                pending[executor.submit(visit, url)] = url
+                started += 1
+
+            if not pending:
+                break  # Nothing running and nothing more to start: done.
+
+            # Sleep until at least one page finishes.
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    result, links = future.result()
+                except PAGE_ERRORS as err:
+                    frontier.failed(url)
+                    yield url, None, err
+                    continue
+                for link in links:
+                    frontier.add(link)
+                frontier.done(url)
+                yield url, result, None
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py' instead.")
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Near-Duplicate Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module finds NEAR-DUPLICATE quotes: the same quote scraped twice with a
+different apostrophe, an extra space or a missing word. `NearDuplicateFilter`
+turns each text into a short MinHash SIGNATURE and files it into LSH BUCKETS,
+so that checking a new quote only compares it with the few quotes that
+already look alike, never with all of them.
+"""
+
+'''
+WHY EXACT MATCHING IS NOT ENOUGH:
+The scraper spots duplicates by fingerprinting the exact text. But the same
+quote copied onto another page (or another site) often differs a little:
+"It's" and "It’s", a double space, a trailing full stop. Those fingerprints
+differ, so the "duplicate" is kept. Comparing every new quote with every
+quote so far would catch them, but with a million quotes that is a million
+comparisons for EACH new one.
+
+STEP 1: NORMALIZE AND SHINGLE.
+The text is lowercased, punctuation is removed and runs of spaces become one
+space, so purely cosmetic differences vanish. It is then cut into SHINGLES:
+every run of `shingle_size` characters ("the q", "he qu", "e qui", ...).
+Two texts are similar if they share most of their shingles. The JACCARD
+SIMILARITY measures this: shared shingles / all distinct shingles, from 0.0
+(nothing in common) to 1.0 (the same set).
+
+STEP 2: MINHASH.
+A set of shingles is big. MINHASH shrinks it to a SIGNATURE of `num_perm`
+numbers: for each of `num_perm` different hash functions, hash every shingle
+and keep only the SMALLEST value. The key fact: for two sets, the chance that
+they have the same minimum for one hash function EQUALS their Jaccard
+similarity. So the fraction of positions where two signatures agree is an
+estimate of how similar the texts are, and a signature is always the same
+small size, whatever the length of the text.
+
+STEP 3: LSH BANDING.
+Comparing signatures is cheap, but comparing with every stored one is still
+too many comparisons. LOCALITY-SENSITIVE HASHING cuts the signature into
+`bands` bands of a few numbers each, and files the quote in one BUCKET per
+band, keyed by that band's numbers. Two similar texts very probably agree on
+at least one whole band, so they meet in some bucket; two different texts
+almost never do. A new quote is only compared with the quotes in its own
+buckets: a handful, however many quotes we have stored.
+
+The number of bands sets who meets: with `b` bands of `r` numbers, texts
+start to meet at a similarity of about (1/b) ** (1/r). We choose that well
+below `threshold` (so near-duplicates are very rarely missed), and then check
+each candidate's whole signature against `threshold`.
+
+NUMPY (OPTIONAL):
+Computing a signature takes `num_perm` hashes of every shingle. If NumPy is
+installed, they are all computed at once in one array operation; otherwise a
+plain Python loop gives exactly the same signature, more slowly.
+'''
+
+import hashlib
+import json
+import unicodedata
+import zlib
+from array import array
+from random import Random
+
+# NumPy is optional; without it, signatures are computed in plain Python.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# The hash functions are h(x) = (a * x + b) % PRIME, with a different (a, b)
+# for each one. A prime just below 2**31 keeps a * x (x is a 32-bit shingle
+# hash) below 2**63, so NumPy's 64-bit integers never overflow.
+PRIME = (1 << 31) - 1
+
+
+def item_key(item):
+    """
+    Returns the text that decides whether two scraped items are the same: the
+    quote text. (Items from a rule file without a "text" field use all their
+    fields.)
+    """
+    return str(item["text"]) if "text" in item else json.dumps(item, sort_keys=True)
+
+
+def fingerprint(item):
+    """Returns a short fingerprint of an item, used to spot exact duplicates."""
+    # A 16-byte DIGEST takes far less memory than the item itself.
+    return hashlib.blake2b(item_key(item).encode("utf-8"), digest_size=16).digest()
+
+
+def normalize(text):
+    """Lowercases text, drops its punctuation and collapses its whitespace."""
+    # `unicodedata.category()` names what kind of character this is; every
+    # punctuation category starts with "P" (quotes, dashes, full stops...).
+    kept = "".join(char for char in text.lower()
+                   if not unicodedata.category(char).startswith("P"))
+    return " ".join(kept.split())
+
+
+def shingles(text, size=5):
+    """
+    Returns the set of `size`-character pieces of an (already normalized) text.
+
+    A text shorter than `size` is a single shingle.
+    """
+    if len(text) <= size:
+        return {text}
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+class NearDuplicateFilter:
+    """
+    Remembers texts, and recognizes new ones that are near-duplicates of a
+    text it already holds.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=64, bands=16, shingle_size=5, seed=1):
+        """
+        Args:
+            threshold (float): The estimated Jaccard similarity from which two
+                               texts count as duplicates (0.0 to 1.0).
+            num_perm (int): The signature length. Longer is more accurate,
+                            and slower.
+            bands (int): How many LSH bands the signature is cut into; it
+                         must divide `num_perm`.
+            shingle_size (int): The length of a shingle, in characters.
+            seed (int): Picks the hash functions. Signatures are only
+                        comparable between filters with the same seed.
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be above 0 and at most 1.")
+        if bands < 1 or num_perm % bands:
+            raise ValueError("bands must divide num_perm.")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        randomizer = Random(seed)
+        self._a = [randomizer.randrange(1, PRIME) for _ in range(num_perm)]
+        self._b = [randomizer.randrange(0, PRIME) for _ in range(num_perm)]
+        if np is not None:
+            # Shaped as a column, so that `a * x` makes one row per hash function.
+            self._a_column = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_column = np.array(self._b, dtype=np.uint64)[:, None]
+        # Every signature, one after another, as compact 4-byte numbers:
+        # text number `i` owns positions i * num_perm to (i + 1) * num_perm.
+        self._signatures = array("I")
+        # One dict per band: the band's bytes -> the numbers of the texts in it.
+        self._buckets = [{} for _ in range(bands)]
+
+    def signature(self, text):
+        """
+        Returns the MinHash signature of a text.
+
+        Returns:
+            array: `num_perm` numbers.
+        """
+        # `crc32` turns each shingle into a 32-bit number, quickly and in C.
+        hashes = [zlib.crc32(shingle.encode("utf-8"))
+                  for shingle in shingles(normalize(text), self.shingle_size)]
+        if np is not None:
+            values = np.array(hashes, dtype=np.uint64)
+            # One row per hash function, one column per shingle; the smallest
+            # value of each row is one number of the signature.
+            table = (self._a_column * values + self._b_column) % PRIME
+            return array("I", table.min(axis=1).astype(np.uint32).tobytes())
+        return array("I", (min((a * value + b) % PRIME for value in hashes)
+                           for a, b in zip(self._a, self._b)))
+
+    def _band_keys(self, signature):
+        """Yields (band number, bucket key) for each band of a signature."""
+        raw = signature.tobytes()
+        width = self.rows * signature.itemsize
+        for band in range(self.bands):
+            yield band, raw[band * width:(band + 1) * width]
+
+    def similarity(self, signature, other):
+        """Estimates the Jaccard similarity of two texts from their signatures."""
+        return sum(1 for x, y in zip(signature, other) if x == y) / self.num_perm
+
+    def _stored(self, number):
+        start = number * self.num_perm
+        return self._signatures[start:start + self.num_perm]
+
+    def find(self, text):
+        """
+        Looks for a near-duplicate of `text` among the stored texts.
+
+        Returns:
+            tuple: (number, signature): the number of the first stored text
+                   that is a near-duplicate (None if there is none), and the
+                   signature of `text`.
+        """
+        signature = self.signature(text)
+        checked = set()
+        for band, key in self._band_keys(signature):
+            for number in self._buckets[band].get(key, ()):
+                # A similar text usually shares several bands; check it once.
+                if number in checked:
+                    continue
+                checked.add(number)
+                if self.similarity(signature, self._stored(number)) >= self.threshold:
+                    return number, signature
+        return None, signature
+
+    def add(self, text):
+        """
+        Stores a text, unless a near-duplicate of it is already stored.
+
+        Returns:
+            bool: True if the text was new (and is now stored).
+        """
+        duplicate, signature = self.find(text)
+        if duplicate is not None:
+            return False
+        number = len(self)
+        self._signatures.extend(signature)
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(number)
+        return True
+
+    def __len__(self):
+        """Returns how many texts are stored."""
+        return len(self._signatures) // self.num_perm
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --near-duplicates' instead.")
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Fixtures Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `FixtureSite`, a made-up quotes website with the same
+HTML layout as quotes.toscrape.com but as many pages as we like. Every page is
+generated on demand from a seed, so the same settings always produce exactly
+the same site. Benchmarks and offline tests use it instead of the real site.
+"""
+
+'''
+WHY A FAKE SITE?
+quotes.toscrape.com has about 10 pages, which is far too few to measure how
+fast a parser or a crawler is, and benchmarking against someone else's
+server is both unreliable (the network adds noise) and impolite.
+
+`FixtureSite` fakes the site instead:
+-   Main pages `/`, `/page/2/`, ... each list `quotes_per_page` quotes.
+-   Every quote has one to four tags, and each tag has its own paginated
+    listing at `/tag/<name>/`, `/tag/<name>/page/2/`, ...
+-   Quote texts, authors and tags are produced by a `random.Random` seeded
+    from the quote's number, so page 5000 can be rendered without rendering
+    pages 1 to 4999 first, and every run sees the same content.
+'''
+
+import html
+import random
+
+WORDS = (
+    "the world as we have created it is a process of our thinking it cannot be changed "
+    "without changing life love truth humor books friends time dream hope fear mind "
+    "heart simple reading happiness success failure courage change choose wisdom people "
+    "nothing everything always never believe imagine future moment learn live laugh "
+    "remember beautiful alone kind honest strong stranger silence music wonder light"
+).split()
+
+FIRST_NAMES = ("Albert", "Jane", "Marilyn", "Mark", "Andre", "Thomas", "Eleanor",
+               "Steve", "Charles", "Harper", "Ralph", "Dr.", "George", "Emily",
+               "Ernest", "Helen", "Madeleine", "Pablo", "Bob", "Maya")
+LAST_NAMES = ("Einstein", "Austen", "Monroe", "Twain", "Gide", "Edison", "Roosevelt",
+              "Martin", "Dickens", "Lee", "Emerson", "Seuss", "Eliot", "Dickinson",
+              "Hemingway", "Keller", "L'Engle", "Neruda", "Marley", "Angelou")
+
+TAGS = ("love", "inspirational", "life", "humor", "books", "reading", "friendship",
+        "friends", "truth", "simile", "change", "deep-thoughts", "thinking", "world",
+        "abilities", "choices", "aliteracy", "adulthood", "be-yourself", "miracles")
+
+
+class FixtureSite:
+    """
+    A generated quotes.toscrape.com look-alike.
+    """
+
+    def __init__(self, pages=100, quotes_per_page=10, authors=50, seed=0):
+        """
+        Args:
+            pages (int): The number of main listing pages.
+            quotes_per_page (int): Quotes shown on each listing page.
+            authors (int): The number of distinct authors.
+            seed (int): Changes every quote, author and tag.
+        """
+        self.pages = pages
+        self.quotes_per_page = quotes_per_page
+        self.seed = seed
+        rng = random.Random(seed)
+        self.authors = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}" for _ in range(authors)]
+        # The quote numbers listed under each tag, built on first use.
+        self._tag_index = None
+
+    def quote_count(self):
+        """Returns the total number of quotes on the main pages."""
+        return self.pages * self.quotes_per_page
+
+    def quote(self, number):
+        """
+        Returns quote `number` as a dictionary with "text", "author" and "tags".
+        """
+        rng = random.Random(f"{self.seed}:{number}")
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 30))]
+        words[0] = words[0].capitalize()
+        tags = sorted(rng.sample(TAGS, rng.randint(1, 4)))
+        return {"text": f"“{' '.join(words)}.”",
+                "author": rng.choice(self.authors), "tags": tags}
+
+    def tag_index(self):
+        """Returns {tag: [quote numbers]} for every tag in use."""
+        if self._tag_index is None:
+            index = {}
+            for number in range(self.quote_count()):
+                for tag in self.quote(number)["tags"]:
+                    index.setdefault(tag, []).append(number)
+            self._tag_index = index
+        return self._tag_index
+
+    def tag_pages(self, tag):
+        """Returns how many listing pages a tag has."""
+        count = len(self.tag_index().get(tag, ()))
+        return -(-count // self.quotes_per_page)  # Rounds UP.
+
+    def paths(self):
+        """Yields the path of every page on the site, main pages first."""
+        for page in range(1, self.pages + 1):
+            yield "/" if page == 1 else f"/page/{page}/"
+        for tag in sorted(self.tag_index()):
+            for page in range(1, self.tag_pages(tag) + 1):
+                yield f"/tag/{tag}/" if page == 1 else f"/tag/{tag}/page/{page}/"
+
+    def render(self, path):
+        """
+        Renders the page at `path`.
+
+        Args:
+            path (str): e.g. "/", "/page/3/", "/tag/love/page/2/".
+
+        Returns:
+            str: The page's HTML, or None if the site has no such page.
+        """
+        parts = [part for part in path.split("?")[0].split("/") if part]
+        tag = None
+        if len(parts) >= 2 and parts[0] == "tag":
+            tag, parts = parts[1], parts[2:]
+        if parts and (len(parts) != 2 or parts[0] != "page" or not parts[1].isdigit()):
+            return None
+        page = int(parts[1]) if parts else 1
+
+        if tag is None:
+            last_page = self.pages
+            first = (page - 1) * self.quotes_per_page
+            numbers = range(first, min(first + self.quotes_per_page, self.quote_count()))
+            prefix = ""
+        else:
+            last_page = self.tag_pages(tag)
+            first = (page - 1) * self.quotes_per_page
+            numbers = self.tag_index().get(tag, [])[first:first + self.quotes_per_page]
+            prefix = f"/tag/{tag}"
+        if not 1 <= page <= last_page:
+            return None
+        return self._render_listing([self.quote(number) for number in numbers],
+                                    page, last_page, prefix)
+
+    def _render_listing(self, quotes, page, last_page, prefix):
+        """Builds the HTML of one listing page, laid out like the real site."""
+        out = ['<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+               '<title>Quotes to Scrape</title>\n'
+               '<link rel="stylesheet" href="/static/bootstrap.min.css">\n'
+               '<link rel="stylesheet" href="/static/main.css">\n</head>\n<body>\n'
+               '<div class="container">\n<div class="row header-box">\n'
+               '<div class="col-md-8"><h1><a href="/" style="text-decoration: none">'
+               'Quotes to Scrape</a></h1></div>\n'
+               '<div class="col-md-4"><p><a href="/login">Login</a></p></div>\n</div>\n'
+               '<div class="row">\n<div class="col-md-8">\n']
+        for quote in quotes:
+            author = html.escape(quote["author"])
+            slug = quote["author"].replace(" ", "-").replace(".", "").replace("'", "")
+            out.append(
+                '<div class="quote" itemscope itemtype="http://schema.org/CreativeWork">\n'
+                f'    <span class="text" itemprop="text">{html.escape(quote["text"])}</span>\n'
+                f'    <span>by <small class="author" itemprop="author">{author}</small>\n'
+                f'    <a href="/author/{slug}">(about)</a>\n    </span>\n'
+                '    <div class="tags">\n        Tags:\n'
+                f'        <meta class="keywords" itemprop="keywords" content="{",".join(quote["tags"])}" />\n'
+            )
+            for tag in quote["tags"]:
+                out.append(f'        <a class="tag" href="/tag/{tag}/page/1/">{tag}</a>\n')
+            out.append('    </div>\n</div>\n')
+
+        out.append('<nav>\n<ul class="pager">\n')
+        if page > 1:
+            out.append(f'<li class="previous"><a href="{prefix}/page/{page - 1}/">'
+                       '<span aria-hidden="true">&larr;</span> Previous</a></li>\n')
+        if page < last_page:
+            out.append(f'<li class="next"><a href="{prefix}/page/{page + 1}/">'
+                       'Next <span aria-hidden="true">&rarr;</span></a></li>\n')
+        out.append('</ul>\n</nav>\n</div>\n<div class="col-md-4 tags-box">\n<h2>Top Ten tags</h2>\n')
+        for size, tag in enumerate(TAGS[:10]):
+            out.append(f'<span class="tag-item"><a class="tag" style="font-size: {28 - 2 * size}px" '
+                       f'href="/tag/{tag}/">{tag}</a></span>\n')
+        out.append('</div>\n</div>\n</div>\n<footer class="footer">\n<div class="container">\n'
+                   '<p class="text-muted">Quotes by: <a href="https://www.goodreads.com/quotes">'
+                   'GoodReads.com</a></p>\n</div>\n</footer>\n</body>\n</html>\n')
+        return "".join(out)
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_scraper_parser_benchmark.py' instead.")
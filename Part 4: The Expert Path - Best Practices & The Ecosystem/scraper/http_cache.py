@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Page Cache Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `PageCache`, an on-disk cache of crawled pages, keyed by
+URL. It keeps each page's compressed HTML, its validators (ETag and
+Last-Modified), and what we extracted from it, so that a re-crawl can ask the
+server "has this page changed?" and skip both the download and the parsing
+when the answer is no.
+"""
+
+'''
+CONDITIONAL REQUESTS (again):
+The weather app already uses them (see `weather_app/report.py`): when a server
+labels a page with an `ETag` or `Last-Modified` header, we can send those
+values back next time as `If-None-Match` / `If-Modified-Since`. If the page
+has not changed, the server answers "304 Not Modified" with an EMPTY body.
+
+For a daily re-crawl where most pages have not changed, that saves:
+1.  The DOWNLOAD: a 304 is a few hundred bytes instead of the whole page.
+2.  The PARSING: we also stored what we extracted from the page last time
+    (the quotes and the links), so we can reuse it as it is.
+
+The stored extraction is only reused if it was produced the same way: each
+result is saved with a RESULT KEY describing how it was extracted (e.g. which
+rule file). Changing the extraction changes the key, and the page is parsed
+again from the cached HTML.
+
+COMPRESSION:
+HTML compresses very well (often to a fifth of its size or less), so bodies
+and results are stored compressed with `zlib`, from the standard library.
+
+Like the weather app's response cache, everything lives in one SQLite file.
+'''
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class PageCache:
+    """
+    A persistent cache of pages, their validators and their extracted data.
+    """
+
+    def __init__(self, path):
+        """
+        Opens (or creates) the cache database.
+
+        Args:
+            path (str): The path of the SQLite database file.
+        """
+        self.path = path
+        # How many pages were confirmed unchanged (304) or downloaded (200).
+        self.stats = {"unchanged": 0, "downloaded": 0}
+
+        # Pages are fetched by many threads at once, so one lock guards the
+        # shared connection.
+        self._lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        # WRITE-AHEAD LOGGING makes the many small writes of a crawl much
+        # cheaper, and "NORMAL" syncing is safe in this mode.
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " body BLOB NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " result_key TEXT,"
+                " result BLOB)"
+            )
+
+    def conditional_headers(self, url):
+        """
+        Builds the `If-None-Match`/`If-Modified-Since` headers for a URL.
+
+        Returns:
+            dict: The headers; empty if we have never stored the page.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        headers = {}
+        if row is not None:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def body(self, url):
+        """Returns the stored HTML of a page, or None."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        return None if row is None else zlib.decompress(row[0]).decode("utf-8")
+
+    def result(self, url, result_key):
+        """
+        Returns the stored extraction of a page, if it was made with `result_key`.
+
+        Returns:
+            tuple: (items, links), or None.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT result FROM pages WHERE url = ? AND result_key = ?", (url, result_key)
+            ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        items, links = json.loads(zlib.decompress(row[0]))
+        return items, links
+
+    def store(self, url, etag, last_modified, html_content):
+        """
+        Saves a freshly downloaded page.
+
+        Pages without validators are not stored, since we could never ask the
+        server whether they changed. Any stored extraction is dropped, because
+        it belongs to the old version of the page.
+        """
+        with self._lock:
+            self.stats["downloaded"] += 1
+            if not etag and not last_modified:
+                return
+            with self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, NULL, NULL)",
+                    (url, etag, last_modified,
+                     zlib.compress(html_content.encode("utf-8")), time.time()),
+                )
+
+    def store_result(self, url, result_key, items, links):
+        """Saves what was extracted from the stored version of a page."""
+        result = zlib.compress(json.dumps([items, links], ensure_ascii=False).encode("utf-8"))
+        with self._lock, self._connection:
+            # Only pages we stored can have a result; for others, this is a no-op.
+            self._connection.execute(
+                "UPDATE pages SET result_key = ?, result = ? WHERE url = ?",
+                (result_key, result, url),
+            )
+
+    def mark_unchanged(self, url):
+        """Records that the server confirmed a page has not changed."""
+        with self._lock, self._connection:
+            self.stats["unchanged"] += 1
+            self._connection.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url)
+            )
+
+    def close(self):
+        """Closes the database."""
+        with self._lock:
+            self._connection.close()
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py' instead.")
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Quote Index Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module builds a searchable INVERTED INDEX of the scraped quotes, stored
+in a SQLite file. `IndexSink` is an output sink (see `sinks.py`) that files
+every quote under its author, its tags and the words of its text, and
+`QuoteIndex` answers questions such as "quotes by Albert Einstein tagged both
+'life' and 'love'" by intersecting sorted lists of quote numbers.
+"""
+
+'''
+WHAT IS AN INVERTED INDEX?
+The index at the back of a book "inverts" the book: instead of pages listing
+their words, words list their pages. Ours lists, for every author, tag and
+word, the numbers (IDs) of the quotes that have it:
+
+    ("tag", "love")        -> [3, 17, 52, 80, ...]
+    ("author", "mark twain") -> [17, 19, 80, ...]
+
+Each list is a POSTING LIST, and it is kept SORTED. Finding every quote by an
+author is then one lookup instead of reading every quote.
+
+INTERSECTING SORTED LISTS:
+"Tagged love AND by Mark Twain" means the quotes in BOTH lists. Because the
+lists are sorted, we take the SHORTEST list and look up each of its numbers
+in the others with a BINARY SEARCH (`bisect`), which needs only about 20
+steps even in a list of a million numbers. Since the numbers come out in
+order, each search can also start where the previous one stopped. The work
+grows with the shortest list, not the longest, and with `limit` we stop as
+soon as we have enough results.
+
+STORAGE:
+Posting lists are stored as packed 4-byte numbers (`array("I")`): compact on
+disk, and turned back into an array in one fast step, with no per-number
+Python work.
+
+Quotes are numbered in the order they are found, so new numbers are always
+larger than old ones. While crawling, new postings are collected in memory
+and written out every `segment_size` quotes as a new SEGMENT. A term's full
+list is its segments read in order, one after another, which is already
+sorted. This keeps memory use bounded however big the index grows.
+
+Many segments mean many rows per lookup, so they are MERGED into one row per
+term, but not every time: rewriting a long list to add a few numbers to it
+costs far more than it saves. When the index is closed, only the terms with
+more than `merge_above` segments are merged. `compact_index()` (the query
+script's `--compact`) merges every term, for an index that is finished.
+'''
+
+import bisect
+import json
+import os
+import sqlite3
+import sys
+from array import array
+from urllib.request import pathname2url
+
+from scraper.dedupe import normalize
+from scraper.sinks import _BatchedSink
+
+# The fields a quote is indexed under.
+FIELDS = ("author", "tag", "word")
+
+
+def _to_bytes(ids):
+    """Packs a posting list, always little-endian, so index files are portable."""
+    if sys.byteorder != "little":
+        ids = array("I", ids)
+        ids.byteswap()
+    return ids.tobytes()
+
+
+def _from_bytes(raw):
+    ids = array("I", raw)
+    if sys.byteorder != "little":
+        ids.byteswap()
+    return ids
+
+
+def index_terms(quote):
+    """
+    Returns the (field, term) pairs a quote is filed under.
+
+    Authors, tags and words are normalized (see `dedupe.normalize()`), so a
+    search does not depend on capital letters or punctuation.
+    """
+    terms = set()
+    if quote.get("author"):
+        terms.add(("author", normalize(str(quote["author"]))))
+    tags = quote.get("tags") or []
+    for tag in tags if isinstance(tags, list) else [tags]:
+        terms.add(("tag", normalize(str(tag))))
+    if quote.get("text"):
+        terms.update(("word", word) for word in normalize(str(quote["text"])).split())
+    terms.discard(("author", ""))
+    terms.discard(("tag", ""))
+    return terms
+
+
+def _create_tables(connection):
+    with connection:
+        connection.execute("CREATE TABLE IF NOT EXISTS quotes (id INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+        # One row per term per segment; the primary key keeps every row of a
+        # term together, in segment order.
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS postings ("
+            " field TEXT NOT NULL, term TEXT NOT NULL, segment INTEGER NOT NULL, ids BLOB NOT NULL,"
+            " PRIMARY KEY (field, term, segment)) WITHOUT ROWID"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+        )
+        # The highest quote ID whose postings have been written.
+        connection.execute("INSERT OR IGNORE INTO meta VALUES ('indexed', 0)")
+
+
+class IndexSink(_BatchedSink):
+    """
+    An output sink that stores each quote and files it in the inverted index.
+
+    New quotes are appended to an existing index.
+    """
+
+    format = "index"
+
+    def __init__(self, path, segment_size=100_000, merge_above=8, **options):
+        """
+        Args:
+            path (str): The SQLite file of the index.
+            segment_size (int): Write the collected postings out after this
+                                many quotes.
+            merge_above (int): When closing, merge the segments of the terms
+                               that have more than this many.
+            **options: `batch_size`, `flush_every` and `fsync`, as for every sink.
+        """
+        super().__init__(path, **options)
+        self.segment_size = segment_size
+        self.merge_above = merge_above
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+        _create_tables(self._connection)
+        self._next_id = self._connection.execute(
+            "SELECT COALESCE(MAX(id), 0) + 1 FROM quotes").fetchone()[0]
+        self._segment = self._connection.execute(
+            "SELECT COALESCE(MAX(segment), 0) + 1 FROM postings").fetchone()[0]
+        # The postings of the current segment: (field, term) -> array of IDs.
+        self._postings = {}
+        self._segment_quotes = 0
+
+        # Quotes are saved with every batch, but their postings only with the
+        # next segment. If the last run stopped in between, file those quotes
+        # again now; they go into this run's first segment.
+        indexed = self._connection.execute(
+            "SELECT value FROM meta WHERE key = 'indexed'").fetchone()[0]
+        for quote_id, data in self._connection.execute(
+                "SELECT id, data FROM quotes WHERE id > ? ORDER BY id", (indexed,)):
+            self._file(quote_id, json.loads(data))
+
+    def _file(self, quote_id, item):
+        """Adds a quote to the postings of the current segment."""
+        for key in index_terms(item):
+            # IDs only grow, so appending keeps every list sorted.
+            self._postings.setdefault(key, array("I")).append(quote_id)
+        self._segment_quotes += 1
+
+    def _write_batch(self, items):
+        rows = []
+        for item in items:
+            quote_id = self._next_id
+            self._next_id += 1
+            rows.append((quote_id, json.dumps(item, ensure_ascii=False)))
+            self._file(quote_id, item)
+        with self._connection:
+            self._connection.executemany("INSERT INTO quotes VALUES (?, ?)", rows)
+        if self._segment_quotes >= self.segment_size:
+            self._write_segment()
+
+    def _write_segment(self):
+        """Writes the collected postings as a new segment, and forgets them."""
+        if not self._postings:
+            return
+        # One transaction: the segment and the new "indexed" mark are saved
+        # together, or not at all.
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO postings VALUES (?, ?, ?, ?)",
+                ((field, term, self._segment, _to_bytes(ids))
+                 for (field, term), ids in self._postings.items()),
+            )
+            self._connection.execute("UPDATE meta SET value = ? WHERE key = 'indexed'",
+                                     (self._next_id - 1,))
+        self._segment += 1
+        self._postings = {}
+        self._segment_quotes = 0
+
+    def _sync(self):
+        pass  # Every batch is committed in `_write_batch`.
+
+    def _close(self):
+        self._write_segment()
+        self.merge(self.merge_above)
+        self._connection.close()
+
+    def merge(self, max_segments=1):
+        """
+        Merges the segments of every term that has more than `max_segments`
+        into one row, for faster lookups.
+
+        Returns:
+            int: How many terms were merged.
+        """
+        return _merge_segments(self._connection, max_segments)
+
+
+def _merge_segments(connection, max_segments):
+    """Merges each term with more than `max_segments` segments into one row."""
+    keys = connection.execute(
+        "SELECT field, term FROM postings GROUP BY field, term HAVING COUNT(*) > ?",
+        (max(max_segments, 1),)).fetchall()
+    with connection:
+        for field, term in keys:
+            merged = array("I")
+            for (raw,) in connection.execute(
+                    "SELECT ids FROM postings WHERE field = ? AND term = ? ORDER BY segment",
+                    (field, term)).fetchall():
+                merged.extend(_from_bytes(raw))
+            connection.execute("DELETE FROM postings WHERE field = ? AND term = ?", (field, term))
+            # Segment 0 sorts before every segment written later.
+            connection.execute(
+                "INSERT INTO postings VALUES (?, ?, 0, ?)", (field, term, _to_bytes(merged)))
+    return len(keys)
+
+
+def compact_index(path):
+    """
+    Merges every term's segments into one row, in an index that is not being
+    written to.
+
+    Returns:
+        int: How many terms were merged.
+
+    Raises:
+        ValueError: If `path` is not an index made by `IndexSink`.
+    """
+    if not os.path.exists(path):
+        raise ValueError(f"There is no index at '{path}'.")
+    connection = sqlite3.connect(path)
+    try:
+        tables = {name for (name,) in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {"quotes", "postings"} <= tables:
+            raise ValueError(f"{path} is not a quote index.")
+        return _merge_segments(connection, 1)
+    finally:
+        connection.close()
+
+
+def intersect(lists, limit=None):
+    """
+    Returns the numbers found in EVERY one of several sorted lists.
+
+    Args:
+        lists (list): Sorted sequences of numbers (e.g. arrays).
+        limit (int): Stop after this many results (None: find them all).
+
+    Returns:
+        list: The common numbers, in increasing order.
+    """
+    if not lists:
+        return []
+    # Walk the shortest list; binary-search the others.
+    lists = sorted(lists, key=len)
+    shortest, others = lists[0], lists[1:]
+    # Where the next search in each other list may start: the numbers come in
+    # increasing order, so nothing before the last match can match again.
+    starts = [0] * len(others)
+    result = []
+    for number in shortest:
+        for i, other in enumerate(others):
+            position = bisect.bisect_left(other, number, starts[i])
+            starts[i] = position
+            if position == len(other) or other[position] != number:
+                break
+        else:
+            result.append(number)
+            if limit is not None and len(result) >= limit:
+                break
+    return result
+
+
+class QuoteIndex:
+    """
+    Read access to an index built by `IndexSink`.
+    """
+
+    def __init__(self, path):
+        """
+        Opens an index file.
+
+        Raises:
+            ValueError: If `path` is not an index made by `IndexSink`.
+        """
+        # Opened read-only: querying must never change the index. Read-only
+        # mode needs a "file:" URI, with the path quoted like in a web address.
+        uri = f"file:{pathname2url(os.path.abspath(path))}?mode=ro"
+        self._connection = sqlite3.connect(uri, uri=True)
+        tables = {name for (name,) in self._connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if not {"quotes", "postings"} <= tables:
+            self._connection.close()
+            raise ValueError(f"{path} is not a quote index.")
+
+    def postings(self, field, term):
+        """
+        Returns the sorted IDs of the quotes filed under one term.
+
+        Args:
+            field (str): "author", "tag" or "word".
+            term (str): The author, tag or word (normalized here).
+
+        Returns:
+            array: The quote IDs, in increasing order.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}'. Use one of: {', '.join(FIELDS)}.")
+        ids = array("I")
+        # An index that was not closed properly may still have several
+        # segments for a term; reading them in order keeps the list sorted.
+        for (raw,) in self._connection.execute(
+                "SELECT ids FROM postings WHERE field = ? AND term = ? ORDER BY segment",
+                (field, normalize(term))):
+            ids.extend(_from_bytes(raw))
+        return ids
+
+    def search(self, author=None, tags=(), words=(), limit=None):
+        """
+        Finds the IDs of the quotes matching EVERY condition given.
+
+        Args:
+            author (str): The author.
+            tags (list): Tags the quote must all have.
+            words (list): Words the quote text must all contain.
+            limit (int): Return at most this many IDs (the lowest ones).
+
+        Returns:
+            list: The matching quote IDs, in increasing order.
+        """
+        terms = [("author", author)] if author else []
+        terms += [("tag", tag) for tag in tags]
+        terms += [("word", word) for phrase in words for word in normalize(phrase).split()]
+        if not terms:
+            raise ValueError("Give at least one author, tag or word to search for.")
+        lists = []
+        for field, term in terms:
+            ids = self.postings(field, term)
+            if not ids:
+                return []  # One missing term: nothing can match them all.
+            lists.append(ids)
+        return intersect(lists, limit)
+
+    def quotes(self, ids):
+        """Returns the stored quotes with these IDs, in the same order."""
+        found = {}
+        # SQLite limits how many "?" one statement may have, so go in chunks.
+        for start in range(0, len(ids), 500):
+            chunk = list(ids[start:start + 500])
+            found.update(
+                (quote_id, json.loads(data)) for quote_id, data in self._connection.execute(
+                    f"SELECT id, data FROM quotes WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk))
+        return [found[quote_id] for quote_id in ids if quote_id in found]
+
+    def count(self):
+        """Returns how many quotes the index holds."""
+        return self._connection.execute("SELECT COUNT(*) FROM quotes").fetchone()[0]
+
+    def top_terms(self, field, limit=10):
+        """
+        Returns the most common authors, tags or words.
+
+        Returns:
+            list: (term, number of quotes) pairs, most common first.
+        """
+        if field not in FIELDS:
+            raise ValueError(f"Unknown field '{field}'. Use one of: {', '.join(FIELDS)}.")
+        # A posting list of n IDs takes 4 * n bytes.
+        return self._connection.execute(
+            "SELECT term, SUM(LENGTH(ids)) / 4 AS total FROM postings WHERE field = ?"
+            " GROUP BY term ORDER BY total DESC, term LIMIT ?", (field, limit)).fetchall()
+
+    def close(self):
+        self._connection.close()
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_scraper_query.py' instead.")
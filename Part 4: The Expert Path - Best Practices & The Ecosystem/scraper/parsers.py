@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Parsers Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module extracts the quotes and links from a quotes page with one of
+several interchangeable PARSER BACKENDS. Every backend finds the same things
+(`div.quote`, `span.text`, `small.author`, `a.tag` and the "Next" link) and
+returns them in the same `PageData` form, so the rest of the scraper does not
+care which one did the work.
+"""
+
+'''
+WHY SEVERAL PARSERS?
+Parsing is the CPU-heavy part of scraping, and parsers differ a lot in speed:
+-   "html.parser": BeautifulSoup on top of Python's built-in parser. Pure
+    Python, forgiving, always available, and the slowest. This is what the
+    lesson started with.
+-   "lxml": the `lxml` library, a wrapper around the C library libxml2. It
+    builds the document tree in C and searches it with precompiled XPATH
+    expressions. Many times faster, but it must be installed
+    (`pip install lxml`).
+-   "stream": a STREAMING extractor built on the standard library's
+    `html.parser.HTMLParser`. It never builds a tree at all. The parser calls
+    us for each start tag, end tag and piece of text, in document order, and
+    we simply remember the few things we are looking for. Memory use stays
+    tiny, whatever the size of the page.
+
+The trade-off: a tree (BeautifulSoup, lxml) can answer any question about the
+page, while the streaming extractor only knows how to find exactly these
+fields. Compare them with `22_scraper_parser_benchmark.py`.
+
+THE INTERFACE:
+Each backend has a `name` and an `extract(html)` method returning a `PageData`:
+`items` (the quotes, as a list of {"text", "author", "tags"} dicts),
+`next_href` (the "Next" link, or None) and `follow_hrefs` (the other links
+worth crawling: every tag link on the page).
+Text is cleaned the way BeautifulSoup's `get_text(strip=True)` does it: each
+piece of text is stripped and the pieces are joined, so all backends agree.
+'''
+
+from collections import namedtuple
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup
+
+# `lxml` is optional. If it is missing, the "lxml" backend is simply not offered.
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = lxml_html = None
+
+PageData = namedtuple("PageData", ["items", "next_href", "follow_hrefs"])
+
+
+def _lxml_root(html_content):
+    """
+    Parses a page with lxml.
+
+    Raises:
+        ValueError: If lxml cannot read the page at all (e.g. it is empty).
+    """
+    try:
+        return lxml_html.fromstring(html_content)
+    except etree.ParserError as err:
+        raise ValueError(f"Could not parse the page: {err}") from None
+
+
+def _joined_text(pieces):
+    """Strips every piece of text and joins them, like `get_text(strip=True)`."""
+    return "".join(piece.strip() for piece in pieces)
+
+
+class SoupBackend:
+    """
+    Extraction with BeautifulSoup and Python's built-in "html.parser".
+    """
+
+    name = "html.parser"
+
+    def extract(self, html_content):
+        # Now we create a BeautifulSoup object, which represents the parsed document.
+        # Arguments:
+        # 1. The HTML content we fetched.
+        # 2. The parser we want to use. 'html.parser' is built-in with Python.
+        soup = BeautifulSoup(html_content, "html.parser")
+
+        # `soup.find_all()` returns a list of all elements that match our query.
+        # We're looking for all 'div' tags with a class of 'quote'.
+        # NOTE: We use `class_` with an underscore because `class` is a reserved
+        # keyword in Python.
+        quotes = []
+        for quote_element in soup.find_all('div', class_='quote'):
+            # Within each 'div', the text is in a <span> with class="text".
+            # `.find()` gets the *first* matching element.
+            text = quote_element.find('span', class_='text')
+            # The author is in a <small> tag with class="author".
+            author = quote_element.find('small', class_='author')
+            # The tags are inside a <div> with class="tags"; each one is an <a>.
+            tags_container = quote_element.find('div', class_='tags')
+            tag_elements = tags_container.find_all('a', class_='tag') if tags_container else []
+
+            quotes.append({
+                # `.get_text()` extracts the text content from the element.
+                "text": text.get_text(strip=True) if text else "",
+                "author": author.get_text(strip=True) if author else "",
+                "tags": [tag.get_text(strip=True) for tag in tag_elements],
+            })
+
+        # The "Next →" button is an <a> inside <li class="next">.
+        next_item = soup.find('li', class_='next')
+        next_href = next_item.a.get('href') if next_item and next_item.a else None
+        tag_hrefs = [tag['href'] for tag in soup.find_all('a', class_='tag') if tag.get('href')]
+        return PageData(quotes, next_href, tag_hrefs)
+
+
+def _has_class(name):
+    """An XPath test for "the class attribute contains the word `name`"."""
+    # Padding with spaces makes " quote " match "quote" but not "quotes".
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlBackend:
+    """
+    Extraction with lxml and precompiled XPath expressions.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        if lxml_html is None:
+            raise ImportError("The 'lxml' backend needs lxml: pip install lxml")
+        # `etree.XPath` COMPILES each expression once, here, instead of
+        # re-reading the expression string for every page and every quote.
+        self._quotes = etree.XPath(f"//div[{_has_class('quote')}]")
+        self._text = etree.XPath(f".//span[{_has_class('text')}][1]")
+        self._author = etree.XPath(f".//small[{_has_class('author')}][1]")
+        self._tags = etree.XPath(f"(.//div[{_has_class('tags')}])[1]//a[{_has_class('tag')}]")
+        self._next_href = etree.XPath(f"(//li[{_has_class('next')}]//a)[1]/@href")
+        self._tag_hrefs = etree.XPath(f"//a[{_has_class('tag')}]/@href")
+
+    def extract(self, html_content):
+        root = _lxml_root(html_content)
+        quotes = []
+        for quote_element in self._quotes(root):
+            text = self._text(quote_element)
+            author = self._author(quote_element)
+            quotes.append({
+                # `itertext()` yields every piece of text inside the element.
+                "text": _joined_text(text[0].itertext()) if text else "",
+                "author": _joined_text(author[0].itertext()) if author else "",
+                "tags": [_joined_text(tag.itertext()) for tag in self._tags(quote_element)],
+            })
+        next_href = self._next_href(root)
+        return PageData(quotes, str(next_href[0]) if next_href else None,
+                        [str(href) for href in self._tag_hrefs(root)])
+
+
+class _QuoteStreamParser(HTMLParser):
+    """
+    An `HTMLParser` that picks the quotes and links out of the stream of
+    tags, without building a tree.
+
+    Instead of a tree, it keeps a little STATE: are we inside a quote? Are we
+    collecting the text of a field (and how deeply nested in it are we)?
+    """
+
+    def __init__(self):
+        # `convert_charrefs=True` turns "&amp;" and friends into characters for us.
+        super().__init__(convert_charrefs=True)
+        self.quotes = []
+        self.next_href = None
+        self.tag_hrefs = []
+        self._quote = None        # The quote being read, if we are inside one.
+        self._quote_depth = 0     # Open <div>s since the quote's <div> began.
+        self._field = None        # "text", "author" or "tag" while collecting.
+        self._field_tag = None    # The tag name that opened the field.
+        self._field_depth = 0     # Nested tags of that name inside the field.
+        self._pieces = []         # The text collected for the field so far.
+        self._in_next = False     # Inside <li class="next">?
+        self._in_tags = False     # Inside the quote's <div class="tags">?
+        self._tags_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._field is not None:
+            # Something nested inside a field, e.g. <span><b>..</b></span>.
+            if tag == self._field_tag:
+                self._field_depth += 1
+            return
+
+        attributes = dict(attrs)
+        classes = (attributes.get("class") or "").split()
+        if tag == "div":
+            if self._quote is None:
+                if "quote" in classes:
+                    self._quote = {"text": "", "author": "", "tags": []}
+                    self._quote_depth = 1
+            else:
+                self._quote_depth += 1
+                if self._in_tags:
+                    self._tags_depth += 1
+                elif "tags" in classes:
+                    self._in_tags = True
+                    self._tags_depth = 1
+        elif tag == "a":
+            if "tag" in classes:
+                if attributes.get("href"):
+                    self.tag_hrefs.append(attributes["href"])
+                if self._in_tags:
+                    self._start_field("tag", tag)
+            elif self._in_next and self.next_href is None:
+                self.next_href = attributes.get("href")
+        elif tag == "li" and "next" in classes:
+            self._in_next = True
+        elif self._quote is not None:
+            if tag == "span" and "text" in classes and not self._quote["text"]:
+                self._start_field("text", tag)
+            elif tag == "small" and "author" in classes and not self._quote["author"]:
+                self._start_field("author", tag)
+
+    def handle_endtag(self, tag):
+        if self._field is not None:
+            if tag == self._field_tag:
+                self._field_depth -= 1
+                if self._field_depth == 0:
+                    self._end_field()
+            return
+
+        if tag == "div" and self._quote is not None:
+            if self._in_tags:
+                self._tags_depth -= 1
+                if self._tags_depth == 0:
+                    self._in_tags = False
+            self._quote_depth -= 1
+            if self._quote_depth == 0:
+                self.quotes.append(self._quote)
+                self._quote = None
+        elif tag == "li":
+            self._in_next = False
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._pieces.append(data)
+
+    def _start_field(self, field, tag):
+        self._field, self._field_tag, self._field_depth = field, tag, 1
+        self._pieces = []
+
+    def _end_field(self):
+        value = _joined_text(self._pieces)
+        if self._field == "tag":
+            self._quote["tags"].append(value)
+        else:
+            self._quote[self._field] = value
+        self._field = None
+
+
+class StreamingBackend:
+    """
+    Extraction with a streaming `HTMLParser`; no tree is ever built.
+    """
+
+    name = "stream"
+
+    def extract(self, html_content):
+        parser = _QuoteStreamParser()
+        # `feed()` could also be called with the page in pieces, as they
+        # arrive from the network; here we already have the whole page.
+        parser.feed(html_content)
+        parser.close()
+        return PageData(parser.quotes, parser.next_href, parser.tag_hrefs)
+
+
+# Every backend, by name, in order from slowest to fastest (usually).
+BACKENDS = {backend.name: backend for backend in (SoupBackend, StreamingBackend, LxmlBackend)}
+
+# One instance per backend per process, created on first use.
+_instances = {}
+
+
+def available_backends():
+    """Returns the names of the backends that can be used on this machine."""
+    return [name for name in BACKENDS if name != "lxml" or lxml_html is not None]
+
+
+def get_backend(name):
+    """
+    Returns the (shared) backend called `name`.
+
+    Raises:
+        ValueError: If there is no such backend.
+        ImportError: If the backend's library is not installed.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown parser '{name}'. Use one of: {', '.join(BACKENDS)}.")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --parser stream' instead.")
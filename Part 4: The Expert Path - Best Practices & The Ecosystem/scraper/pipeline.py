@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Pipeline Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module defines `crawl_pipeline()`, a crawl split into three STAGES that
+run at the same time: threads download pages, a pool of separate PROCESSES
+parses them, and the caller writes out the results. Each stage only runs as
+far ahead of the next one as a fixed limit allows.
+"""
+
+'''
+WHY PROCESSES FOR PARSING?
+Downloading a page is mostly WAITING, which threads handle well (see
+`crawl.py`). Parsing HTML is the opposite: pure CPU work. Because of Python's
+GLOBAL INTERPRETER LOCK (GIL), only one thread can run Python code at a time,
+so no matter how many threads we start, parsing uses ONE CPU core.
+
+A `ProcessPoolExecutor` starts several separate Python processes, each with
+its own interpreter and its own GIL. Pages handed to it are parsed truly in
+parallel, on as many cores as the machine has. The catch: everything sent to
+or from a process (the HTML in, the quotes out) must be PICKLED, i.e. copied
+as bytes, so the function we run there must be importable by name.
+
+A PIPELINE WITH BACKPRESSURE:
+    [fetch threads] --> pages waiting to be parsed --> [parse processes] --> [writer]
+
+If the parsers fall behind, downloaded pages pile up in memory. If the writer
+falls behind, parsed results pile up. BACKPRESSURE means a fast stage is made
+to wait for a slow one:
+-   A new download only starts while fewer than `queue_size` pages are
+    downloading or waiting to be parsed, so the parse stage's queue is bounded.
+-   Results are handed to the writer one at a time (this function is a
+    generator). While the writer is busy, no new work is started at all.
+
+SKIPPING THE PARSE STAGE:
+If the fetch stage already knows a page's result (for example, the page
+cache says the page has not changed since we last parsed it), it returns a
+`ParsedPage` instead of HTML, and the page goes straight to the writer.
+'''
+
+import os
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from scraper.crawl import PAGE_ERRORS, Frontier
+
+# Returned by a fetch function for a page that needs no parsing.
+ParsedPage = namedtuple("ParsedPage", ["result", "links"])
+
+
+class ParseTimer:
+    """
+    Adds up how long parsing pages took. Safe to use from many threads.
+    """
+
+    def __init__(self):
+        self.pages = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        """Records one parsed page."""
+        with self._lock:
+            self.pages += 1
+            self.seconds += seconds
+
+    def ms_per_page(self):
+        """Returns the average parse time in milliseconds (0.0 if none)."""
+        return self.seconds / self.pages * 1000 if self.pages else 0.0
+
+
+def _timed_parse(parse, html_content, url):
+    """
+    Runs `parse` in a parser process, and returns (seconds taken, its result).
+
+    Timing it there, instead of in this process, leaves out the time the page
+    spent waiting for a free parser.
+    """
+    start = time.perf_counter()
+    result = parse(html_content, url)
+    return time.perf_counter() - start, result
+
+
+def crawl_pipeline(start_urls, fetch, parse, fetch_workers=8, parse_workers=None,
+                   max_pages=None, frontier=None, queue_size=None, after_parse=None,
+                   parse_timer=None):
+    """
+    Crawls pages with separate fetch (threads) and parse (processes) stages.
+
+    Args:
+        start_urls (list): The URLs to start from.
+        fetch (function): Called as `fetch(url)` in a thread; returns the HTML,
+                          or a `ParsedPage` if the page needs no parsing.
+        parse (function): Called as `parse(html, url)` in another process;
+                          returns `(result, links)`. It must be picklable: a
+                          function defined at the top level of a module (or a
+                          `functools.partial` of one).
+        fetch_workers (int): The most pages downloading at the same time.
+        parse_workers (int): The number of parser processes (default: one per
+                             CPU core).
+        max_pages (int): Stop after visiting this many pages (None: no limit).
+        frontier (Frontier): The frontier to use (default: a new one).
+        queue_size (int): The most pages downloading or waiting to be parsed
+                          at once (default: `fetch_workers` plus two per parser).
+        after_parse (function): If given, called as `after_parse(url, result,
+                                links)` in this process after each page is
+                                parsed (e.g. to cache the result).
+        parse_timer (ParseTimer): If given, records how long each parse took.
+
+    Yields:
+        tuple: (url, result, error). Exactly one of `result` and `error` is None.
+    """
+    frontier = Frontier() if frontier is None else frontier
+    for url in start_urls:
+        frontier.add(url)
+
+    parse_workers = parse_workers or os.cpu_count() or 1
+    if queue_size is None:
+        # Enough for every fetcher plus a little queue for each parser.
+        queue_size = fetch_workers + 2 * parse_workers
+
+    with ProcessPoolExecutor(max_workers=parse_workers) as parsers, \
+            ThreadPoolExecutor(max_workers=fetch_workers) as fetchers:
+        fetching = {}  # download future -> URL
+        parsing = {}   # parse future -> URL
+        started = 0
+        while True:
+            # Start downloads while the fetch stage has a free worker AND the
+            # parse stage has room for the page (backpressure).
+            while (frontier and len(fetching) < fetch_workers
+                   and len(fetching) + len(parsing) < queue_size
+                   and (max_pages is None or started < max_pages)):
+                url = frontier.pop()
+                fetching[fetchers.submit(fetch, url)] = url
+                started += 1
+
+            if not fetching and not parsing:
+                break  # Every stage is empty: done.
+
+            # `wait()` accepts futures from both pools at once.
+            done, _ = wait([*fetching, *parsing], return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in fetching:
+                    # A download finished: pass the page on to a parser.
+                    url = fetching.pop(future)
+                    try:
+                        html = future.result()
+                    except PAGE_ERRORS as err:
+                        frontier.failed(url)
+                        yield url, None, err
+                        continue
+                    if isinstance(html, ParsedPage):
+                        # Already parsed: skip straight to the writer.
+                        for link in html.links:
+                            frontier.add(link)
+                        frontier.done(url)
+                        yield url, html.result, None
+                        continue
+                    parsing[parsers.submit(_timed_parse, parse, html, url)] = url
+                else:
+                    # A parse finished: queue its links and hand the result on.
+                    url = parsing.pop(future)
+                    try:
+                        seconds, (result, links) = future.result()
+                    except PAGE_ERRORS as err:
+                        frontier.failed(url)
+                        yield url, None, err
+                        continue
+                    if parse_timer is not None:
+                        parse_timer.add(seconds)
+                    if after_parse is not None:
+                        after_parse(url, result, links)
+                    for link in links:
+                        frontier.add(link)
+                    frontier.done(url)
+                    yield url, result, None
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --parse-workers 4' instead.")
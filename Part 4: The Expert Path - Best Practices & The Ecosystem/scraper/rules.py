@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Extraction Rules Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module lets a RULE FILE (JSON or YAML) describe what to extract from a
+site, instead of hand-writing the extraction code. A rule file is read once
+and COMPILED into an extraction plan for one of the parser backends; the plan
+is then applied to every page.
+"""
+
+'''
+WHY RULE FILES?
+The extraction code in `parsers.py` knows exactly one site. Supporting a
+second site would mean writing (and testing) the same loop again with
+different class names. A RULE FILE separates WHAT to extract from HOW:
+
+    {
+      "name": "quotes.toscrape.com",
+      "item": "div.quote",
+      "fields": {
+        "text":   "span.text",
+        "author": "small.author",
+        "tags":   {"selector": "div.tags a.tag", "many": true}
+      },
+      "next": "li.next a",
+      "follow": "a.tag"
+    }
+
+-   `item`: a SELECTOR for the element that holds one record (one quote).
+-   `fields`: the selector of each field, searched inside the item. A field
+    is either a selector string, or a dictionary with:
+        `selector`   (required) the selector.
+        `attribute`  take this attribute (e.g. "href") instead of the text.
+        `many`       true: a list of every match. Otherwise: the first match.
+        `process`    a list of post-processing steps, applied in order (see
+                     `PROCESSORS`), e.g. ["strip_quotes", "collapse_whitespace"].
+-   `next`: the "next page" link (its `href` is followed).
+-   `follow`: other links to crawl (every match's `href`).
+
+SELECTORS are a small subset of CSS: a tag name and/or classes (`div`,
+`.quote`, `div.quote.featured`, `*`), combined with a space ("anywhere
+inside") or `>` ("directly inside"), e.g. `div.tags > a.tag`.
+
+WHY COMPILE?
+A selector such as "div.tags a.tag" is just a string. Something must read it
+and work out what it means before it can be matched, and doing that for every
+element of every page would waste most of our time. COMPILING does that work
+once, when the rule file is loaded:
+-   for lxml, each selector is translated to an XPath expression and compiled
+    with `etree.XPath`;
+-   for BeautifulSoup, it is compiled with `soupsieve.compile()`;
+-   for the streaming parser, it becomes a list of small "step" objects that
+    can be matched against the open tags without any string handling.
+'''
+
+import json
+from collections import namedtuple
+from html.parser import HTMLParser
+
+import soupsieve
+from bs4 import BeautifulSoup
+
+from scraper.parsers import PageData, _has_class, _joined_text, _lxml_root, etree, lxml_html
+
+# `PyYAML` is optional; without it, rule files must be JSON.
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# The post-processing steps a field may list under "process".
+PROCESSORS = {
+    "strip": str.strip,
+    "lower": str.lower,
+    "upper": str.upper,
+    "collapse_whitespace": lambda value: " ".join(value.split()),
+    "strip_quotes": lambda value: value.strip("\"'“”‘’"),
+    "int": int,
+    "float": float,
+}
+
+# Elements that never have an end tag, like <br> and <meta>.
+VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input",
+                 "link", "meta", "source", "track", "wbr"}
+
+# One step of a compiled selector: "directly inside" (">") or "anywhere
+# inside" (" ") the previous step, then the tag name (None for any) and the
+# classes the element must have.
+Step = namedtuple("Step", ["combinator", "tag", "classes"])
+
+# One compiled selector: the original text and its steps.
+Selector = namedtuple("Selector", ["source", "steps"])
+
+# One field of an item.
+Field = namedtuple("Field", ["name", "selector", "attribute", "many", "processors"])
+
+# A whole rule file, with every selector parsed.
+Rules = namedtuple("Rules", ["name", "item", "fields", "next", "follow"])
+
+
+def parse_selector(source):
+    """
+    Parses a selector such as "div.tags > a.tag" into steps.
+
+    Raises:
+        ValueError: If the selector uses something outside our CSS subset.
+    """
+    if not isinstance(source, str):
+        raise ValueError(f"A selector must be a string, not {source!r}.")
+    steps = []
+    combinator = " "
+    for token in source.replace(">", " > ").split():
+        if token == ">":
+            if not steps or combinator == ">":
+                raise ValueError(f"Misplaced '>' in selector '{source}'.")
+            combinator = ">"
+            continue
+        tag, *classes = token.split(".")
+        if not all(classes) or not (tag.isalnum() or tag in ("", "*")):
+            raise ValueError(f"Unsupported selector '{source}': use tag.class parts only.")
+        steps.append(Step(combinator, tag.lower() if tag not in ("", "*") else None,
+                          frozenset(classes)))
+        combinator = " "
+    if not steps or combinator == ">":
+        raise ValueError(f"Incomplete selector '{source}'.")
+    return Selector(source, tuple(steps))
+
+
+def _parse_field(name, spec):
+    """Turns one entry of "fields" into a `Field`."""
+    if isinstance(spec, str):
+        spec = {"selector": spec}
+    if not isinstance(spec, dict):
+        raise ValueError(f"Field '{name}' must be a selector or a mapping, not {spec!r}.")
+    if "selector" not in spec:
+        raise ValueError(f"Field '{name}' has no selector.")
+    steps = spec.get("process", [])
+    if isinstance(steps, str):
+        steps = [steps]
+    if not isinstance(steps, list) or not all(isinstance(step, str) for step in steps):
+        raise ValueError(f"Field '{name}': 'process' must be a list of step names.")
+    unknown = [step for step in steps if step not in PROCESSORS]
+    if unknown:
+        raise ValueError(f"Field '{name}': unknown processing step(s) {', '.join(unknown)}. "
+                         f"Use: {', '.join(PROCESSORS)}.")
+    attribute = spec.get("attribute")
+    if attribute is not None and not isinstance(attribute, str):
+        raise ValueError(f"Field '{name}': 'attribute' must be a string.")
+    return Field(name, parse_selector(spec["selector"]), attribute,
+                 bool(spec.get("many", False)),
+                 tuple(PROCESSORS[step] for step in steps))
+
+
+def parse_rules(config):
+    """
+    Checks a rule dictionary and parses every selector in it.
+
+    Args:
+        config (dict): The rules, as read from a rule file.
+
+    Returns:
+        Rules: The parsed rules.
+
+    Raises:
+        ValueError: If the rules are incomplete or invalid.
+    """
+    # A rule file is written by hand, so every part is checked before it is
+    # used: a mistake must be reported, not crash the program.
+    if not isinstance(config, dict):
+        raise ValueError("A rule file must hold a mapping of settings ('item', 'fields', ...).")
+    if "item" not in config or not config.get("fields"):
+        raise ValueError("Rules need an 'item' selector and at least one field.")
+    if not isinstance(config["fields"], dict):
+        raise ValueError("'fields' must map each field name to its selector.")
+    follow = config.get("follow", [])
+    if isinstance(follow, str):
+        follow = [follow]
+    if not isinstance(follow, list):
+        raise ValueError("'follow' must be a selector or a list of selectors.")
+    return Rules(
+        config.get("name", "unnamed"),
+        parse_selector(config["item"]),
+        tuple(_parse_field(name, spec) for name, spec in config["fields"].items()),
+        parse_selector(config["next"]) if config.get("next") else None,
+        tuple(parse_selector(source) for source in follow),
+    )
+
+
+def load_rules(path):
+    """
+    Reads and parses a rule file (.json, or .yaml/.yml with PyYAML installed).
+    """
+    with open(path, mode="r", encoding="utf-8") as rules_file:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise ImportError("YAML rule files need PyYAML: pip install pyyaml")
+            config = yaml.safe_load(rules_file)
+        else:
+            config = json.load(rules_file)
+    return parse_rules(config)
+
+
+def _process(field, value):
+    """Applies a field's post-processing steps to one value."""
+    for processor in field.processors:
+        value = processor(value)
+    return value
+
+
+def _to_css(selector):
+    """Writes a parsed selector back as CSS (for soupsieve)."""
+    parts = []
+    for step in selector.steps:
+        if parts and step.combinator == ">":
+            parts.append(">")
+        parts.append((step.tag or "*") + "".join(f".{name}" for name in sorted(step.classes)))
+    return " ".join(parts)
+
+
+def _to_xpath(selector, relative=False):
+    """Translates a parsed selector into an XPath expression (for lxml)."""
+    path = "." if relative else ""
+    for step in selector.steps:
+        tests = "".join(f"[{_has_class(name)}]" for name in sorted(step.classes))
+        path += ("/" if step.combinator == ">" else "//") + (step.tag or "*") + tests
+    return path
+
+
+class SoupPlan:
+    """Rules compiled for BeautifulSoup (with `soupsieve`)."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._item = soupsieve.compile(_to_css(rules.item))
+        # `:scope` means "the item itself", so fields only match inside it.
+        self._fields = [(field, soupsieve.compile(":scope " + _to_css(field.selector)))
+                        for field in rules.fields]
+        self._next = soupsieve.compile(_to_css(rules.next)) if rules.next else None
+        # A selector LIST ("a, b") finds the links of all the "follow"
+        # selectors in one pass, in document order.
+        self._follow = (soupsieve.compile(", ".join(_to_css(selector) for selector in rules.follow))
+                        if rules.follow else None)
+
+    def extract(self, html_content):
+        soup = BeautifulSoup(html_content, "html.parser")
+        items = []
+        for element in self._item.select(soup):
+            item = {}
+            for field, compiled in self._fields:
+                # A match without the attribute is skipped (as `StreamPlan`
+                # does), so a single field looks further than the first match.
+                matches = (compiled.select(element, limit=1)
+                           if not (field.many or field.attribute) else compiled.select(element))
+                raw = [match.get(field.attribute) if field.attribute
+                       else match.get_text(strip=True) for match in matches]
+                values = [_process(field, value) for value in raw if value is not None]
+                item[field.name] = values if field.many else (values[0] if values else None)
+            items.append(item)
+        next_link = self._next.select_one(soup) if self._next else None
+        follow = [link.get("href") for link in self._follow.select(soup)] if self._follow else []
+        return PageData(items, next_link.get("href") if next_link else None,
+                        [href for href in follow if href])
+
+
+class LxmlPlan:
+    """Rules compiled into XPath expressions for lxml."""
+
+    def __init__(self, rules):
+        if lxml_html is None:
+            raise ImportError("The 'lxml' backend needs lxml: pip install lxml")
+        self.rules = rules
+        self._item = etree.XPath(_to_xpath(rules.item))
+        self._fields = [(field, etree.XPath(_to_xpath(field.selector, relative=True)))
+                        for field in rules.fields]
+        self._next = etree.XPath(_to_xpath(rules.next)) if rules.next else None
+        # The union operator `|` finds the links of all the "follow"
+        # selectors in one pass, in document order.
+        self._follow = (etree.XPath(" | ".join(_to_xpath(selector) for selector in rules.follow))
+                        if rules.follow else None)
+
+    def extract(self, html_content):
+        root = _lxml_root(html_content)
+        items = []
+        for element in self._item(root):
+            item = {}
+            for field, compiled in self._fields:
+                matches = compiled(element)
+                if not (field.many or field.attribute):
+                    matches = matches[:1]
+                # A match without the attribute is skipped, as in the other plans.
+                raw = [match.get(field.attribute) if field.attribute
+                       else _joined_text(match.itertext()) for match in matches]
+                values = [_process(field, value) for value in raw if value is not None]
+                item[field.name] = values if field.many else (values[0] if values else None)
+            items.append(item)
+        next_links = self._next(root) if self._next else []
+        follow = [link.get("href") for link in self._follow(root)] if self._follow else []
+        return PageData(items, next_links[0].get("href") if next_links else None,
+                        [href for href in follow if href])
+
+
+def _step_matches(step, element):
+    """Does one selector step match an open element (tag, classes, attrs)?"""
+    tag, classes, _ = element
+    return (step.tag is None or step.tag == tag) and step.classes <= classes
+
+
+def _selector_matches(selector, path, start=0):
+    """
+    Does `selector` match the last element of `path`, using only the
+    elements from `path[start]` on as its ancestors?
+
+    Like a browser, we match from the RIGHT: the last step must match the
+    element itself, then we look upwards for the earlier steps.
+    """
+    steps = selector.steps
+
+    def match_from(step_index, position):
+        if step_index == 0:
+            return True
+        previous = steps[step_index - 1]
+        if steps[step_index].combinator == ">":
+            parent = position - 1
+            return (parent >= start and _step_matches(previous, path[parent])
+                    and match_from(step_index - 1, parent))
+        for ancestor in range(position - 1, start - 1, -1):
+            if _step_matches(previous, path[ancestor]) and match_from(step_index - 1, ancestor):
+                return True
+        return False
+
+    return _step_matches(steps[-1], path[-1]) and match_from(len(steps) - 1, len(path) - 1)
+
+
+class _RuleStreamParser(HTMLParser):
+    """
+    An `HTMLParser` that applies compiled rules while the page streams past.
+
+    It keeps a stack of the currently open elements (the PATH from the root
+    to where we are), which is all the selectors need to be matched.
+    """
+
+    def __init__(self, rules):
+        super().__init__(convert_charrefs=True)
+        self.rules = rules
+        self.items = []
+        self.next_href = None
+        self.follow_hrefs = []
+        self._path = []        # Open elements: (tag, classes, attrs).
+        self._item = None      # The item being read, if any.
+        self._item_depth = 0   # Its position in the path.
+        self._captures = []    # Fields collecting text: [field, depth, pieces].
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        self._path.append((tag, frozenset((attributes.get("class") or "").split()), attributes))
+        depth = len(self._path) - 1
+        rules = self.rules
+
+        if self._item is None:
+            if _selector_matches(rules.item, self._path):
+                self._item = {field.name: [] if field.many else None for field in rules.fields}
+                self._item_depth = depth
+        else:
+            for field in rules.fields:
+                if not field.many and (self._item[field.name] is not None
+                                       or any(capture[0] is field for capture in self._captures)):
+                    continue  # Only the first match counts.
+                if _selector_matches(field.selector, self._path, self._item_depth + 1):
+                    if field.attribute:
+                        self._store(field, attributes.get(field.attribute))
+                    else:
+                        self._captures.append([field, depth, []])
+
+        if attributes.get("href"):
+            if (rules.next and self.next_href is None
+                    and _selector_matches(rules.next, self._path)):
+                self.next_href = attributes["href"]
+            if any(_selector_matches(selector, self._path) for selector in rules.follow):
+                self.follow_hrefs.append(attributes["href"])
+
+        if tag in VOID_ELEMENTS:
+            self._close_to(depth)
+
+    def handle_endtag(self, tag):
+        # Find the nearest open element with this name. Anything opened after
+        # it (e.g. a <p> without its </p>) is closed along with it.
+        for depth in range(len(self._path) - 1, -1, -1):
+            if self._path[depth][0] == tag:
+                self._close_to(depth)
+                return
+
+    def handle_data(self, data):
+        for capture in self._captures:
+            capture[2].append(data)
+
+    def _close_to(self, depth):
+        """Closes every open element from the top of the path down to `depth`."""
+        while len(self._path) > depth:
+            closing = len(self._path) - 1
+            while self._captures and self._captures[-1][1] == closing:
+                field, _, pieces = self._captures.pop()
+                self._store(field, _joined_text(pieces))
+            if self._item is not None and closing == self._item_depth:
+                self.items.append(self._item)
+                self._item = None
+            self._path.pop()
+
+    def _store(self, field, value):
+        if value is None:
+            return
+        value = _process(field, value)
+        if field.many:
+            self._item[field.name].append(value)
+        else:
+            self._item[field.name] = value
+
+
+class StreamPlan:
+    """Rules compiled for the streaming `HTMLParser`."""
+
+    def __init__(self, rules):
+        # `parse_rules()` already turned every selector into steps, which is
+        # all the streaming matcher needs.
+        self.rules = rules
+
+    def extract(self, html_content):
+        parser = _RuleStreamParser(self.rules)
+        parser.feed(html_content)
+        parser.close()
+        return PageData(parser.items, parser.next_href, parser.follow_hrefs)
+
+
+# The plan class for each parser backend.
+PLANS = {"html.parser": SoupPlan, "lxml": LxmlPlan, "stream": StreamPlan}
+
+# Compiled plans by (rule file, backend), so each process compiles them once.
+_plans = {}
+
+
+def compile_rules(rules, parser="html.parser"):
+    """
+    Compiles parsed rules into an extraction plan for a parser backend.
+
+    Args:
+        rules (Rules): Rules from `parse_rules()` or `load_rules()`.
+        parser (str): "html.parser", "lxml" or "stream".
+
+    Returns:
+        An object whose `extract(html)` method returns a `PageData`.
+    """
+    if parser not in PLANS:
+        raise ValueError(f"Unknown parser '{parser}'. Use one of: {', '.join(PLANS)}.")
+    return PLANS[parser](rules)
+
+
+def get_plan(path, parser="html.parser"):
+    """Returns the compiled plan for a rule file, loading it on first use."""
+    key = (path, parser)
+    if key not in _plans:
+        _plans[key] = compile_rules(load_rules(path), parser)
+    return _plans[key]
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --rules scraper/rules/quotes_toscrape.json' instead.")
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Fixture Server Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module serves a `FixtureSite` over HTTP on this computer, so the crawler
+can be run and measured without the internet. `FixtureServer` can also
+pretend to be a slow or struggling server: it can add LATENCY to every
+answer, fail a share of the requests on purpose (ERROR INJECTION), and refuse
+requests beyond a set number at once with "429 Too Many Requests".
+"""
+
+'''
+WHY A LOCAL SERVER?
+To know whether a change made the crawler faster, we must crawl the SAME site
+under the SAME conditions before and after. A public site changes, the
+network adds random delays, and hammering someone else's server to benchmark
+is rude. A server on our own machine, serving a generated site, fixes all
+three: it is always the same, and nobody else is bothered.
+
+PRETENDING TO BE THE REAL INTERNET:
+A local server answers in microseconds, which hides exactly the problems a
+real crawler has. So it can be made worse on purpose:
+-   LATENCY: every answer waits `latency` seconds, plus up to `jitter` more
+    at random, like a distant server would.
+-   ERRORS: a share (`error_rate`) of the requests fails with `error_status`
+    (e.g. 503), optionally with a `Retry-After` header.
+-   CAPACITY: with `max_concurrent`, requests beyond that many at once get
+    "429 Too Many Requests", which is what the scraper's throttle reacts to.
+It also behaves like a well-run site: pages carry an `ETag`, so a re-crawl
+can get "304 Not Modified", and it can serve a `robots.txt`.
+
+The standard library's `http.server` does the HTTP work. With
+`ThreadingHTTPServer`, every connection gets its own thread, so many requests
+are answered at the same time, and "HTTP/1.1" keeps connections open between
+requests, the way the scraper's `PooledSession` expects.
+'''
+
+import hashlib
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scraper.fixtures import FixtureSite
+
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Answers one request; the settings live on the server (`self.server`)."""
+
+    # HTTP/1.1 keeps the connection open for the client's next request.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        fixture = self.server.fixture
+        if not fixture.enter():
+            return self._send(429, b"Too many requests at once.",
+                              {"Retry-After": str(fixture.retry_after or 1)})
+        try:
+            fixture.wait()
+            if self.path == "/robots.txt":
+                if fixture.robots is None:
+                    return self._send(404)
+                return self._send(200, fixture.robots.encode("utf-8"),
+                                  {"Content-Type": "text/plain; charset=utf-8"})
+            if fixture.inject_error():
+                headers = {}
+                if fixture.retry_after is not None:
+                    headers["Retry-After"] = str(fixture.retry_after)
+                return self._send(fixture.error_status, b"Injected error.", headers)
+            page = fixture.page(self.path)
+            if page is None:
+                return self._send(404, b"Not found.")
+            body, etag = page
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, b"", {"ETag": etag})
+            self._send(200, body, {"Content-Type": "text/html; charset=utf-8", "ETag": etag})
+        finally:
+            fixture.leave()
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        # A 304 never has a body, so it must not announce one.
+        if status != 304:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if status != 304:
+            self.wfile.write(body)
+        self.server.fixture.count(status)
+
+    def log_message(self, format, *args):
+        pass  # One line per request would drown everything else out.
+
+
+class FixtureServer:
+    """
+    An HTTP server for a `FixtureSite`, with optional latency, errors and a
+    capacity limit.
+    """
+
+    def __init__(self, site=None, host="127.0.0.1", port=0, latency=0.0, jitter=0.0,
+                 error_rate=0.0, error_status=503, retry_after=None, max_concurrent=None,
+                 robots=None, seed=0):
+        """
+        Args:
+            site (FixtureSite): The site to serve (default: 1000 main pages).
+            host (str): The address to listen on; "127.0.0.1" is this
+                        computer only.
+            port (int): The port to listen on; 0 picks a free one.
+            latency (float): Seconds every answer waits.
+            jitter (float): Up to this many extra seconds, at random.
+            error_rate (float): The share of requests (0.0 to 1.0) that fail.
+            error_status (int): The status code of an injected failure.
+            retry_after (float): If given, failures and 429s carry this
+                                 `Retry-After` (in seconds).
+            max_concurrent (int): Answer 429 to requests beyond this many at
+                                  once (None: no limit).
+            robots (str): The text of `/robots.txt` (None: it does not exist).
+            seed (int): Makes the injected latency and errors repeatable.
+        """
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.site = FixtureSite(pages=1000) if site is None else site
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.max_concurrent = max_concurrent
+        self.robots = robots
+        # What was answered, by status code, and the most requests at once.
+        self.stats = {"requests": 0, "statuses": {}, "peak_concurrent": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = 0
+        # Rendered pages and their ETags, so a page is only built once.
+        self._pages = {}
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), _FixtureHandler)
+        # Request threads must not keep the program alive after a Ctrl+C.
+        self._httpd.daemon_threads = True
+        self._httpd.fixture = self
+
+    @property
+    def url(self):
+        """The address of the site's first page, e.g. "http://127.0.0.1:8000/"."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def page(self, path):
+        """Returns (body, ETag) for a path, or None if there is no such page."""
+        with self._lock:
+            cached = self._pages.get(path)
+        if cached is not None:
+            return cached
+        html_content = self.site.render(path)
+        if html_content is None:
+            return None
+        body = html_content.encode("utf-8")
+        page = (body, '"' + hashlib.sha1(body).hexdigest()[:16] + '"')
+        with self._lock:
+            self._pages[path] = page
+        return page
+
+    def enter(self):
+        """Counts a request in; returns False if the server is "full"."""
+        with self._lock:
+            self.stats["requests"] += 1
+            if self.max_concurrent is not None and self._active >= self.max_concurrent:
+                return False
+            self._active += 1
+            self.stats["peak_concurrent"] = max(self.stats["peak_concurrent"], self._active)
+            return True
+
+    def leave(self):
+        with self._lock:
+            self._active -= 1
+
+    def wait(self):
+        """Sleeps for this answer's latency."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def inject_error(self):
+        """Returns True if this request should fail."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def count(self, status):
+        with self._lock:
+            statuses = self.stats["statuses"]
+            statuses[status] = statuses.get(status, 0) + 1
+
+    def serve_forever(self):
+        """Answers requests until interrupted (Ctrl+C) or `stop()`."""
+        self._httpd.serve_forever()
+
+    def start(self):
+        """Starts answering requests in a background thread."""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the server and closes its socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    # `with FixtureServer(...) as server:` starts it, and stops it afterwards.
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_scraper_fixture_server.py' instead.")
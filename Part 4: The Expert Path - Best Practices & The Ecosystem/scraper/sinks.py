@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Output Sinks Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module writes scraped items to a file AS THEY ARE FOUND, instead of
+collecting them all in memory first. Three SINKS share one interface:
+`JsonLinesSink` (one JSON object per line), `CsvSink` (a spreadsheet-friendly
+table) and `SqliteSink` (a database table). Items are written in BATCHES,
+and every batch is flushed all the way to the disk.
+"""
+
+'''
+WHY STREAM THE OUTPUT?
+The first version of the scraper kept every quote in a dictionary and printed
+them all at the end. That is fine for one page, but a crawl of a million pages
+would hold millions of quotes in memory, and a crash near the end would lose
+them all, since nothing was saved.
+
+A SINK is where the items flow to. The crawl hands each new item to
+`sink.write(item)` and then forgets it, so memory use stays FLAT however long
+the crawl runs, and everything written so far survives a crash.
+
+WHY BATCHES?
+Writing each item to the disk on its own would be slow: every write is a trip
+into the operating system, and making it durable is a trip to the disk. So a
+sink collects items in a small BUFFER and writes them together, when either
+-   the buffer holds `batch_size` items, or
+-   `flush_every` seconds have passed since the last write (so a slow crawl
+    still saves its items regularly).
+
+FLUSH AND FSYNC:
+"Writing" a file only hands the data to Python's buffer, then to the operating
+system's cache. Two more steps make it DURABLE:
+-   `file.flush()` moves Python's buffer into the operating system.
+-   `os.fsync()` asks the operating system to put it on the disk itself, so it
+    survives even a power cut.
+`fsync` is slow (milliseconds), which is one more reason to do it once per
+batch rather than once per item. For SQLite, committing a transaction in
+"synchronous=FULL" mode does the same.
+
+All three sinks APPEND to an existing file, so a resumed crawl (`--state`)
+adds to the output of the earlier runs.
+'''
+
+import csv
+import json
+import os
+import sqlite3
+import time
+
+
+class _BatchedSink:
+    """
+    The batching shared by every sink. Subclasses write a whole batch in
+    `_write_batch(items)` and make it durable in `_sync()`.
+    """
+
+    def __init__(self, path, batch_size=500, flush_every=5.0, fsync=True):
+        """
+        Args:
+            path (str): The file to write to (created if it does not exist).
+            batch_size (int): Write once this many items are waiting.
+            flush_every (float): ...or once this many seconds have passed.
+            fsync (bool): Force every batch onto the disk.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_every = flush_every
+        self.fsync = fsync
+        # How many items were written.
+        self.count = 0
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, item):
+        """Adds one item (a dict); it is written with the next batch."""
+        self._buffer.append(item)
+        if (len(self._buffer) >= self.batch_size
+                or time.monotonic() - self._last_flush >= self.flush_every):
+            self.flush()
+
+    def flush(self):
+        """Writes the waiting items now, and makes them durable."""
+        if self._buffer:
+            self._write_batch(self._buffer)
+            self.count += len(self._buffer)
+            self._buffer = []
+            self._sync()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        """Writes anything still waiting and closes the file."""
+        self.flush()
+        self._close()
+
+    # A sink can be used in a `with` statement, which closes it at the end.
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class _FileSink(_BatchedSink):
+    """A sink writing text to a file opened for appending."""
+
+    def __init__(self, path, **options):
+        super().__init__(path, **options)
+        # `newline=""` lets the csv module choose the line endings itself.
+        self._file = open(path, mode="a", encoding="utf-8", newline="")
+
+    def _sync(self):
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def _close(self):
+        self._file.close()
+
+
+class JsonLinesSink(_FileSink):
+    """
+    Writes each item as one line of JSON ("JSON Lines", `.jsonl`).
+
+    Unlike one big JSON list, the file is valid after every line, so it can
+    be appended to, read line by line, and survives being cut off.
+    """
+
+    format = "jsonl"
+
+    def _write_batch(self, items):
+        self._file.write("".join(json.dumps(item, ensure_ascii=False) + "\n" for item in items))
+
+
+class CsvSink(_FileSink):
+    """
+    Writes items as rows of a CSV file, with a header row.
+
+    The columns are the fields of the first item (or of the existing header,
+    when appending). A list, such as a quote's tags, is joined with "; ".
+    """
+
+    format = "csv"
+
+    def __init__(self, path, **options):
+        super().__init__(path, **options)
+        self._writer = None
+        self._fields = None
+        if os.path.getsize(path):
+            # Appending: keep the columns the file already has.
+            with open(path, encoding="utf-8", newline="") as csv_file:
+                self._fields = next(csv.reader(csv_file), None)
+
+    def _write_batch(self, items):
+        if self._writer is None:
+            write_header = self._fields is None
+            if write_header:
+                self._fields = list(items[0])
+            # Missing fields are left empty; fields not in the header are skipped.
+            self._writer = csv.DictWriter(self._file, fieldnames=self._fields,
+                                          restval="", extrasaction="ignore")
+            if write_header:
+                self._writer.writeheader()
+        self._writer.writerows(
+            {field: "; ".join(map(str, value)) if isinstance(value, list) else value
+             for field, value in item.items()}
+            for item in items
+        )
+
+
+class SqliteSink(_BatchedSink):
+    """
+    Writes items as rows of the `items` table of a SQLite database.
+
+    The table gets one column per field of the first item, plus an `id`. A
+    list, such as a quote's tags, is stored as JSON text.
+    """
+
+    format = "sqlite"
+
+    def __init__(self, path, table="items", **options):
+        super().__init__(path, **options)
+        self.table = table
+        self._columns = None
+        self._connection = sqlite3.connect(path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        # FULL: every commit is synced to the disk, like `fsync` for the
+        # other sinks. NORMAL is faster, but may lose the last commits on a
+        # power cut.
+        self._connection.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+
+    def _ensure_table(self, item):
+        """Creates the table for the first item's fields, or reads its columns."""
+        existing = [row[1] for row in
+                    self._connection.execute(f"PRAGMA table_info({_quoted(self.table)})")]
+        if existing:
+            self._columns = [column for column in existing if column != "id"]
+            return
+        self._columns = list(item)
+        columns = ", ".join(f"{_quoted(column)} TEXT" for column in self._columns)
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE {_quoted(self.table)} (id INTEGER PRIMARY KEY, {columns})"
+            )
+
+    def _write_batch(self, items):
+        if self._columns is None:
+            self._ensure_table(items[0])
+        columns = ", ".join(_quoted(column) for column in self._columns)
+        placeholders = ", ".join("?" for _ in self._columns)
+        rows = (
+            [json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+             for value in (item.get(column) for column in self._columns)]
+            for item in items
+        )
+        # `executemany` inserts the whole batch in one transaction.
+        with self._connection:
+            self._connection.executemany(
+                f"INSERT INTO {_quoted(self.table)} ({columns}) VALUES ({placeholders})", rows
+            )
+
+    def _sync(self):
+        pass  # The commit in `_write_batch` already made the batch durable.
+
+    def _close(self):
+        self._connection.close()
+
+
+def _quoted(name):
+    """Quotes a table or column name for SQL, so any field name is safe."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+SINKS = {sink.format: sink for sink in (JsonLinesSink, CsvSink, SqliteSink)}
+
+# The format each file extension implies.
+EXTENSIONS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv",
+              ".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite"}
+
+
+def open_sink(path, format=None, **options):
+    """
+    Opens the right sink for a file.
+
+    Args:
+        path (str): The file to write to.
+        format (str): "jsonl", "csv" or "sqlite"; by default, it is worked
+                      out from the file extension.
+        **options: Passed on to the sink (`batch_size`, `flush_every`, `fsync`).
+
+    Raises:
+        ValueError: If the format is unknown, or cannot be told from `path`.
+    """
+    if format is None:
+        format = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Cannot tell the output format of '{path}'. "
+                             f"Use a {', '.join(EXTENSIONS)} file or choose a format.")
+    if format not in SINKS:
+        raise ValueError(f"Unknown output format '{format}'. Use one of: {', '.join(SINKS)}.")
+    return SINKS[format](path, **options)
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --output quotes.jsonl' instead.")
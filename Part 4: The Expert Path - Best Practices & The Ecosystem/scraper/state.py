@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Crawl State Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module makes long crawls RESUMABLE. `PersistentFrontier` keeps the URLs
+still to visit, and every URL ever seen, in a SQLite database, with a compact
+`BloomFilter` in front of the seen set. Progress is saved at CHECKPOINTS
+every few pages, so a crawl that is stopped (or crashes) continues from its
+last checkpoint instead of starting over.
+"""
+
+'''
+WHAT HAS TO SURVIVE A CRASH?
+A crawler's whole state is its FRONTIER (what is left to visit) and its SEEN
+SET (what it has already queued). The in-memory `Frontier` loses both when
+the program stops, so a restarted crawl fetches everything again.
+`PersistentFrontier` keeps both in a database file instead.
+
+CHECKPOINTS:
+Saving to disk after every single URL would be slow. Instead, changes are
+collected in one database TRANSACTION and committed every `checkpoint_every`
+pages. A transaction is all-or-nothing: after a crash the database is exactly
+as it was at the last checkpoint. Pages finished after that point are simply
+visited again, and the links they found are queued again, so nothing is lost
+and at most `checkpoint_every` pages are repeated.
+
+A page being downloaded when the crawl stopped is still in the frontier
+(marked as "taken"), so the next run picks it up again.
+
+RETRYING FAILED PAGES:
+Long crawls meet network blips. A page whose download (or parsing) fails is
+not forgotten: it goes back to the END of the queue with its ATTEMPTS count
+raised by one, so it is tried again later in this run, or in the next run
+if this one stops first. Only after `max_attempts` failures is it given up
+and moved to a `failed` table, where it can still be looked at.
+
+A BLOOM FILTER IN FRONT OF THE SEEN SET:
+With millions of URLs, asking the database "have we seen this URL?" for every
+link on every page adds up. A BLOOM FILTER answers that question from a small
+bit array in memory (about 10 bits per URL):
+-   To ADD a URL, we compute `k` different hash positions and set those bits.
+-   To CHECK a URL, we look at the same `k` bits. If ANY of them is 0, the URL
+    was DEFINITELY never added. If all are 1, it PROBABLY was (another URL may
+    have set the same bits: a FALSE POSITIVE, here about 1% of the time).
+So a "no" from the filter is trusted at once (most links on a big crawl are
+new), and only a "probably" is double-checked against the EXACT seen set in
+the database. The answer is always correct; the filter just makes it cheap.
+The filter is saved next to the database at every checkpoint.
+'''
+
+import hashlib
+import math
+import os
+import sqlite3
+import struct
+
+from scraper.crawl import Frontier
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter of strings.
+    """
+
+    # File layout: a 4-byte marker, then the header fields, then the bits.
+    MAGIC = b"BLM1"
+    HEADER = struct.Struct("<QIQQ")  # bits, hashes, count, checkpoint
+
+    def __init__(self, capacity=1_000_000, error_rate=0.01):
+        """
+        Sizes the filter for `capacity` items at the given false-positive rate.
+
+        Adding more items than `capacity` still works, but false positives
+        become more frequent.
+        """
+        # The textbook formulas for the best number of bits and hashes.
+        bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.bits = bits
+        self.hashes = max(1, round(bits / capacity * math.log(2)))
+        self.count = 0
+        # Which checkpoint of the state database this filter belongs to.
+        self.checkpoint = 0
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, item):
+        """Yields the `hashes` bit positions for an item ("double hashing")."""
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.bits
+
+    def add(self, item):
+        """Adds an item."""
+        for position in self._positions(item):
+            # `position >> 3` is the byte, `position & 7` the bit inside it.
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        """False means "definitely not added"; True means "probably added"."""
+        return all(self._array[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(item))
+
+    def save(self, path):
+        """Writes the filter to a file, replacing it in one step."""
+        temporary = path + ".tmp"
+        with open(temporary, mode="wb") as bloom_file:
+            bloom_file.write(self.MAGIC)
+            bloom_file.write(self.HEADER.pack(self.bits, self.hashes, self.count, self.checkpoint))
+            bloom_file.write(self._array)
+        # `os.replace` is ATOMIC: readers see the old file or the new one,
+        # never a half-written mix.
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a filter written by `save()`."""
+        with open(path, mode="rb") as bloom_file:
+            if bloom_file.read(len(cls.MAGIC)) != cls.MAGIC:
+                raise ValueError(f"{path} is not a Bloom filter file.")
+            bits, hashes, count, checkpoint = cls.HEADER.unpack(bloom_file.read(cls.HEADER.size))
+            array = bytearray(bloom_file.read())
+        if len(array) != (bits + 7) // 8:
+            raise ValueError(f"{path} is truncated.")
+        bloom = cls.__new__(cls)
+        bloom.bits, bloom.hashes, bloom.count, bloom.checkpoint = bits, hashes, count, checkpoint
+        bloom._array = array
+        return bloom
+
+
+class PersistentFrontier(Frontier):
+    """
+    A frontier and seen set stored in SQLite, checkpointed every few pages.
+
+    It can be used anywhere a `Frontier` can. Like `Frontier`, it must only
+    be used from one thread (the crawl's main thread).
+    """
+
+    def __init__(self, path, checkpoint_every=100, expected_urls=1_000_000, max_size=None,
+                 max_attempts=3):
+        """
+        Opens (or creates) the crawl state.
+
+        Args:
+            path (str): The path of the SQLite database file. The Bloom filter
+                        is kept next to it, in `path + ".bloom"`.
+            checkpoint_every (int): Save progress after this many pages.
+            expected_urls (int): Roughly how many URLs the crawl will see
+                                 (sizes a new Bloom filter).
+            max_size (int): The most URLs that may wait in the queue at once
+                            (None: no limit, as the queue lives on disk).
+            max_attempts (int): Give a page up after this many failures.
+        """
+        super().__init__(max_size=max_size)
+        self.max_attempts = max_attempts
+        # How many pages this run gave up on after `max_attempts` failures.
+        self.gave_up = 0
+        self.path = path
+        self.bloom_path = path + ".bloom"
+        self.checkpoint_every = checkpoint_every
+        self._finished_since_checkpoint = 0
+        # URLs handed out by `pop()` and not yet `done()`: url -> row id.
+        self._taken = {}
+
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS frontier ("
+                " id INTEGER PRIMARY KEY, url TEXT NOT NULL, taken INTEGER NOT NULL DEFAULT 0,"
+                " attempts INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS frontier_next ON frontier (taken, id)"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS failed (url TEXT PRIMARY KEY, attempts INTEGER NOT NULL)"
+            )
+            # `WITHOUT ROWID` stores each URL once, inside the index itself.
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS seen (url TEXT PRIMARY KEY) WITHOUT ROWID"
+            )
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            # Pages that were being visited when the last run stopped were
+            # never finished, so they go back in the queue.
+            self._connection.execute("UPDATE frontier SET taken = 0 WHERE taken = 1")
+            self._connection.execute("INSERT OR IGNORE INTO meta VALUES ('checkpoint', 0)")
+            self._connection.execute("INSERT OR IGNORE INTO meta VALUES ('pages', 0)")
+
+        self.checkpoint_number = self._meta("checkpoint")
+        # Pages finished by every run so far, up to the last checkpoint.
+        self.pages_done = self._meta("pages")
+        self._queued = self._connection.execute(
+            "SELECT COUNT(*) FROM frontier WHERE taken = 0").fetchone()[0]
+        self._seen_count = self._connection.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+        self.bloom = self._load_bloom(expected_urls)
+
+    def _meta(self, key):
+        return self._connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()[0]
+
+    def _load_bloom(self, expected_urls):
+        """Loads the saved Bloom filter, or rebuilds it if it is out of date."""
+        try:
+            bloom = BloomFilter.load(self.bloom_path)
+            if bloom.checkpoint == self.checkpoint_number:
+                return bloom
+        except (OSError, ValueError):
+            pass
+        # Missing, damaged, or saved at a different checkpoint than the
+        # database (a crash between the two saves): rebuild it from the
+        # exact seen set, which is always right.
+        bloom = BloomFilter(capacity=max(expected_urls, 2 * self._seen_count))
+        for (url,) in self._connection.execute("SELECT url FROM seen"):
+            bloom.add(url)
+        bloom.checkpoint = self.checkpoint_number
+        return bloom
+
+    def _is_seen(self, url):
+        if url not in self.bloom:
+            return False  # The filter's "no" is always right.
+        return self._connection.execute(
+            "SELECT 1 FROM seen WHERE url = ?", (url,)).fetchone() is not None
+
+    def add(self, url):
+        """
+        Queues a URL unless it has been seen before or the queue is full.
+
+        Returns:
+            bool: True if the URL was queued.
+        """
+        if self._is_seen(url):
+            return False
+        if self.max_size is not None and self._queued >= self.max_size:
+            # Not marked as seen, exactly like `Frontier.add()`.
+            self.dropped += 1
+            return False
+        self._connection.execute("INSERT INTO seen VALUES (?)", (url,))
+        self._connection.execute("INSERT INTO frontier (url) VALUES (?)", (url,))
+        self.bloom.add(url)
+        self._seen_count += 1
+        self._queued += 1
+        return True
+
+    def pop(self):
+        """Takes the oldest queued URL. It stays on disk until `done()`."""
+        row = self._connection.execute(
+            "SELECT id, url FROM frontier WHERE taken = 0 ORDER BY id LIMIT 1").fetchone()
+        if row is None:
+            raise IndexError("pop from an empty frontier")
+        row_id, url = row
+        self._connection.execute("UPDATE frontier SET taken = 1 WHERE id = ?", (row_id,))
+        self._taken[url] = row_id
+        self._queued -= 1
+        return url
+
+    def done(self, url):
+        """Removes a finished URL, and saves a checkpoint every few pages."""
+        row_id = self._taken.pop(url, None)
+        if row_id is not None:
+            self._connection.execute("DELETE FROM frontier WHERE id = ?", (row_id,))
+        self.pages_done += 1
+        self._finished()
+
+    def failed(self, url):
+        """
+        Puts a URL whose visit failed back at the end of the queue, or gives
+        it up after `max_attempts` failures.
+
+        Returns:
+            bool: True if the URL will be tried again.
+        """
+        row_id = self._taken.pop(url, None)
+        if row_id is None:
+            return False
+        attempts = self._connection.execute(
+            "SELECT attempts FROM frontier WHERE id = ?", (row_id,)).fetchone()[0] + 1
+        retry = attempts < self.max_attempts
+        if retry:
+            # A new, highest id moves the URL to the back of the queue, so the
+            # failing server gets some time before we try again.
+            self._connection.execute(
+                "UPDATE frontier SET id = (SELECT MAX(id) + 1 FROM frontier), taken = 0,"
+                " attempts = ? WHERE id = ?", (attempts, row_id))
+            self._queued += 1
+        else:
+            self._connection.execute("DELETE FROM frontier WHERE id = ?", (row_id,))
+            self._connection.execute("INSERT OR REPLACE INTO failed VALUES (?, ?)", (url, attempts))
+            self.gave_up += 1
+        self._finished()
+        return retry
+
+    def _finished(self):
+        """Counts a page towards the next checkpoint, and saves one if it is due."""
+        self._finished_since_checkpoint += 1
+        if self._finished_since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Saves all progress so far."""
+        self.checkpoint_number += 1
+        self._connection.execute("UPDATE meta SET value = ? WHERE key = 'checkpoint'",
+                                 (self.checkpoint_number,))
+        self._connection.execute("UPDATE meta SET value = ? WHERE key = 'pages'",
+                                 (self.pages_done,))
+        self._connection.commit()
+        # The filter is saved AFTER the commit. If we crash in between, its
+        # checkpoint number will not match, and it is rebuilt on the next run.
+        self.bloom.checkpoint = self.checkpoint_number
+        self.bloom.save(self.bloom_path)
+        self._finished_since_checkpoint = 0
+
+    def seen_count(self):
+        return self._seen_count
+
+    def close(self):
+        """Saves a final checkpoint and closes the database."""
+        self.checkpoint()
+        self._connection.close()
+
+    def __len__(self):
+        return self._queued
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py --state crawl_state.sqlite3' instead.")
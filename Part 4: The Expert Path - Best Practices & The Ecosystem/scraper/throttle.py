@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+Part 4, Lesson 22: Project: Web Scraper (Throttle Module)
+
+Author: dunamismax
+Date: 10-19-2026
+
+This module decides how many requests the scraper may send to each host at
+the same time. `HostThrottle` adjusts that number by itself, AIMD-style, from
+what the server tells us: fast answers let it grow, while slow answers,
+"429 Too Many Requests", "503 Service Unavailable" and `Retry-After` headers
+make it shrink. `RobotsCache` reads each host's `robots.txt` once, so the
+throttle can also honor the site's `Crawl-delay`.
+"""
+
+'''
+WHY NOT A FIXED NUMBER OF WORKERS?
+`--workers 8` sends eight requests at once, whatever the server thinks about
+it. For a fast, healthy server, eight may be far too few. For a struggling
+one, eight may be too many: it answers more and more slowly, and then starts
+refusing us with "429 Too Many Requests". No single number is right for
+every site, or even for one site all day long.
+
+AIMD: ADDITIVE INCREASE, MULTIPLICATIVE DECREASE
+This is the rule TCP uses to share the internet's bandwidth, and it works just
+as well here. Every host has a LIMIT on how many of our requests may be in
+flight at once:
+-   When a request comes back fast and OK, the limit grows a LITTLE (by
+    1/limit, so about +1 for every `limit` good answers).
+-   When the server pushes back (a 429 or 503, a timeout, or answers that are
+    much slower than usual), the limit is CUT IN HALF at once.
+Growing slowly and backing off quickly makes the limit settle just below what
+the server can take, and keeps probing in case it can take more.
+
+Two details borrowed from TCP:
+-   SLOW START: a new host starts at a limit of 1, which grows by a WHOLE
+    request per good answer (so it doubles every round) until the first sign
+    of trouble. Then the slower additive growth takes over.
+-   ONE CUT PER EPISODE: when the server struggles, all the requests already
+    in flight tend to fail together. Only requests sent AFTER the last cut may
+    cut again; otherwise one bad moment would halve the limit eight times.
+
+"SLOW" is measured against the fastest answer among the host's last
+`latency_window` answers: if the recent average (an exponentially weighted
+moving average) takes more than `latency_tolerance` times as long, the
+server is queueing our requests, and we back off before it has to start
+refusing them. The best is only taken over a WINDOW so that it can rise
+again: one lucky early answer, or a server that has become slower for good,
+must not make every later answer look slow. Only clean first attempts
+count. An answer that needed retries (by the session, or by the throttle
+after a 429) includes waiting, not just the server's work. And the time
+used is `response.elapsed`, measured by `requests` around the request
+itself, so a thread that waited for its turn to run Python (see the GIL)
+does not make the server look slow.
+
+RETRY-AFTER AND ROBOTS.TXT:
+A 429 or 503 often says how long to wait in a `Retry-After` header. The
+throttle then sends NO requests to that host until the time is up, and tries
+the refused page again afterwards.
+A site's `robots.txt` may also ask for a `Crawl-delay` (seconds between
+requests) or a `Request-rate`. The throttle spaces the requests to that host
+out accordingly, and refuses the pages the file disallows. The standard
+library's `urllib.robotparser` reads the file; `RobotsCache` downloads it only
+once per host.
+'''
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+# The shared HTTP helpers live in the Part 3 folder (`http_client.py`). The
+# scraper already puts that folder on `sys.path`; adding it here as well lets
+# this module be imported by itself (from a test or another script, say).
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "Part 3: The Advanced Path - Data & APIs",
+)
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+
+from http_client import parse_retry_after, take_retry_time
+
+# Responses that mean "you are sending too much; slow down".
+THROTTLE_STATUSES = {429, 503}
+
+# A host only counts as slow if it is also this many seconds slower than its
+# best; on a fast local network, 2 ms versus 5 ms is just noise.
+MIN_LATENCY_RISE = 0.05
+
+
+class RobotsCache:
+    """
+    The `robots.txt` rules of every host, each downloaded once.
+
+    Safe to use from many threads.
+    """
+
+    def __init__(self, session):
+        """
+        Args:
+            session (requests.Session): The session that downloads the files.
+                                        Its User-Agent is the name the rules
+                                        are looked up for.
+        """
+        self.session = session
+        self.user_agent = session.headers.get("User-Agent", "*")
+        self._parsers = {}
+        self._lock = threading.Lock()
+        # One lock per host, so that ten threads reaching a new host at once
+        # download its robots.txt once, while other hosts are not held up.
+        self._host_locks = {}
+
+    def _parser(self, url):
+        """Returns the `RobotFileParser` for the host of `url`, downloading it if needed."""
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc.lower()}"
+        with self._lock:
+            parser = self._parsers.get(host)
+            if parser is not None:
+                return parser
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            if host not in self._parsers:
+                parser = self._download(host + "/robots.txt")
+                with self._lock:
+                    self._parsers[host] = parser
+        return self._parsers[host]
+
+    def _download(self, robots_url):
+        parser = RobotFileParser(robots_url)
+        try:
+            response = self.session.get(robots_url)
+        except requests.exceptions.RequestException:
+            # We could not ask, so we assume everything is allowed.
+            parser.allow_all = True
+            return parser
+        # The same rules as `RobotFileParser.read()`: "Unauthorized" and
+        # "Forbidden" mean the whole site is off limits; any other error
+        # (usually "404 Not Found") means there are no rules at all.
+        if response.status_code in (401, 403):
+            parser.disallow_all = True
+        elif response.status_code >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(response.text.splitlines())
+        return parser
+
+    def allowed(self, url):
+        """Returns True if the host's robots.txt lets us fetch `url`."""
+        return self._parser(url).can_fetch(self.user_agent, url)
+
+    def delay(self, url):
+        """
+        Returns the seconds the host asks us to leave between two requests.
+
+        This is the larger of its `Crawl-delay` and its `Request-rate`
+        (e.g. "Request-rate: 1/5" means one request every 5 seconds).
+        """
+        parser = self._parser(url)
+        delay = parser.crawl_delay(self.user_agent) or 0
+        rate = parser.request_rate(self.user_agent)
+        if rate and rate.requests:
+            delay = max(delay, rate.seconds / rate.requests)
+        return float(delay)
+
+
+class _HostState:
+    """What the throttle knows about one host."""
+
+    def __init__(self, limit, latency_window):
+        self.limit = float(limit)       # Requests allowed in flight at once.
+        self.in_flight = 0
+        self.slow_start = True
+        self.next_start = 0.0           # No request may start before this time.
+        self.last_decrease = 0.0        # When the limit was last cut.
+        # The latencies of the last few answers, in seconds; the fastest of
+        # them is the host's current best.
+        self.recent = deque(maxlen=latency_window)
+        self.latency = None             # The moving average of recent answers.
+        self.throttled = 0              # 429/503 answers received.
+        self.slowdowns = 0              # Cuts caused by slow answers.
+
+
+class HostThrottle:
+    """
+    Sends GET requests through a session, limiting how many run at once per
+    host with AIMD, and honoring Retry-After and robots.txt.
+
+    Safe to use from many threads: a thread that may not send its request yet
+    simply waits in `get()` until it may.
+    """
+
+    def __init__(self, session, max_limit=8, min_limit=1, initial_limit=1,
+                 latency_tolerance=2.0, latency_window=50, decrease_factor=0.5,
+                 max_attempts=4, max_retry_after=60.0, robots=True):
+        """
+        Args:
+            session (requests.Session): The session that sends the requests.
+                Its own retries should leave out `THROTTLE_STATUSES`, so that
+                those answers reach the throttle (see `PooledSession`).
+            max_limit (int): The most requests in flight per host, however
+                             well the host is doing.
+            min_limit (int): The fewest, however badly it is doing.
+            initial_limit (int): Where a new host starts.
+            latency_tolerance (float): How many times slower than its best the
+                                       host may get before we back off.
+            latency_window (int): How many recent answers the best is taken
+                                  from.
+            decrease_factor (float): What the limit is multiplied by on a cut.
+            max_attempts (int): How often one page is tried when the host
+                                keeps answering 429/503.
+            max_retry_after (float): The longest `Retry-After` we obey, in
+                                     seconds.
+            robots (bool): Read robots.txt and obey its rules.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("The limits must satisfy 1 <= min_limit <= initial_limit <= max_limit.")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1.")
+        self.session = session
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.initial_limit = initial_limit
+        self.latency_tolerance = latency_tolerance
+        self.latency_window = max(1, latency_window)
+        self.decrease_factor = decrease_factor
+        self.max_attempts = max(1, max_attempts)
+        self.max_retry_after = max_retry_after
+        self.robots = RobotsCache(session) if robots else None
+        self._hosts = {}
+        # One CONDITION for every host: waiting threads sleep on it, and are
+        # woken whenever a request finishes or a host's limit changes.
+        self._condition = threading.Condition()
+
+    def get(self, url, **kwargs):
+        """
+        Sends a GET request as soon as the host's limit allows.
+
+        Takes the same arguments as `requests.Session.get()`. A page refused
+        with 429/503 is tried again (after its `Retry-After`, if any), up to
+        `max_attempts` times in all.
+
+        Returns:
+            requests.Response: The final response.
+
+        Raises:
+            ValueError: If robots.txt does not allow fetching `url`.
+        """
+        delay = 0.0
+        if self.robots is not None:
+            if not self.robots.allowed(url):
+                raise ValueError(f"robots.txt does not allow fetching {url}")
+            delay = self.robots.delay(url)
+
+        host = urlsplit(url).netloc.lower()
+        for attempt in range(self.max_attempts):
+            state, started = self._acquire(host, delay)
+            take_retry_time()  # Reset this thread's retry timer.
+            try:
+                response = self.session.get(url, **kwargs)
+            except requests.exceptions.RequestException:
+                # A timeout or refused connection: the host is struggling.
+                self._release(state, started, None)
+                raise
+            # Only a first attempt that the session did not retry measures
+            # the server alone (see the notes at the top).
+            clean = attempt == 0 and not take_retry_time()
+            self._release(state, started, response,
+                          response.elapsed.total_seconds() if clean else None)
+            if response.status_code not in THROTTLE_STATUSES or attempt == self.max_attempts - 1:
+                return response
+            # Hand the connection back to the pool before we wait our turn.
+            response.close()
+        return response
+
+    def _acquire(self, host, delay):
+        """Waits until a request to `host` may start, then counts it in flight."""
+        with self._condition:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.initial_limit, self.latency_window)
+            while True:
+                now = time.monotonic()
+                has_room = state.in_flight < int(state.limit)
+                if has_room and now >= state.next_start:
+                    break
+                # With room, we only wait for the delay to pass; without it,
+                # until another request finishes and wakes us.
+                self._condition.wait(state.next_start - now if has_room else None)
+            state.in_flight += 1
+            state.next_start = now + delay
+            return state, now
+
+    def _release(self, state, started, response, latency=None):
+        """Counts a request as finished and adjusts its host's limit."""
+        with self._condition:
+            state.in_flight -= 1
+            now = time.monotonic()
+            if response is None:
+                self._decrease(state, started, now)
+            elif response.status_code in THROTTLE_STATUSES:
+                state.throttled += 1
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    state.next_start = max(state.next_start,
+                                           now + min(retry_after, self.max_retry_after))
+                self._decrease(state, started, now)
+            elif self._is_slow(state, latency):
+                if self._decrease(state, started, now):
+                    state.slowdowns += 1
+            else:
+                # Slow start adds a whole request per good answer; after that,
+                # 1/limit per answer adds up to one request per full round.
+                state.limit += 1 if state.slow_start else 1 / state.limit
+                state.limit = min(state.limit, self.max_limit)
+            self._condition.notify_all()
+
+    def _is_slow(self, state, latency):
+        """
+        Records an answer's latency and returns True if the host looks
+        overloaded. An answer without a usable latency (None) is never slow.
+        """
+        if latency is None:
+            return False
+        state.recent.append(latency)
+        best = min(state.recent)
+        # An exponentially weighted moving average: each answer counts 20%.
+        state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+        threshold = max(best * self.latency_tolerance, best + MIN_LATENCY_RISE)
+        return state.latency > threshold
+
+    def _decrease(self, state, started, now):
+        """Cuts the limit, unless the request started before the last cut."""
+        if started < state.last_decrease:
+            return False  # Part of the episode we already reacted to.
+        state.limit = max(self.min_limit, state.limit * self.decrease_factor)
+        state.slow_start = False
+        state.last_decrease = now
+        return True
+
+    def stats(self):
+        """
+        Returns what the throttle learned about each host.
+
+        Returns:
+            dict: host -> {"limit", "throttled", "slowdowns"}.
+        """
+        with self._condition:
+            return {host: {"limit": state.limit, "throttled": state.throttled,
+                           "slowdowns": state.slowdowns}
+                    for host, state in self._hosts.items()}
+
+
+if __name__ == "__main__":
+    print("This is a helper module for the web scraper.")
+    print("It is not meant to be run directly.")
+    print("Please run '22_project_web_scraper.py' instead.")